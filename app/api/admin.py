@@ -0,0 +1,61 @@
+import asyncio
+import hmac
+import os
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, Request, Depends, Header
+from pydantic import BaseModel, Field
+
+from ..batch import ResumeExporter
+from ..config import ADMIN_TOKEN, EXPORT_DIR, LLM_MAX_CONCURRENCY
+from .endpoints import get_langgraph_app
+
+router = APIRouter(prefix="/admin")
+
+
+class ExportRequest(BaseModel):
+    filename: str
+    format: Literal["jsonl", "csv"] = "jsonl"
+    # LLM 동시 호출 한도보다 크게 잡아도 빨라지지 않고 대화 요청의 자리만 차지한다
+    concurrency: int = Field(default=4, ge=1, le=LLM_MAX_CONCURRENCY)
+
+
+async def verify_admin(x_admin_token: Optional[str] = Header(default=None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="ADMIN_TOKEN이 설정되지 않아 관리자 기능을 사용할 수 없습니다.")
+    # 비교 시간으로 토큰 내용을 알아낼 수 없도록 상수 시간 비교를 쓴다
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="관리자 토큰이 올바르지 않습니다.")
+
+
+@router.post("/resumes/export", dependencies=[Depends(verify_admin)])
+async def start_resume_export(body: ExportRequest, request: Request, app=Depends(get_langgraph_app)):
+    """완료된 지원서를 백그라운드에서 다시 생성해 EXPORT_DIR 아래 파일로 내보낸다."""
+    current = getattr(request.app.state, "resume_export", None)
+    if current is not None and not current[1].done():
+        raise HTTPException(status_code=409, detail="이미 진행 중인 내보내기 작업이 있습니다.")
+
+    # 경로 조작을 막기 위해 파일 이름만 받는다
+    filename = os.path.basename(body.filename)
+    if not filename:
+        raise HTTPException(status_code=400, detail="파일 이름이 올바르지 않습니다.")
+
+    exporter = ResumeExporter(
+        os.path.join(EXPORT_DIR, filename),
+        fmt=body.format,
+        concurrency=body.concurrency
+    )
+    task = asyncio.create_task(exporter.run(app.checkpointer))
+    request.app.state.resume_export = (exporter, task)
+    return exporter.stats()
+
+
+@router.get("/resumes/export", dependencies=[Depends(verify_admin)])
+async def get_resume_export(request: Request):
+    current = getattr(request.app.state, "resume_export", None)
+    if current is None:
+        raise HTTPException(status_code=404, detail="진행한 내보내기 작업이 없습니다.")
+    exporter, task = current
+    stats = exporter.stats()
+    if task.done() and task.exception() is not None:
+        stats["error"] = str(task.exception())
+    return stats
@@ -0,0 +1,199 @@
+import asyncio
+import math
+import time
+from collections import Counter, OrderedDict, deque
+
+from fastapi import HTTPException, Request
+
+from app.metrics import admission_wait, admission_rejections
+
+
+def client_ip(request: Request, trust_forwarded_for=False):
+    if trust_forwarded_for:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else None
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def to_http(self):
+        return HTTPException(
+            status_code=429,
+            detail=_REJECT_MESSAGES[self.reason],
+            headers={"Retry-After": str(max(1, math.ceil(self.retry_after)))},
+        )
+
+
+_REJECT_MESSAGES = {
+    "session_busy": "이전 메시지를 처리하고 있어요. 답변을 받은 뒤에 다시 보내주세요.",
+    "session_rate": "메시지를 너무 빠르게 보내고 있어요. 잠시 후에 다시 보내주세요.",
+    "ip_rate": "요청이 너무 많아요. 잠시 후에 다시 시도해주세요.",
+    "queue_full": "지금 사용자가 많아 요청을 처리할 수 없어요. 잠시 후에 다시 시도해주세요.",
+    "queue_timeout": "지금 사용자가 많아 요청을 처리할 수 없어요. 잠시 후에 다시 시도해주세요.",
+}
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self):
+        """토큰 하나를 쓴다. 성공하면 0, 부족하면 다음 토큰까지 기다려야 하는 시간(초)."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class _RateLimiter:
+    """키(세션 id, IP)별 토큰 버킷. 최근에 쓴 max_keys개만 보관한다 (밀려난 키는 가득 찬 버킷으로 다시 시작)."""
+
+    def __init__(self, rate, burst, max_keys=10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+
+    def take(self, key):
+        if self.rate <= 0 or key is None:
+            return 0.0
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.take()
+
+
+class AdmissionTicket:
+    __slots__ = ("session_id", "admitted_at", "released")
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.admitted_at = time.perf_counter()
+        self.released = False
+
+
+class AdmissionController:
+    """그래프를 실행하기 전에 요청을 받아들일지 결정한다 (프로세스 내 상태만 사용).
+
+    1. IP별, 세션별 토큰 버킷으로 요청 빈도 제한
+    2. 같은 세션의 메시지는 한 번에 하나만 처리 (처리 중에 온 메시지는 거절, 체크포인트 경쟁 방지)
+    3. 동시에 실행하는 턴 수를 max_in_flight로 제한하고, 나머지는 max_queue개까지 queue_timeout초 동안 대기
+    거절하면 AdmissionRejected (429 + Retry-After).
+    """
+
+    def __init__(self, *, max_in_flight=64, max_queue=256, queue_timeout=10.0,
+                 session_rate=1.0, session_burst=5, ip_rate=5.0, ip_burst=20):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._session_limiter = _RateLimiter(session_rate, session_burst)
+        self._ip_limiter = _RateLimiter(ip_rate, ip_burst)
+        self._active_sessions = set()
+        self._waiters = deque()
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = Counter()
+        # 턴 하나의 평균 처리 시간(초), 대기열이 가득 찼을 때 Retry-After 추정에 사용
+        self._avg_turn_seconds = 1.0
+
+    def _reject(self, reason, retry_after):
+        self.rejected[reason] += 1
+        admission_rejections.inc(reason)
+        raise AdmissionRejected(reason, retry_after)
+
+    async def acquire(self, session_id=None, client_ip=None):
+        if retry_after := self._ip_limiter.take(client_ip):
+            self._reject("ip_rate", retry_after)
+        if session_id is not None:
+            if session_id in self._active_sessions:
+                self._reject("session_busy", 1)
+            if retry_after := self._session_limiter.take(session_id):
+                self._reject("session_rate", retry_after)
+
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            admission_wait.observe(0.0)
+        else:
+            if len(self._waiters) >= self.max_queue:
+                self._reject("queue_full", self._avg_turn_seconds * (len(self._waiters) / self.max_in_flight + 1))
+            if session_id is not None:
+                # 대기 중에 같은 세션의 메시지가 또 오면 거절되도록 미리 표시
+                self._active_sessions.add(session_id)
+            await self._wait_for_slot(session_id)
+
+        if session_id is not None:
+            self._active_sessions.add(session_id)
+        self.admitted += 1
+        return AdmissionTicket(session_id)
+
+    async def _wait_for_slot(self, session_id):
+        started = time.perf_counter()
+        slot = asyncio.get_running_loop().create_future()
+        self._waiters.append(slot)
+        try:
+            await asyncio.wait_for(slot, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard_waiter(slot, session_id)
+            self._reject("queue_timeout", self._avg_turn_seconds)
+        except asyncio.CancelledError:
+            self._discard_waiter(slot, session_id)
+            if slot.done() and not slot.cancelled():
+                # 자리를 넘겨받은 직후에 취소되면 그 자리를 다음 대기자에게 넘긴다
+                self._release_slot()
+            raise
+        admission_wait.observe(time.perf_counter() - started)
+
+    def _discard_waiter(self, slot, session_id):
+        try:
+            self._waiters.remove(slot)
+        except ValueError:
+            pass
+        self._active_sessions.discard(session_id)
+
+    def _release_slot(self):
+        while self._waiters:
+            slot = self._waiters.popleft()
+            if not slot.done():
+                # 실행 중인 턴 수는 그대로 두고 자리를 대기자에게 넘긴다
+                slot.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def release(self, ticket):
+        """여러 번 호출해도 한 번만 반영된다."""
+        if ticket.released:
+            return
+        ticket.released = True
+        elapsed = time.perf_counter() - ticket.admitted_at
+        self._avg_turn_seconds = self._avg_turn_seconds * 0.9 + elapsed * 0.1
+        self._active_sessions.discard(ticket.session_id)
+        self._release_slot()
+
+    def stats(self):
+        return {
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "avg_turn_seconds": round(self._avg_turn_seconds, 3),
+        }
@@ -1,83 +1,368 @@
+import asyncio
+import json
+import weakref
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Request, Depends
+from fastapi.responses import StreamingResponse
 from uuid import uuid4
 from langchain_core.messages import HumanMessage
-from .models import StartChatResponse, ChatRequest, ChatResponse, ProfileData
+from .models import StartChatRequest, StartChatResponse, ChatRequest, ChatResponse, ProfileData
 from ..bot.state import ApplicationFormState
+from ..bot.intent import intent_stats
+from ..bot.nodes import qa_timing_stats, answer_cache, llm_gateway, llm, prompt_registry, SpeculativeAnswerGate, qa_stream_gate
+from ..bot.prompts import QA_ANSWER_TAG, QA_SPECULATIVE_TAG
+from ..bot.extraction import extraction_summary
+from ..club import club_config, UnknownTenantError
+from ..metrics import start_trace, finish_trace, idempotency_replays
+from ..config import GOOGLE_API_KEY, TRUST_FORWARDED_FOR
+from .admission import AdmissionRejected, client_ip
+from .idempotency import IdempotencyConflict
 
 router = APIRouter()
 
+GENERATING_MESSAGE = "대화해줘서 고마워! 지금 네 지원서를 정리하고 있어. 잠시만 기다려줘."
 
-def get_langgraph_app(request: Request):
-    app = request.app.state.langgraph_app
-    if not app:
-        raise HTTPException(status_code=500, detail="LangGraph 앱이 초기화되지 않았습니다.")
+
+def readiness_problems(state):
+    """요청을 처리하기 전에 준비돼야 하는 항목 중 아직 안 된 것과 그 이유. 비어 있으면 준비 완료."""
+    problems = {}
+    if not GOOGLE_API_KEY:
+        problems["google_api_key"] = "GOOGLE_API_KEY가 설정되지 않았습니다."
+    if not club_config.loaded:
+        problems["club_info"] = club_config.error or "동아리 정보를 읽지 못했습니다."
+    if getattr(state, "langgraph_app", None) is None:
+        problems["graph"] = "LangGraph 앱이 초기화되지 않았습니다."
+    if not llm.ready:
+        problems["llm"] = llm.error or "LLM 클라이언트를 준비하고 있습니다."
+    return problems
+
+
+# 의존성 함수는 I/O가 없으므로 async로 둔다 (동기 함수는 FastAPI가 요청마다 스레드 풀에서 실행한다)
+async def get_langgraph_app(request: Request):
+    app = getattr(request.app.state, "langgraph_app", None)
+    if not app or not llm.ready or not club_config.loaded:
+        raise HTTPException(
+            status_code=503,
+            detail="서버를 준비하고 있어요. 잠시 후에 다시 시도해주세요.",
+            headers={"Retry-After": "5"},
+        )
     return app
 
 
+async def get_admission(request: Request):
+    return request.app.state.admission
+
+
+async def admit(admission, http_request: Request, session_id: Optional[str] = None):
+    """요청을 받아들일 수 있으면 AdmissionTicket, 아니면 429 + Retry-After."""
+    try:
+        return await admission.acquire(session_id, client_ip(http_request, TRUST_FORWARDED_FOR))
+    except AdmissionRejected as e:
+        raise e.to_http()
+
+
+async def get_replay_cache(request: Request):
+    return request.app.state.replay_cache
+
+
+def begin_replay(replay_cache, request: ChatRequest):
+    """idempotency_key가 없으면 (None, True). 있으면 ReplayCache.begin()의 (future, owner)."""
+    if not request.idempotency_key:
+        return None, True
+    try:
+        return replay_cache.begin(request.session_id, request.idempotency_key, request.message)
+    except IdempotencyConflict:
+        raise HTTPException(status_code=422, detail="같은 idempotency_key로 다른 메시지를 보낼 수 없습니다.")
+
+
+async def wait_for_replay(replay, endpoint: str) -> ChatResponse:
+    """같은 키로 처리 중이거나 끝난 요청의 응답. 처음 요청이 실패했으면 같은 오류를 낸다."""
+    state = "stored" if replay.done() else "in_flight"
+    # 이 재시도가 끊겨도 처음 요청의 처리는 계속되어야 하므로 shield
+    response = await asyncio.shield(replay)
+    idempotency_replays.inc(endpoint, state)
+    return response
+
+
+def finish_replay(replay_cache, request: ChatRequest, replay, response=None, error=None):
+    """처음 요청이 끝나면 응답을 저장하고, 실패하거나 중단되면 키를 지운다. 이미 끝났으면 아무것도 하지 않는다."""
+    if replay is None:
+        return
+    if error is None and response is not None:
+        replay_cache.complete(request.session_id, request.idempotency_key, replay, response)
+    else:
+        error = error or HTTPException(status_code=409, detail="같은 메시지의 이전 요청이 중단되었어요. 다시 보내주세요.")
+        replay_cache.fail(request.session_id, request.idempotency_key, replay, error)
+
+
 @router.post("/chat/start", response_model=StartChatResponse)
-async def start_chat(app=Depends(get_langgraph_app)):
+async def start_chat(
+        http_request: Request,
+        body: Optional[StartChatRequest] = None,
+        app=Depends(get_langgraph_app),
+        admission=Depends(get_admission)
+):
+    tenant_id = body.tenant_id if body else None
+    try:
+        club = club_config.current(tenant_id)
+    except UnknownTenantError:
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 테넌트입니다: {tenant_id}")
+    if club is None:
+        raise HTTPException(
+            status_code=503,
+            detail=f"테넌트 '{tenant_id}'의 동아리 정보를 읽지 못했습니다.",
+            headers={"Retry-After": "5"},
+        )
+
     session_id = str(uuid4())
     config = {"configurable": {"thread_id": session_id}}
+    ticket = await admit(admission, http_request)
+    trace = start_trace(session_id, "chat_start")
 
     try:
-        response_state: ApplicationFormState = await app.ainvoke({}, config=config)
+        # 이후 모든 턴은 세션 상태의 tenant_id로 같은 테넌트의 동아리 정보를 사용한다
+        response_state: ApplicationFormState = await app.ainvoke({"tenant_id": club.tenant_id}, config=config)
 
         last_message = response_state['messages'][-1].content
         next_step = response_state['next_question']
 
+        finish_trace(trace)
         return StartChatResponse(
             session_id=session_id,
             response_message=last_message,
             next_step=next_step
         )
     except Exception as e:
+        finish_trace(trace, error=type(e).__name__)
         raise HTTPException(status_code=500, detail=f"대화 시작 중 오류 발생: {str(e)}")
+    finally:
+        admission.release(ticket)
 
 
-@router.post("/chat/send", response_model=ChatResponse)
-async def send_chat_message(request: ChatRequest, app=Depends(get_langgraph_app)):
-    config = {"configurable": {"thread_id": request.session_id}}
+async def get_resume_jobs(request: Request):
+    return request.app.state.resume_jobs
 
-    try:
-        response_state = await app.ainvoke(
-            {"messages": [HumanMessage(content=request.message)]},
-            config=config
+
+async def submit_resume_job(resume_jobs, session_id: str, response_state: dict):
+    if response_state.get('next_question') == "generate_resume":
+        print(f"[{session_id}] 'generate_resume' 신호 감지. 백그라운드 작업으로 등록.")
+        # 대기열이 가득 차 등록하지 못해도 /chat/status 폴링 때 다시 등록된다
+        await resume_jobs.submit(session_id)
+
+
+async def generating_state(app, config):
+    """지원서를 생성 중인 세션의 상태 (아니면 None).
+
+    이때 그래프를 실행하면 백그라운드 작업과 같은 generate_resume_node가 동시에 실행되므로, 상태만 읽어 돌려준다.
+    """
+    state = (await app.aget_state(config)).values
+    return state if state.get("next_question") == "generate_resume" else None
+
+
+def build_chat_response(session_id: str, response_state: dict) -> ChatResponse:
+    next_step = response_state.get('next_question')
+    last_message = response_state['messages'][-1].content
+
+    if next_step == "generate_resume":
+        next_step = "generating"
+        last_message = GENERATING_MESSAGE
+
+    final_profile_data: Optional[ProfileData] = None
+
+    if next_step == "done":
+        print(f"[{session_id}] 대화 종료. 프로필 데이터를 응답에 포함합니다.")
+
+        final_profile_data = ProfileData(
+            name=response_state.get("name"),
+            department=response_state.get("department"),
+            age=response_state.get("age"),
+            phone_number=response_state.get("phone_number"),
+            positions=response_state.get("positions"),
+            motivation=response_state.get("motivation")
         )
+        print(final_profile_data)
+
+    return ChatResponse(
+        session_id=session_id,
+        response_message=last_message,
+        next_step=next_step,
+        profile_data=final_profile_data
+    )
 
-        next_step = response_state.get('next_question')
-        if next_step == "generate_resume":
-            print(f"[{request.session_id}] 'generate_resume' 신호 감지. 연쇄 호출 실행.")
 
+@router.post("/chat/send", response_model=ChatResponse)
+async def send_chat_message(
+        request: ChatRequest,
+        http_request: Request,
+        app=Depends(get_langgraph_app),
+        resume_jobs=Depends(get_resume_jobs),
+        admission=Depends(get_admission),
+        replay_cache=Depends(get_replay_cache)
+):
+    config = {"configurable": {"thread_id": request.session_id}}
+    # 같은 키의 재시도는 세션 처리 중(429) 판정보다 먼저 확인해 처음 요청의 응답을 기다리게 한다
+    replay, owner = begin_replay(replay_cache, request)
+    if not owner:
+        return await wait_for_replay(replay, "chat_send")
+    try:
+        ticket = await admit(admission, http_request, request.session_id)
+    except HTTPException as e:
+        finish_replay(replay_cache, request, replay, error=e)
+        raise
+    trace = start_trace(request.session_id, "chat_send")
+
+    try:
+        response_state = await generating_state(app, config)
+        if response_state is None:
             response_state = await app.ainvoke(
-                {"messages": [HumanMessage(content=" ")]},
+                {"messages": [HumanMessage(content=request.message)]},
                 config=config
             )
-            next_step = response_state.get('next_question')
+        await submit_resume_job(resume_jobs, request.session_id, response_state)
+        finish_trace(trace)
+        response = build_chat_response(request.session_id, response_state)
+        finish_replay(replay_cache, request, replay, response)
+        return response
 
-        last_message = response_state['messages'][-1].content
+    except Exception as e:
+        finish_trace(trace, error=type(e).__name__)
+        error = HTTPException(status_code=500, detail=f"메시지 처리 중 오류 발생: {str(e)}")
+        finish_replay(replay_cache, request, replay, error=error)
+        raise error
+    finally:
+        finish_replay(replay_cache, request, replay)
+        admission.release(ticket)
 
-        final_profile_data: Optional[ProfileData] = None
 
-        if next_step == "done":
-            print(f"[{request.session_id}] 대화 종료. 프로필 데이터를 응답에 포함합니다.")
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-            final_profile_data = ProfileData(
-                name=response_state.get("name"),
-                department=response_state.get("department"),
-                age=response_state.get("age"),
-                phone_number=response_state.get("phone_number"),
-                positions=response_state.get("positions"),
-                motivation=response_state.get("motivation")
-            )
-            print(final_profile_data)
 
-        return ChatResponse(
-            session_id=request.session_id,
-            response_message=last_message,
-            next_step=next_step,
-            profile_data=final_profile_data
-        )
+@router.post("/chat/send/stream")
+async def send_chat_message_stream(
+        request: ChatRequest,
+        http_request: Request,
+        app=Depends(get_langgraph_app),
+        resume_jobs=Depends(get_resume_jobs),
+        admission=Depends(get_admission),
+        replay_cache=Depends(get_replay_cache)
+):
+    """/chat/send와 같지만, Q&A 답변 토큰을 생성되는 대로 SSE(token 이벤트)로 보내고
+    마지막에 ChatResponse 전체를 done 이벤트로 보낸다.
+    같은 idempotency_key의 재시도에는 token 이벤트 없이 저장된 응답을 done 이벤트로 보낸다."""
+    config = {"configurable": {"thread_id": request.session_id}}
+    sse_headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    replay, owner = begin_replay(replay_cache, request)
+    if not owner:
+        async def replay_stream():
+            try:
+                response = await wait_for_replay(replay, "chat_send_stream")
+                yield sse_event("done", response.model_dump())
+            except HTTPException as e:
+                yield sse_event("error", {"detail": e.detail})
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"메시지 처리 중 오류 발생: {str(e)}")
+        return StreamingResponse(replay_stream(), media_type="text/event-stream", headers=sse_headers)
+
+    # 거절은 스트림을 시작하기 전에 429로 알려야 하므로 여기서 받아들이고, 스트림이 끝날 때 반납
+    try:
+        ticket = await admit(admission, http_request, request.session_id)
+    except HTTPException as e:
+        finish_replay(replay_cache, request, replay, error=e)
+        raise
+
+    async def event_stream():
+        trace = start_trace(request.session_id, "chat_send_stream")
+        # QA_SPECULATIVE일 때 분류 결과보다 먼저 나온 답변 토큰은 continue_chat으로 확인된 뒤에 보낸다
+        gate = SpeculativeAnswerGate()
+        qa_stream_gate.set(gate)
+        try:
+            response_state = await generating_state(app, config)
+            if response_state is None:
+                async for chunk, metadata in app.astream(
+                    {"messages": [HumanMessage(content=request.message)]},
+                    config=config,
+                    stream_mode="messages"
+                ):
+                    tags = metadata.get("tags", [])
+                    if QA_ANSWER_TAG not in tags or not isinstance(chunk.content, str) or not chunk.content:
+                        continue
+                    if QA_SPECULATIVE_TAG in tags and not gate.confirmed:
+                        gate.pending.append(chunk.content)
+                        continue
+                    for content in gate.release():
+                        yield sse_event("token", {"content": content})
+                    yield sse_event("token", {"content": chunk.content})
+                # 의도가 확인되기 전에 답변이 다 나온 경우 (종료 의도면 버린다)
+                for content in gate.release():
+                    yield sse_event("token", {"content": content})
+                response_state = (await app.aget_state(config)).values
+
+            await submit_resume_job(resume_jobs, request.session_id, response_state)
+            finish_trace(trace)
+            response = build_chat_response(request.session_id, response_state)
+            finish_replay(replay_cache, request, replay, response)
+            yield sse_event("done", response.model_dump())
+
+        except Exception as e:
+            finish_trace(trace, error=type(e).__name__)
+            detail = f"메시지 처리 중 오류 발생: {str(e)}"
+            finish_replay(replay_cache, request, replay, error=HTTPException(status_code=500, detail=detail))
+            yield sse_event("error", {"detail": detail})
+        finally:
+            finish_replay(replay_cache, request, replay)
+            admission.release(ticket)
+
+    def abandon():
+        finish_replay(replay_cache, request, replay)
+        admission.release(ticket)
+
+    stream = event_stream()
+    # 클라이언트가 스트림 시작 전에 끊어 제너레이터가 실행되지 않은 경우에도 반납되도록
+    weakref.finalize(stream, abandon)
+    return StreamingResponse(stream, media_type="text/event-stream", headers=sse_headers)
+
+
+@router.get("/chat/status/{session_id}", response_model=ChatResponse)
+async def get_chat_status(
+        session_id: str,
+        app=Depends(get_langgraph_app),
+        resume_jobs=Depends(get_resume_jobs)
+):
+    """next_step이 "generating"인 세션을 폴링해, 지원서가 완성되면 profile_data와 함께 "done"을 돌려준다."""
+    config = {"configurable": {"thread_id": session_id}}
+    response_state = (await app.aget_state(config)).values
+    if not response_state.get("messages"):
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+
+    if response_state.get("next_question") == "generate_resume":
+        failure = resume_jobs.failure(session_id) if resume_jobs.status(session_id) == "failed" else None
+        # 실패했거나, 재시작 등으로 작업 기록이 없으면 다시 등록 (다른 워커가 소유권을 갖고 있으면 그 워커에 맡긴다)
+        await resume_jobs.submit(session_id)
+        if failure:
+            raise HTTPException(status_code=500, detail=f"지원서 생성 중 오류 발생: {failure}")
+
+    return build_chat_response(session_id, response_state)
+
+
+@router.get("/stats")
+async def get_stats(
+        app=Depends(get_langgraph_app),
+        resume_jobs=Depends(get_resume_jobs),
+        admission=Depends(get_admission),
+        replay_cache=Depends(get_replay_cache)
+):
+    checkpointer = app.checkpointer
+    return {
+        "sessions": checkpointer.stats() if hasattr(checkpointer, "stats") else None,
+        "intent_tiers": dict(intent_stats),
+        "qa_turns": qa_timing_stats(),
+        "answer_cache": answer_cache.stats(),
+        "llm_gateway": llm_gateway.stats(),
+        "llm_client": llm.stats(),
+        "club_info": club_config.stats(),
+        "prompt_chains": prompt_registry.stats(),
+        "resume_jobs": resume_jobs.stats(),
+        "admission": admission.stats(),
+        "idempotency": replay_cache.stats(),
+        "extraction": extraction_summary(),
+    }
@@ -0,0 +1,113 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+
+
+class IdempotencyConflict(Exception):
+    """같은 idempotency_key로 다른 메시지를 보낸 경우."""
+
+
+class _Replay:
+    __slots__ = ("fingerprint", "future", "expires_at")
+
+    def __init__(self, fingerprint, future, expires_at):
+        self.fingerprint = fingerprint
+        self.future = future
+        self.expires_at = expires_at
+
+
+def _fingerprint(message):
+    return hashlib.sha256(message.encode("utf-8")).hexdigest()
+
+
+def _consume_exception(future):
+    # 기다리는 재시도가 없을 때 'exception was never retrieved' 경고가 찍히지 않도록
+    if not future.cancelled():
+        future.exception()
+
+
+class ReplayCache:
+    """세션별 idempotency_key → /chat/send 응답 보관소.
+
+    클라이언트가 네트워크 오류로 같은 메시지를 다시 보내면 그래프를 다시 실행하지 않고
+    (LLM 비용이 두 번 들고, 대화 기록에 같은 메시지가 두 번 쌓이므로) 저장된 응답을 돌려준다.
+    - 처리 중인 요청은 Future로 보관하여, 같은 키의 재시도는 그 결과를 기다린다
+    - 처리에 실패하면 키를 지워 다음 재시도가 다시 처리되게 한다 (기다리던 재시도에는 같은 오류)
+    - 세션마다 최근 max_keys_per_session개 키를 ttl초 동안, 세션은 최근 max_sessions개만 보관
+    """
+
+    def __init__(self, *, max_sessions=10000, max_keys_per_session=8, ttl=600.0):
+        self.max_sessions = max_sessions
+        self.max_keys_per_session = max_keys_per_session
+        self.ttl = ttl
+        self._sessions = OrderedDict()
+        self.stored = 0
+        self.replayed = 0
+        self.waited = 0
+        self.conflicts = 0
+
+    def begin(self, session_id, key, message):
+        """(future, owner). owner가 True면 호출한 쪽이 처리하고 complete()나 fail()을 불러야 한다.
+
+        False면 같은 키로 처리 중이거나 끝난 요청의 future (await해서 응답을 받는다).
+        """
+        keys = self._sessions.get(session_id)
+        if keys is None:
+            keys = self._sessions[session_id] = OrderedDict()
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+
+        fingerprint = _fingerprint(message)
+        replay = keys.get(key)
+        if replay is not None and replay.expires_at is not None and replay.expires_at < time.monotonic():
+            del keys[key]
+            replay = None
+        if replay is not None:
+            if replay.fingerprint != fingerprint:
+                self.conflicts += 1
+                raise IdempotencyConflict(key)
+            if replay.future.done():
+                self.replayed += 1
+            else:
+                self.waited += 1
+            return replay.future, False
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_exception)
+        keys[key] = _Replay(fingerprint, future, None)
+        while len(keys) > self.max_keys_per_session:
+            keys.popitem(last=False)
+        return future, True
+
+    def complete(self, session_id, key, future, response):
+        if future.done():
+            return
+        future.set_result(response)
+        self.stored += 1
+        replay = self._sessions.get(session_id, {}).get(key)
+        if replay is not None and replay.future is future:
+            replay.expires_at = time.monotonic() + self.ttl
+
+    def fail(self, session_id, key, future, error):
+        """이미 끝난 future(저장된 응답)에는 아무것도 하지 않으므로 finally에서 호출해도 된다."""
+        if future.done():
+            return
+        keys = self._sessions.get(session_id)
+        if keys is not None:
+            replay = keys.get(key)
+            if replay is not None and replay.future is future:
+                del keys[key]
+        future.set_exception(error)
+
+    def stats(self):
+        return {
+            "sessions": len(self._sessions),
+            "keys": sum(len(keys) for keys in self._sessions.values()),
+            "stored": self.stored,
+            "replayed": self.replayed,
+            "waited": self.waited,
+            "conflicts": self.conflicts,
+        }
@@ -1,5 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
+from ..club import TENANT_ID_PATTERN
+
+
+class StartChatRequest(BaseModel):
+    # 대화에 쓸 동아리 정보 (CLUB_INFO_DIR/<tenant_id>.json). 없으면 기본 테넌트
+    tenant_id: Optional[str] = Field(default=None, pattern=TENANT_ID_PATTERN)
 
 
 class StartChatResponse(BaseModel):
@@ -11,6 +17,8 @@ class StartChatResponse(BaseModel):
 class ChatRequest(BaseModel):
     session_id: str
     message: str
+    # 재시도할 때 같은 값을 보내면 다시 처리하지 않고 처음 응답을 돌려준다 (메시지마다 새로 만든 UUID 등)
+    idempotency_key: Optional[str] = Field(default=None, max_length=128)
 
 
 class ProfileData(BaseModel):
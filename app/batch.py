@@ -0,0 +1,167 @@
+"""완료된 지원서를 일괄로 다시 생성해 JSONL/CSV로 내보내는 배치 작업.
+
+프롬프트를 바꾼 뒤 지원 동기를 다시 만들거나, 모집이 끝난 뒤 지원서를 한 번에 받아볼 때 사용한다.
+이미 처리한 세션은 진행 기록 파일(<출력 파일>.progress)에 남기므로, 중간에 멈춰도 다시 실행하면 이어서 처리한다.
+
+실행 예 (SQLite 세션 저장소 필요):
+    python -m app.batch --out exports/resumes.jsonl --concurrency 8
+    python -m app.batch --out exports/resumes.csv --format csv
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import time
+
+from app.config import SQLITE_CHECKPOINT_PATH, SESSION_MAX_CHECKPOINTS
+
+EXPORT_FIELDS = [
+    "session_id", "name", "department", "age", "phone_number", "positions",
+    "motivation", "previous_motivation",
+]
+
+
+async def iter_completed_sessions(checkpointer):
+    """체크포인터에서 대화를 마친 세션의 최신 상태를 하나씩 꺼낸다."""
+    seen = set()
+    async for checkpoint_tuple in checkpointer.alist(None):
+        session_id = checkpoint_tuple.config["configurable"]["thread_id"]
+        if session_id in seen:
+            continue
+        seen.add(session_id)
+        values = checkpoint_tuple.checkpoint["channel_values"]
+        if values.get("next_question") == "done":
+            yield session_id, values
+
+
+class ResumeExporter:
+    def __init__(self, out_path, fmt="jsonl", concurrency=4):
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+        self.out_path = out_path
+        self.progress_path = f"{out_path}.progress"
+        self.fmt = fmt
+        self.concurrency = concurrency
+        self.processed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.started_at = None
+        self.finished_at = None
+
+    def _load_progress(self):
+        if not os.path.exists(self.progress_path):
+            return set()
+        with open(self.progress_path, "r", encoding="utf-8") as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def _write_row(self, out_file, writer, row):
+        if self.fmt == "jsonl":
+            out_file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        else:
+            writer.writerow({**row, "positions": ", ".join(row["positions"] or [])})
+        out_file.flush()
+
+    async def run(self, checkpointer):
+        # 지연 임포트: 노드 모듈은 LangChain/LangGraph와 동아리 정보 설정까지 불러오므로 실제로 실행할 때만 불러온다
+        from app.bot.nodes import generate_motivation
+
+        self.started_at = time.perf_counter()
+        done_ids = self._load_progress()
+        out_dir = os.path.dirname(self.out_path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        is_new_file = not os.path.exists(self.out_path)
+
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        write_lock = asyncio.Lock()
+
+        with open(self.out_path, "a", encoding="utf-8", newline="") as out_file, \
+                open(self.progress_path, "a", encoding="utf-8") as progress_file:
+            writer = csv.DictWriter(out_file, fieldnames=EXPORT_FIELDS) if self.fmt == "csv" else None
+            if writer and is_new_file:
+                writer.writeheader()
+
+            async def worker():
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        queue.task_done()
+                        return
+                    session_id, values = item
+                    try:
+                        motivation = await generate_motivation(values)
+                        row = {
+                            "session_id": session_id,
+                            "name": values.get("name"),
+                            "department": values.get("department"),
+                            "age": values.get("age"),
+                            "phone_number": values.get("phone_number"),
+                            "positions": values.get("positions"),
+                            "motivation": motivation,
+                            "previous_motivation": values.get("motivation"),
+                        }
+                        async with write_lock:
+                            self._write_row(out_file, writer, row)
+                            # 결과를 쓴 뒤에 진행 기록을 남겨야 중단돼도 빠지는 세션이 없다
+                            progress_file.write(session_id + "\n")
+                            progress_file.flush()
+                        self.processed += 1
+                    except Exception as e:
+                        # 진행 기록에 남기지 않으므로 다음 실행 때 다시 시도된다
+                        print(f"[Batch] {session_id} 처리 실패: {e}")
+                        self.failed += 1
+                    finally:
+                        queue.task_done()
+
+            workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+            try:
+                async for session_id, values in iter_completed_sessions(checkpointer):
+                    if session_id in done_ids:
+                        self.skipped += 1
+                        continue
+                    await queue.put((session_id, values))
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+            finally:
+                for task in workers:
+                    task.cancel()
+
+        self.finished_at = time.perf_counter()
+        return self.stats()
+
+    def stats(self):
+        end = self.finished_at or time.perf_counter()
+        elapsed = (end - self.started_at) if self.started_at else 0.0
+        return {
+            "out_path": self.out_path,
+            "format": self.fmt,
+            "concurrency": self.concurrency,
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 1),
+            "applications_per_minute": round(self.processed / elapsed * 60, 1) if elapsed else None,
+            "finished": self.finished_at is not None,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="완료된 지원서를 일괄로 다시 생성해 내보냅니다.")
+    parser.add_argument("--out", required=True, help="출력 파일 경로 (.jsonl 또는 .csv)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="출력 형식 (기본: 확장자로 판단)")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 생성할 지원서 수")
+    parser.add_argument("--db", default=SQLITE_CHECKPOINT_PATH, help="SQLite 세션 저장소 경로")
+    args = parser.parse_args()
+
+    from app.bot.checkpointer import SQLiteSaver
+
+    fmt = args.format or ("csv" if args.out.endswith(".csv") else "jsonl")
+    checkpointer = SQLiteSaver(args.db, max_checkpoints=SESSION_MAX_CHECKPOINTS)
+    exporter = ResumeExporter(args.out, fmt=fmt, concurrency=args.concurrency)
+    print(json.dumps(asyncio.run(exporter.run(checkpointer)), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
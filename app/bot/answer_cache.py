@@ -0,0 +1,267 @@
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+
+from .intent import normalize
+from .extraction import mentioned_positions
+
+_NUMBER_RE = re.compile(r"\d+")
+_WORD_RE = re.compile(r"[가-힣A-Za-z]{2,}")
+
+
+def _ngrams(text, n=2):
+    normalized = normalize(text)
+    if len(normalized) < n:
+        return Counter([normalized]) if normalized else Counter()
+    return Counter(normalized[i:i + n] for i in range(len(normalized) - n + 1))
+
+
+def _activity_keywords(club_info):
+    """활동 이름을 이루는 단어들 ("프로젝트 수행 (외주)" → 프로젝트, 수행, 외주)."""
+    keywords = set()
+    for activity in club_info.get("activities", []):
+        keywords.update(word.lower() for word in _WORD_RE.findall(activity.get("name", "")))
+    return tuple(sorted(keywords))
+
+
+def _entities(text, activity_keywords):
+    """질문이 가리키는 대상 (포지션, 활동 이름의 단어, 숫자). 글자가 비슷해도 대상이 다르면 다른 질문이다."""
+    normalized = normalize(text)
+    entities = {f"position:{position}" for position in mentioned_positions(text)}
+    entities.update(f"activity:{keyword}" for keyword in activity_keywords if keyword in normalized)
+    entities.update(f"number:{number}" for number in _NUMBER_RE.findall(normalized))
+    return frozenset(entities)
+
+
+class _Entry:
+    __slots__ = ("question", "answer", "vector", "entities", "expires_at")
+
+    def __init__(self, question, answer, entities, expires_at=None):
+        self.question = question
+        self.answer = answer
+        self.vector = _ngrams(question)
+        self.entities = entities
+        self.expires_at = expires_at
+
+
+def _containment(vector, other):
+    """vector(질문)의 bigram 중 other(항목 질문)에 들어 있는 비율.
+
+    사용자 질문은 FAQ 질문보다 짧게 묻는 경우가 많아("모임은 언제 해?" ↔ "정기 모임은 언제 어디서 하나요?")
+    코사인 유사도 대신 질문 쪽 기준으로 잰다. 질문에 다른 내용이 섞이면 그만큼 낮아진다.
+    """
+    size = sum(vector.values())
+    if not size:
+        return 0.0
+    return sum(min(count, other[gram]) for gram, count in vector.items() if gram in other) / size
+
+
+class AnswerCache:
+    """동아리 정보의 FAQ/활동/모집 대상 항목에 대한 답변 캐시.
+
+    질문을 정규화해 문자 bigram으로 항목을 찾고, 질문의 threshold 이상이 항목 질문에 들어 있으면서 질문이 가리키는 대상
+    (포지션, 활동 이름의 단어, 숫자)이 같으면 LLM 호출 없이 동아리 정보의 답을 돌려준다.
+    - 항목은 동아리 정보 스냅샷이 바뀔 때만 다시 만든다 (학습한 질문도 모두 버림)
+    - 캐시를 못 쓴 질문의 LLM 답변이 어떤 항목의 답과 거의 같으면, 그 질문을 항목의 다른 표현으로 학습한다.
+      저장하는 것은 질문과 항목뿐이고, 적중하면 동아리 정보의 답을 보낸다
+      (LLM 답변은 세션의 대화 내역을 보고 만들어지므로 다른 세션에 보내면 안 된다)
+    - 학습한 질문은 max_size개까지 LRU로, ttl 초 동안만 보관
+    """
+
+    def __init__(self, *, threshold=0.5, max_size=512, ttl=86400.0, answer_overlap=0.6, min_grams=3):
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+        # 학습 조건: LLM 답변이 대상이 같은 항목 답의 answer_overlap 이상을 담고 있을 때
+        self.answer_overlap = answer_overlap
+        # "언제?"처럼 너무 짧은 질문은 어느 항목에나 들어 있으므로 캐시를 쓰지 않는다
+        self.min_grams = min_grams
+        self.version = None
+        self._seeds = []
+        self._learned = OrderedDict()
+        self._index = defaultdict(set)
+        self._activity_keywords = ()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.learned = 0
+        self.saved_ms = 0.0
+        self._avg_llm_ms = None
+
+    def sync(self, club):
+        """동아리 정보가 바뀌었으면 항목을 다시 만들고 학습한 질문을 버린다."""
+        if club.version == self.version:
+            return
+        activity_keywords = _activity_keywords(club.info)
+        seeds = [
+            _Entry(question, answer, _entities(question, activity_keywords))
+            for question, answer in self._faq_pairs(club.info)
+        ]
+        with self._lock:
+            self._seeds = seeds
+            self._learned.clear()
+            self._index.clear()
+            self._activity_keywords = activity_keywords
+            self.version = club.version
+
+    @staticmethod
+    def _faq_pairs(club_info):
+        for faq in club_info.get("faq", []):
+            yield faq["question"], faq["answer"]
+
+        activities = club_info.get("activities", [])
+        if activities:
+            lines = [f"{activity['name']}: {activity['description']}" for activity in activities]
+            answer = "우리 동아리는 이런 활동을 하고 있어!\n" + "\n".join(lines)
+            for question in ("어떤 활동을 하나요?", "동아리에서 무슨 활동해?", "주요 활동 알려줘", "활동은 뭐 해요?"):
+                yield question, answer
+
+        if target := club_info.get("targetAudience"):
+            for question in ("누가 지원할 수 있나요?", "지원 대상이 어떻게 돼?", "지원 대상이 누구야?"):
+                yield question, target
+
+    def _best(self, vector, entities, now):
+        """대상이 같은 항목 중 가장 많이 겹치는 항목과 점수. 잠금을 잡은 채로 호출."""
+        candidates = list(self._seeds)
+        keys = set()
+        for gram in vector:
+            keys.update(self._index.get(gram, ()))
+        for key in keys:
+            entry = self._learned.get(key)
+            if entry is None:
+                continue
+            if entry.expires_at <= now:
+                self._remove(key)
+                continue
+            candidates.append(entry)
+
+        best, best_score = None, 0.0
+        for entry in candidates:
+            if entry.entities != entities:
+                continue
+            score = _containment(vector, entry.vector)
+            if score > best_score:
+                best, best_score = entry, score
+        return best, best_score
+
+    def lookup(self, question, version):
+        vector = _ngrams(question)
+        if sum(vector.values()) < self.min_grams or version != self.version:
+            # 이전 스냅샷으로 처리 중인 요청은 캐시를 사용하지 않는다
+            return None
+
+        with self._lock:
+            entities = _entities(question, self._activity_keywords)
+            best, best_score = self._best(vector, entities, time.monotonic())
+            if best is None or best_score < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if self._avg_llm_ms is not None:
+                self.saved_ms += self._avg_llm_ms
+            key = normalize(best.question)
+            if key in self._learned:
+                self._learned.move_to_end(key)
+            return best.answer
+
+    def learn(self, question, llm_answer, version):
+        """캐시를 못 쓴 질문의 LLM 답변이 어떤 항목의 답과 거의 같으면 질문을 그 항목의 다른 표현으로 기억한다.
+
+        LLM 답변 자체는 저장하지 않는다. 학습했으면 True.
+        """
+        vector = _ngrams(question)
+        if sum(vector.values()) < self.min_grams or version != self.version or self.max_size <= 0:
+            return False
+        key = normalize(question)
+
+        answer_vector = _ngrams(llm_answer)
+        with self._lock:
+            entities = _entities(question, self._activity_keywords)
+            best, best_score = None, 0.0
+            for seed in self._seeds:
+                if seed.entities != entities:
+                    continue
+                score = _containment(_ngrams(seed.answer), answer_vector)
+                if score > best_score:
+                    best, best_score = seed, score
+            if best is None or best_score < self.answer_overlap:
+                return False
+            now = time.monotonic()
+            if key in self._learned:
+                self._remove(key)
+            entry = _Entry(question, best.answer, entities, now + self.ttl)
+            self._learned[key] = entry
+            for gram in entry.vector:
+                self._index[gram].add(key)
+            while len(self._learned) > self.max_size:
+                self._remove(next(iter(self._learned)))
+            self.learned += 1
+        return True
+
+    def _remove(self, key):
+        entry = self._learned.pop(key)
+        for gram in entry.vector:
+            keys = self._index.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[gram]
+
+    def record_llm_ms(self, llm_ms):
+        """캐시를 쓰지 못해 LLM으로 답한 시간. 적중 때 아낀 시간(saved_ms)을 추정하는 데 쓴다."""
+        with self._lock:
+            self._avg_llm_ms = llm_ms if self._avg_llm_ms is None else self._avg_llm_ms * 0.9 + llm_ms * 0.1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "saved_ms": round(self.saved_ms, 1),
+            "avg_llm_ms": round(self._avg_llm_ms, 1) if self._avg_llm_ms is not None else None,
+            "faq_entries": len(self._seeds),
+            "learned_entries": len(self._learned),
+        }
+
+
+class TenantAnswerCaches:
+    """테넌트별 AnswerCache. 테넌트의 동아리 정보가 처음 들어올 때(sync) 만든다.
+
+    답변은 동아리마다 다르므로 캐시를 테넌트끼리 공유하지 않는다.
+    """
+
+    def __init__(self, **options):
+        self.options = options
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def get(self, tenant_id) -> AnswerCache:
+        cache = self._caches.get(tenant_id)
+        if cache is None:
+            with self._lock:
+                cache = self._caches.get(tenant_id)
+                if cache is None:
+                    cache = AnswerCache(**self.options)
+                    self._caches = {**self._caches, tenant_id: cache}
+        return cache
+
+    def sync(self, club):
+        self.get(club.tenant_id).sync(club)
+
+    def stats(self):
+        caches = list(self._caches.values())
+        hits = sum(cache.hits for cache in caches)
+        misses = sum(cache.misses for cache in caches)
+        return {
+            "tenants": len(caches),
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 3) if hits + misses else None,
+            "saved_ms": round(sum(cache.saved_ms for cache in caches), 1),
+            "faq_entries": sum(len(cache._seeds) for cache in caches),
+            "learned_entries": sum(len(cache._learned) for cache in caches),
+        }
@@ -0,0 +1,502 @@
+import asyncio
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+
+class BoundedInMemorySaver(InMemorySaver):
+    """세션 수, 유휴 시간, 세션당 체크포인트 수가 제한된 InMemorySaver.
+
+    - max_sessions를 넘으면 가장 오래 사용되지 않은 세션부터 제거 (LRU)
+    - idle_ttl 초 동안 사용되지 않은 세션은 제거
+    - 세션마다 최근 max_checkpoints 개의 체크포인트만 보관 (대화 재개에는 최신 하나면 충분)
+    """
+
+    def __init__(self, *, max_sessions=10000, idle_ttl=3600.0, max_checkpoints=1, **kwargs):
+        super().__init__(**kwargs)
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_checkpoints = max(1, max_checkpoints)
+        self.evictions = 0
+        self._last_access = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def live_sessions(self):
+        return len(self._last_access)
+
+    def stats(self):
+        return {
+            "live_sessions": self.live_sessions,
+            "evictions": self.evictions,
+            "max_sessions": self.max_sessions,
+            "idle_ttl": self.idle_ttl,
+        }
+
+    def get_tuple(self, config):
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            self._evict_expired(time.monotonic())
+            if thread_id not in self.storage:
+                # defaultdict에 빈 세션이 생기지 않도록 조회 전에 걸러낸다
+                return None
+            self._touch(thread_id)
+            return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with self._lock:
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+            thread_id = config["configurable"]["thread_id"]
+            checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+            self._prune_checkpoints(thread_id, checkpoint_ns)
+            self._touch(thread_id)
+            self._evict_over_capacity()
+            return next_config
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            if thread_id not in self.storage:
+                # 이미 제거된 세션에 대한 늦은 쓰기는 무시
+                return
+            super().put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id):
+        # 기본 구현은 전체 writes/blobs를 훑으므로, 세션이 가진 키만 골라 지운다
+        with self._lock:
+            self._last_access.pop(thread_id, None)
+            namespaces = self.storage.pop(thread_id, None)
+            if not namespaces:
+                return
+            for checkpoint_ns, checkpoints in namespaces.items():
+                for checkpoint_id, saved in checkpoints.items():
+                    self._drop_checkpoint(thread_id, checkpoint_ns, checkpoint_id, saved)
+
+    def _touch(self, thread_id):
+        self._last_access[thread_id] = time.monotonic()
+        self._last_access.move_to_end(thread_id)
+
+    def _evict(self, thread_id):
+        self.delete_thread(thread_id)
+        self.evictions += 1
+
+    def _evict_expired(self, now):
+        # _last_access는 접근 시간 순으로 정렬되어 있으므로 앞에서부터만 확인하면 된다
+        while self._last_access:
+            thread_id, last = next(iter(self._last_access.items()))
+            if now - last < self.idle_ttl:
+                break
+            self._evict(thread_id)
+
+    def _evict_over_capacity(self):
+        self._evict_expired(time.monotonic())
+        while len(self._last_access) > self.max_sessions:
+            thread_id = next(iter(self._last_access))
+            self._evict(thread_id)
+
+    def _channel_versions(self, saved):
+        return self.serde.loads_typed(saved[0])["channel_versions"]
+
+    def _drop_checkpoint(self, thread_id, checkpoint_ns, checkpoint_id, saved, keep_versions=()):
+        self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+        for channel, version in self._channel_versions(saved).items():
+            if (channel, version) not in keep_versions:
+                self.blobs.pop((thread_id, checkpoint_ns, channel, version), None)
+
+    def _prune_checkpoints(self, thread_id, checkpoint_ns):
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if len(checkpoints) <= self.max_checkpoints:
+            return
+
+        ordered_ids = sorted(checkpoints.keys(), reverse=True)
+        # 남은 체크포인트가 참조하는 채널 버전의 blob은 유지
+        live_versions = set()
+        for checkpoint_id in ordered_ids[:self.max_checkpoints]:
+            live_versions.update(self._channel_versions(checkpoints[checkpoint_id]).items())
+        for checkpoint_id in ordered_ids[self.max_checkpoints:]:
+            saved = checkpoints.pop(checkpoint_id)
+            self._drop_checkpoint(thread_id, checkpoint_ns, checkpoint_id, saved, live_versions)
+
+
+class SQLiteSaver(BaseCheckpointSaver):
+    """로컬 SQLite 파일(WAL 모드)에 세션을 저장하는 체크포인터.
+
+    여러 워커 프로세스가 같은 파일을 공유하므로 어느 워커로 요청이 가도 세션을 이어갈 수 있고,
+    서버를 재시작해도 진행 중인 지원서가 유지된다.
+    - 턴마다 바뀐 채널(new_versions)의 값만 저장 (변경 없는 채널은 이전 버전 blob을 재사용)
+    - put_writes는 버퍼에 모았다가 다음 put과 한 트랜잭션으로 기록
+    - 세션마다 최근 max_checkpoints 개의 체크포인트만 보관
+    """
+
+    def __init__(self, path, *, max_checkpoints=1, busy_timeout_ms=5000, list_page_size=100, serde=None):
+        super().__init__(serde=serde)
+        self.path = path
+        self.max_checkpoints = max(1, max_checkpoints)
+        self.list_page_size = max(1, list_page_size)
+        self._lock = threading.RLock()
+        self._pending_writes = []
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self._setup()
+
+    def _setup(self):
+        with self._lock:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    checkpoint_id TEXT NOT NULL,
+                    parent_checkpoint_id TEXT,
+                    type TEXT,
+                    checkpoint BLOB,
+                    metadata_type TEXT,
+                    metadata BLOB,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+                );
+                CREATE TABLE IF NOT EXISTS blobs (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    channel TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    blob BLOB,
+                    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+                );
+                CREATE TABLE IF NOT EXISTS writes (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    checkpoint_id TEXT NOT NULL,
+                    task_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    channel TEXT NOT NULL,
+                    type TEXT,
+                    blob BLOB,
+                    task_path TEXT NOT NULL DEFAULT '',
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                );
+            """)
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    @contextmanager
+    def _snapshot(self):
+        # 다른 워커가 오래된 체크포인트를 정리하는 중에도 일관된 상태를 읽도록 읽기 트랜잭션으로 묶는다
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                yield self.conn
+            finally:
+                self.conn.execute("COMMIT")
+
+    def _flush_pending_writes(self, conn):
+        pending, self._pending_writes = self._pending_writes, []
+        for query, rows in pending:
+            conn.executemany(query, rows)
+
+    def flush(self):
+        with self._lock:
+            if self._pending_writes:
+                with self._transaction() as conn:
+                    self._flush_pending_writes(conn)
+
+    def stats(self):
+        self.flush()
+        with self._lock:
+            (live_sessions,) = self.conn.execute(
+                "SELECT COUNT(DISTINCT thread_id) FROM checkpoints"
+            ).fetchone()
+        return {"backend": "sqlite", "path": self.path, "live_sessions": live_sessions}
+
+    def get_tuple(self, config):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        self.flush()
+        with self._snapshot() as conn:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = conn.execute(
+                    "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                    "metadata_type, metadata FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                    "metadata_type, metadata FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            return self._row_to_tuple(row)
+
+    def _list_page(self, config, before, cursor):
+        """list()의 한 페이지를 읽는다. cursor는 앞 페이지 마지막 행의 (thread_id, checkpoint_id, checkpoint_ns).
+
+        (체크포인트 목록, 다음 cursor)를 돌려주고, 마지막 페이지면 다음 cursor는 None.
+        """
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+            "metadata_type, metadata FROM checkpoints"
+        )
+        where, params = [], []
+        if config:
+            where.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                where.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                where.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            where.append("checkpoint_id < ?")
+            params.append(before_id)
+        if cursor:
+            # OFFSET과 달리 페이지 사이에 세션이 추가/삭제되어도 건너뛰거나 중복되는 행이 없다
+            thread_id, checkpoint_id, checkpoint_ns = cursor
+            where.append(
+                "(thread_id > ? OR (thread_id = ? AND (checkpoint_id < ? OR (checkpoint_id = ? AND checkpoint_ns > ?))))"
+            )
+            params.extend([thread_id, thread_id, checkpoint_id, checkpoint_id, checkpoint_ns])
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY thread_id, checkpoint_id DESC, checkpoint_ns LIMIT ?"
+        params.append(self.list_page_size)
+
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        page = []
+        for row in rows:
+            with self._snapshot():
+                page.append(self._row_to_tuple(row))
+        if len(rows) < self.list_page_size:
+            return page, None
+        thread_id, checkpoint_ns, checkpoint_id = rows[-1][:3]
+        return page, (thread_id, checkpoint_id, checkpoint_ns)
+
+    @staticmethod
+    def _matches(checkpoint_tuple, filter):
+        return not filter or all(checkpoint_tuple.metadata.get(k) == v for k, v in filter.items())
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        self.flush()
+        cursor = None
+        while limit is None or limit > 0:
+            page, cursor = self._list_page(config, before, cursor)
+            for checkpoint_tuple in page:
+                if limit is not None and limit <= 0:
+                    return
+                if not self._matches(checkpoint_tuple, filter):
+                    continue
+                if limit is not None:
+                    limit -= 1
+                yield checkpoint_tuple
+            if cursor is None:
+                return
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        parent_checkpoint_id = config["configurable"].get("checkpoint_id")
+
+        c = checkpoint.copy()
+        values = c.pop("channel_values")
+        blob_rows = []
+        for channel, version in new_versions.items():
+            value_type, blob = self.serde.dumps_typed(values[channel]) if channel in values else ("empty", None)
+            blob_rows.append((thread_id, checkpoint_ns, channel, str(version), value_type, blob))
+        checkpoint_type, checkpoint_blob = self.serde.dumps_typed(c)
+        metadata_type, metadata_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+
+        with self._transaction() as conn:
+            self._flush_pending_writes(conn)
+            conn.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)", blob_rows)
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (thread_id, checkpoint_ns, checkpoint["id"], parent_checkpoint_id,
+                 checkpoint_type, checkpoint_blob, metadata_type, metadata_blob),
+            )
+            self._prune_checkpoints(conn, thread_id, checkpoint_ns)
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        if all(channel in WRITES_IDX_MAP for channel, _ in writes):
+            query = "INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        else:
+            query = "INSERT OR IGNORE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        rows = [
+            (thread_id, checkpoint_ns, checkpoint_id, task_id, WRITES_IDX_MAP.get(channel, idx),
+             channel, *self.serde.dumps_typed(value), task_path)
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        with self._lock:
+            self._pending_writes.append((query, rows))
+
+    def delete_thread(self, thread_id):
+        with self._transaction() as conn:
+            self._flush_pending_writes(conn)
+            for table in ("checkpoints", "blobs", "writes"):
+                conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    def get_next_version(self, current, channel):
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        next_v = current_v + 1
+        next_h = random.random()
+        return f"{next_v:032}.{next_h:016}"
+
+    async def astats(self):
+        return await asyncio.to_thread(self.stats)
+
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        # 세션 전체를 한 번에 읽지 않고 페이지마다 스레드에서 읽어 바로 넘긴다 (일괄 내보내기 등)
+        await asyncio.to_thread(self.flush)
+        cursor = None
+        while limit is None or limit > 0:
+            page, cursor = await asyncio.to_thread(self._list_page, config, before, cursor)
+            for checkpoint_tuple in page:
+                if limit is not None and limit <= 0:
+                    return
+                if not self._matches(checkpoint_tuple, filter):
+                    continue
+                if limit is not None:
+                    limit -= 1
+                yield checkpoint_tuple
+            if cursor is None:
+                return
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        # 메모리 버퍼에만 쌓으므로 스레드로 넘길 필요가 없다
+        self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def _row_to_tuple(self, row):
+        (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,
+         checkpoint_type, checkpoint_blob, metadata_type, metadata_blob) = row
+        checkpoint = self.serde.loads_typed((checkpoint_type, checkpoint_blob))
+        channel_values = self._load_blobs(thread_id, checkpoint_ns, checkpoint["channel_versions"])
+        pending_writes = [
+            (task_id, channel, self.serde.loads_typed((value_type, blob)))
+            for task_id, channel, value_type, blob in self.conn.execute(
+                "SELECT task_id, channel, type, blob FROM writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            )
+        ]
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self.serde.loads_typed((metadata_type, metadata_blob)),
+            parent_config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": parent_checkpoint_id,
+                }
+            } if parent_checkpoint_id else None,
+            pending_writes=pending_writes,
+        )
+
+    def _load_blobs(self, thread_id, checkpoint_ns, versions):
+        if not versions:
+            return {}
+        placeholders = ", ".join("(?, ?)" for _ in versions)
+        params = [thread_id, checkpoint_ns]
+        for channel, version in versions.items():
+            params.extend((channel, str(version)))
+        rows = self.conn.execute(
+            "SELECT channel, type, blob FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? "
+            f"AND (channel, version) IN (VALUES {placeholders})",
+            params,
+        )
+        return {
+            channel: self.serde.loads_typed((value_type, blob))
+            for channel, value_type, blob in rows
+            if value_type != "empty"
+        }
+
+    def _prune_checkpoints(self, conn, thread_id, checkpoint_ns):
+        rows = conn.execute(
+            "SELECT checkpoint_id, type, checkpoint FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC",
+            (thread_id, checkpoint_ns),
+        ).fetchall()
+        if len(rows) <= self.max_checkpoints:
+            return
+
+        live_versions = set()
+        for _, checkpoint_type, checkpoint_blob in rows[:self.max_checkpoints]:
+            saved = self.serde.loads_typed((checkpoint_type, checkpoint_blob))
+            live_versions.update((channel, str(version)) for channel, version in saved["channel_versions"].items())
+        stale_ids = [(thread_id, checkpoint_ns, checkpoint_id) for checkpoint_id, _, _ in rows[self.max_checkpoints:]]
+        conn.executemany(
+            "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?", stale_ids
+        )
+        conn.executemany(
+            "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?", stale_ids
+        )
+        stale_blobs = [
+            (thread_id, checkpoint_ns, channel, version)
+            for channel, version in conn.execute(
+                "SELECT channel, version FROM blobs WHERE thread_id = ? AND checkpoint_ns = ?",
+                (thread_id, checkpoint_ns),
+            )
+            if (channel, version) not in live_versions
+        ]
+        conn.executemany(
+            "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+            stale_blobs,
+        )
@@ -0,0 +1,184 @@
+import re
+from collections import Counter
+
+from .state import UserInfo
+
+USER_INFO_FIELDS = ("name", "department", "age", "phone_number")
+# LLM을 호출했다면 로컬 값보다 LLM 값을 쓰는 필드
+_LLM_PREFERRED_FIELDS = ("name", "department")
+
+# 필드별로 어디서 값을 얻었는지 집계 (local / llm / missing)
+extraction_stats = {field: Counter() for field in USER_INFO_FIELDS + ("positions",)}
+
+_PHONE_RE = re.compile(r"(?<!\d)(01[016789])[-.\s]?(\d{3,4})[-.\s]?(\d{4})(?!\d)")
+_AGE_RE = re.compile(r"(?<!\d)(\d{2})\s*(?:살|세)")
+_STUDENT_ID_RE = re.compile(r"(?<!\d)(\d{2})\s*학번")
+# 띄어쓰지 않은 "저는컴퓨터공학과"에서 "저는"까지 학과로 잡지 않도록 앞의 주어는 따로 뗀다
+# ("전"/"난"은 "전자공학과"처럼 학과 이름의 일부일 수 있어 떼지 않는다)
+_DEPARTMENT_RE = re.compile(r"(?:저는|나는|제\s*전공은|전공은|학과는)?([가-힣A-Za-z]{1,15}(?:학과|학부|전공))")
+# "비전공자", "부전공"처럼 학과 이름이 아닌데 "전공"으로 끝나는 말
+_NOT_DEPARTMENTS = {"비전공", "무전공", "부전공", "복수전공", "이중전공", "연계전공"}
+# 이름은 오인하기 쉬우므로 확실한 형태만 로컬에서 채우고, 나머지는 LLM에 맡긴다
+# - "이름은 홍길동", "제 이름은 홍길동이에요"
+# - 메시지 첫머리의 "홍길동입니다", "안녕하세요 저는 홍길동이라고 합니다"
+_NAME_RES = [
+    re.compile(r"(?:제\s*)?이름은\s*([가-힣]{2,4}?)(?=이고|이구|이며|이에요|예요|입니다|이야|야|이라고|라고|[\s,.!]|$)"),
+    re.compile(r"^(?:안녕하세요|안녕)?[\s,.!]*(?:저는\s*)?([가-힣]{2,4}?)(?=입니다|이라고\s*합니다|라고\s*합니다)"),
+]
+_NOT_NAMES = {
+    "학생", "대학생", "졸업생", "개발자", "디자이너", "기획자", "직장인", "신입", "현직자", "취준생",
+    "백엔드", "프론트", "안녕", "반가워", "처음", "지원자", "여기", "컴공", "전공자", "비전공자", "재학생",
+}
+_NOT_NAME_SUFFIXES = ("과", "학부", "전공", "살", "세", "학번")
+_FILLER_RE = re.compile(
+    r"안녕하세요|안녕|반갑습니다|반가워요?|저는|제\s*이름은|이름은|나는|전화번호는|번호는|연락처는|나이는|학과는|"
+    r"이고|이구|이며|입니다|합니다|이라고|라고|이에요|에요|예요|이야|고요|이랑|그리고|살이|[\s,.!~:/()-]"
+)
+
+POSITION_SYNONYMS = {
+    "PLANNING": ["기획", "플래닝", "planner"],
+    "DESIGN": ["디자인", "디자이너", "design", "designer", "uiux"],
+    "FRONTEND": ["프론트", "프런트", "프론트엔드", "프런트엔드", "frontend", "front-end", "웹퍼블리셔"],
+    "BACKEND": ["백엔드", "백앤드", "백엔", "서버", "backend", "back-end", "server"],
+    "AI": ["ai", "인공지능", "머신러닝", "딥러닝", "에이아이", "데이터사이언스"],
+}
+# 일반 영어 문장에도 흔히 나오는 짧은 약어/단어 ("be", "3pm", "planning to ...").
+# 바로 뒤에 직무를 뜻하는 말이 올 때만 포지션으로 본다 ("fe 개발자", "pm 포지션", "be 쪽 개발")
+POSITION_ABBREVIATIONS = {
+    "PLANNING": ["pm", "po", "planning"],
+    "DESIGN": ["ui", "ux"],
+    "FRONTEND": ["fe", "front"],
+    "BACKEND": ["be", "back"],
+    "AI": ["ml"],
+}
+_ROLE_CONTEXT = r"(?=\s*(?:/\s*[a-z]+\s*)?(?:쪽\s*)?(?:개발|포지션|직무|엔지니어|디자인|디자이너|developer|engineer|position|role))"
+
+
+def _synonym_pattern(synonym):
+    # 영어 단어는 다른 단어나 숫자의 일부로 매칭되지 않도록 경계를 둔다 ("3pm", "maybe")
+    if synonym.isascii():
+        return rf"(?<![a-z0-9]){re.escape(synonym)}(?![a-z0-9])"
+    return re.escape(synonym)
+
+
+# 포지션 바로 뒤에 붙는 부정 표현 ("말고도"는 "~뿐 아니라"이므로 제외)
+_NEGATION_RE = re.compile(r"말고(?!도)|빼고|제외|별로|아니[고라요에]|싫|관심\s*없|생각\s*없|안\s*할|안\s*하고|못\s*하")
+_NEGATION_WINDOW = 10
+
+_POSITION_RES = {
+    position: re.compile("|".join(
+        [_synonym_pattern(synonym) for synonym in synonyms]
+        + [_synonym_pattern(abbreviation) + _ROLE_CONTEXT for abbreviation in POSITION_ABBREVIATIONS.get(position, [])]
+    ))
+    for position, synonyms in POSITION_SYNONYMS.items()
+}
+
+
+def extract_user_info(message):
+    """자기소개 메시지에서 정규식으로 확실히 찾을 수 있는 필드만 채운다.
+
+    (UserInfo, 남은 텍스트) 를 돌려준다. 남은 텍스트는 매칭된 부분과 인사말 등을 뺀 나머지로,
+    비어 있으면 LLM이 더 찾아낼 정보가 없다고 본다.
+    """
+    info = UserInfo()
+    residual = message
+
+    if match := _PHONE_RE.search(message):
+        info.phone_number = "-".join(match.groups())
+        residual = residual.replace(match.group(0), " ")
+    if match := _AGE_RE.search(message):
+        info.age = match.group(1)
+        residual = residual.replace(match.group(0), " ")
+    elif match := _STUDENT_ID_RE.search(message):
+        info.age = f"{match.group(1)}학번"
+        residual = residual.replace(match.group(0), " ")
+    for match in _DEPARTMENT_RE.finditer(message):
+        if match.group(1) in _NOT_DEPARTMENTS:
+            continue
+        info.department = match.group(1)
+        residual = residual.replace(match.group(1), " ")
+        break
+    for name_re in _NAME_RES:
+        for match in name_re.finditer(message.strip()):
+            candidate = match.group(1)
+            if candidate in _NOT_NAMES or candidate.endswith(_NOT_NAME_SUFFIXES):
+                continue
+            info.name = candidate
+            residual = residual.replace(candidate, " ", 1)
+            break
+        if info.name:
+            break
+
+    return info, _FILLER_RE.sub("", residual)
+
+
+def merge_user_info(local, fallback):
+    """LLM 결과와 로컬 결과를 합친다.
+
+    전화번호와 나이는 정규식이 정확하므로 로컬 값을 우선하고, 비어 있으면 LLM 값으로 채운다.
+    이름과 학과는 문맥을 보는 LLM 값을 그대로 쓴다 (LLM이 None이라고 하면 로컬에서 잘못 찾은 값도 지운다).
+    """
+    merged = UserInfo(**local.model_dump())
+    if fallback is None:
+        return merged
+    for field in USER_INFO_FIELDS:
+        value = getattr(fallback, field)
+        if field in _LLM_PREFERRED_FIELDS or getattr(merged, field) is None:
+            setattr(merged, field, value)
+    return merged
+
+
+def record_user_info_sources(local, final):
+    for field in USER_INFO_FIELDS:
+        # LLM 값으로 바뀐 이름/학과는 LLM에서 얻은 것으로 센다
+        if getattr(local, field) is not None and getattr(final, field) == getattr(local, field):
+            extraction_stats[field]["local"] += 1
+        elif getattr(final, field) is not None:
+            extraction_stats[field]["llm"] += 1
+        else:
+            extraction_stats[field]["missing"] += 1
+
+
+def extract_positions(message, club_positions):
+    """동의어 사전으로 관심 포지션을 찾는다. club_positions는 "PLANNING, DESIGN, ..." 형식.
+
+    "프론트 말고 백엔드", "기획은 별로고"처럼 바로 뒤에 부정 표현이 붙은 포지션은 빼고,
+    관심 있는 포지션을 하나도 찾지 못하면 빈 리스트를 돌려준다 (LLM으로 다시 판단).
+    """
+    allowed = [position.strip() for position in club_positions.split(",")]
+    text = message.lower()
+    mentions = []
+    for position in allowed:
+        pattern = _POSITION_RES.get(position)
+        if pattern is None:
+            pattern = re.compile(_synonym_pattern(position.lower()))
+        mentions.extend((match.start(), match.end(), position) for match in pattern.finditer(text))
+    mentions.sort()
+
+    wanted, negated = [], set()
+    for index, (start, end, position) in enumerate(mentions):
+        # 부정 표현은 다음 포지션이 나오기 전, 가까운 곳에 있을 때만 이 포지션에 붙은 것으로 본다
+        next_start = mentions[index + 1][0] if index + 1 < len(mentions) else len(text)
+        if _NEGATION_RE.search(text[end:min(next_start, end + _NEGATION_WINDOW)]):
+            negated.add(position)
+        elif position not in wanted:
+            wanted.append(position)
+    # 같은 포지션을 한 번은 원한다고 하고 한 번은 부정했다면 확실하지 않으므로 뺀다
+    return [position for position in allowed if position in wanted and position not in negated]
+
+
+def mentioned_positions(message):
+    """메시지에 언급된 포지션 이름 집합 (관심 여부와 관계없이). 답변 캐시가 질문의 대상을 비교할 때 사용."""
+    text = message.lower()
+    return {position for position, pattern in _POSITION_RES.items() if pattern.search(text)}
+
+
+def extraction_summary():
+    summary = {}
+    for field, counts in extraction_stats.items():
+        total = sum(counts.values())
+        summary[field] = {
+            **counts,
+            "local_hit_rate": round(counts["local"] / total, 3) if total else None,
+        }
+    return summary
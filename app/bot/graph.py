@@ -1,6 +1,14 @@
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import InMemorySaver
 
+from app.config import (
+    SESSION_MAX_COUNT,
+    SESSION_IDLE_TTL_SECONDS,
+    SESSION_MAX_CHECKPOINTS,
+    CHECKPOINTER_BACKEND,
+    SQLITE_CHECKPOINT_PATH,
+)
+from app.metrics import instrument_node
+from app.bot.checkpointer import BoundedInMemorySaver, SQLiteSaver
 from app.bot.state import ApplicationFormState
 from app.bot.nodes import (
     start_node,
@@ -13,17 +21,31 @@ from app.bot.nodes import (
 )
 
 
-def create_app():
-    memory = InMemorySaver()
+def create_checkpointer(backend=CHECKPOINTER_BACKEND):
+    if backend == "sqlite":
+        print(f"SQLite Checkpointer 사용: {SQLITE_CHECKPOINT_PATH}")
+        return SQLiteSaver(SQLITE_CHECKPOINT_PATH, max_checkpoints=SESSION_MAX_CHECKPOINTS)
+    if backend == "memory":
+        print(f"Bounded In-Memory Checkpointer 사용 (최대 세션 {SESSION_MAX_COUNT}개)")
+        return BoundedInMemorySaver(
+            max_sessions=SESSION_MAX_COUNT,
+            idle_ttl=SESSION_IDLE_TTL_SECONDS,
+            max_checkpoints=SESSION_MAX_CHECKPOINTS,
+        )
+    raise ValueError(f"지원하지 않는 CHECKPOINTER_BACKEND 입니다: {backend}")
+
+
+def create_app(checkpointer=None):
+    memory = checkpointer or create_checkpointer()
 
     workflow = StateGraph(ApplicationFormState)
 
-    workflow.add_node("start", start_node)
-    workflow.add_node("process_introduction", process_introduction)
-    workflow.add_node("process_position", process_position)
-    workflow.add_node("process_initial_motivation_node", process_initial_motivation_node)
-    workflow.add_node("qa_session_node", qa_session_node)
-    workflow.add_node("generate_resume_node", generate_resume_node)
+    workflow.add_node("start", instrument_node("start", start_node))
+    workflow.add_node("process_introduction", instrument_node("process_introduction", process_introduction))
+    workflow.add_node("process_position", instrument_node("process_position", process_position))
+    workflow.add_node("process_initial_motivation_node", instrument_node("process_initial_motivation_node", process_initial_motivation_node))
+    workflow.add_node("qa_session_node", instrument_node("qa_session_node", qa_session_node))
+    workflow.add_node("generate_resume_node", instrument_node("generate_resume_node", generate_resume_node))
 
     workflow.set_conditional_entry_point(router)
 
@@ -36,5 +58,5 @@ def create_app():
 
     app = workflow.compile(checkpointer=memory)
 
-    print("LangGraph 앱이 컴파일되었습니다. (In-Memory Checkpointer 사용)")
+    print("LangGraph 앱이 컴파일되었습니다.")
     return app
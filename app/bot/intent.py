@@ -0,0 +1,134 @@
+import math
+import re
+from collections import Counter, OrderedDict
+
+from app.config import INTENT_LOCAL_CLASSIFIER, INTENT_LOCAL_THRESHOLD, INTENT_CACHE_SIZE
+
+END_CHAT = "end_chat"
+CONTINUE_CHAT = "continue_chat"
+
+# 어느 단계에서 의도가 결정됐는지 집계 (keyword / local / llm / cache)
+intent_stats = Counter()
+
+_verdict_cache = OrderedDict()
+
+_STRIP_RE = re.compile(r"[\s.,!~…·'\"]+")
+
+# 메시지 전체가 종료 의사 표현인 경우 (예: "종료", "그만할게요", "이제 됐어")
+_END_EXACT_RE = re.compile(
+    r"^(이제|그럼|네|응|넹|ㅇㅇ|아니|아뇨)?"
+    r"(종료|그만|끝|됐어|됐다|됐습니다|됐어요|되었습니다|없어|없어요|없습니다|마무리|충분|괜찮아|괜찮아요|괜찮습니다|이만)"
+    r"(할게|할게요|할래|할래요|하자|해줘|해주세요|합니다|해|해요|요|야|이야|입니다|이에요|했어|했어요|해도돼|돼|돼요|"
+    r"될것같아|될것같아요|인것같아|같아|같아요|고마워|고마워요|감사합니다|ㅎㅎ|ㅋㅋ)*$"
+)
+# 메시지 안에 포함되면 종료로 볼 수 있는 표현 (질문 형태면 판단 보류)
+_END_CONTAINS_RE = re.compile(
+    r"지원서(를|좀)?(생성|만들|작성|정리)|대화(를)?(종료|끝|마치)|종료(해|할|하|합)|그만(할|하|해)|마무리(해|할|하)|"
+    r"질문(은|이)?(더)?없|궁금한(거|게|건|것)?(더|이제)?없|더(이상)?궁금한"
+)
+_QUESTION_RE = re.compile(
+    r"\?|뭐|무엇|언제|어디|어떻게|어떤|왜|누가|누구|무슨|몇|얼마|(나|까|가|니|지|냐)요?$|(인가|인지|할수있)"
+)
+
+_END_SEEDS = [
+    "종료할게요", "이제 그만할게", "궁금한 거 다 물어봤어", "이제 괜찮아요", "충분해요 고마워",
+    "지원서 만들어줘", "끝낼게요", "이만 마칠게요", "더 이상 질문 없어요", "이 정도면 됐어",
+]
+_CONTINUE_SEEDS = [
+    "동아리 활동 알려줘", "모임은 언제 해요", "프로젝트 뭐 했어", "하나만 더 물어볼게", "깍두기가 뭐야",
+    "지원 방법 알려줘", "마스터는 누구야", "외주 프로젝트 얘기해줘", "친목 활동 궁금해", "저도 참여할 수 있어요",
+]
+
+
+def normalize(text):
+    return _STRIP_RE.sub("", (text or "").lower())
+
+
+def detect_by_keyword(text):
+    """정규화한 메시지를 키워드/정규식으로 판별. 확신할 수 없으면 None."""
+    normalized = normalize(text)
+    if not normalized:
+        return CONTINUE_CHAT
+
+    is_question = bool(_QUESTION_RE.search(normalized))
+    if _END_EXACT_RE.match(normalized):
+        return END_CHAT
+    if _END_CONTAINS_RE.search(normalized):
+        return None if is_question else END_CHAT
+    if is_question:
+        return CONTINUE_CHAT
+    return None
+
+
+def _bigrams(text):
+    normalized = normalize(text)
+    return Counter(normalized[i:i + 2] for i in range(len(normalized) - 1)) or Counter([normalized])
+
+
+def _cosine(a, b):
+    dot = sum(count * b[gram] for gram, count in a.items() if gram in b)
+    if not dot:
+        return 0.0
+    norm_a = math.sqrt(sum(v * v for v in a.values()))
+    norm_b = math.sqrt(sum(v * v for v in b.values()))
+    return dot / (norm_a * norm_b)
+
+
+_END_VECTORS = [_bigrams(seed) for seed in _END_SEEDS]
+_CONTINUE_VECTORS = [_bigrams(seed) for seed in _CONTINUE_SEEDS]
+
+
+def detect_by_local_classifier(text, threshold=INTENT_LOCAL_THRESHOLD, margin=0.1):
+    """예시 문장과의 문자 bigram 유사도로 판별하는 가벼운 로컬 분류기. 애매하면 None."""
+    vector = _bigrams(text)
+    end_score = max(_cosine(vector, seed) for seed in _END_VECTORS)
+    continue_score = max(_cosine(vector, seed) for seed in _CONTINUE_VECTORS)
+    if max(end_score, continue_score) < threshold or abs(end_score - continue_score) < margin:
+        return None
+    return END_CHAT if end_score > continue_score else CONTINUE_CHAT
+
+
+def _remember(key, intent):
+    _verdict_cache[key] = intent
+    _verdict_cache.move_to_end(key)
+    while len(_verdict_cache) > INTENT_CACHE_SIZE:
+        _verdict_cache.popitem(last=False)
+
+
+def detect_intent_locally(text):
+    """캐시 → 키워드 → 로컬 분류기 순서로 의도를 판별. LLM 없이 결정할 수 없으면 None."""
+    key = normalize(text)
+    if key in _verdict_cache:
+        intent_stats["cache"] += 1
+        _verdict_cache.move_to_end(key)
+        return _verdict_cache[key]
+
+    intent = detect_by_keyword(text)
+    tier = "keyword"
+    if intent is None and INTENT_LOCAL_CLASSIFIER:
+        intent = detect_by_local_classifier(text)
+        tier = "local"
+    if intent is None:
+        return None
+
+    intent_stats[tier] += 1
+    _remember(key, intent)
+    return intent
+
+
+async def detect_intent_with_llm(text, llm_fallback):
+    intent = await llm_fallback(text)
+    intent_stats["llm"] += 1
+    _remember(normalize(text), intent)
+    return intent
+
+
+async def detect_intent(text, llm_fallback):
+    """키워드 → 로컬 분류기 → LLM 순서로 의도를 판별하고, 메시지별 결과를 캐시한다.
+
+    llm_fallback은 메시지를 받아 "end_chat"/"continue_chat"을 돌려주는 코루틴 함수.
+    """
+    intent = detect_intent_locally(text)
+    if intent is None:
+        intent = await detect_intent_with_llm(text, llm_fallback)
+    return intent
@@ -0,0 +1,206 @@
+import asyncio
+import contextlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+from app.config import CHECKPOINTER_BACKEND, SQLITE_CHECKPOINT_PATH, RESUME_JOB_LEASE_SECONDS
+from app.metrics import start_trace, finish_trace
+
+
+class LocalJobClaims:
+    """세션을 한 프로세스만 보관할 때(메모리 저장소)의 작업 소유권. 다른 워커와 나눌 세션이 없으므로 항상 소유한다."""
+
+    async def aclaim(self, session_id):
+        return True
+
+    async def arelease(self, session_id):
+        pass
+
+    def close(self):
+        pass
+
+
+class SQLiteJobClaims:
+    """여러 워커가 같은 SQLite 파일을 공유할 때의 작업 소유권 (resume_job_claims 테이블).
+
+    /chat/status 폴링은 어느 워커로든 갈 수 있으므로, 세션의 소유권 행을 차지한 워커만 작업을 실행한다.
+    - 소유권은 lease초 동안 유효하며, 작업을 시작할 때 한 번 더 연장한다 (가장 긴 작업보다 길게 설정)
+    - 워커가 죽어 반납하지 못한 소유권은 lease가 지나면 다른 워커가 가져간다
+    """
+
+    def __init__(self, path, *, lease=RESUME_JOB_LEASE_SECONDS, busy_timeout_ms=5000):
+        self.path = path
+        self.lease = lease
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS resume_job_claims (
+                session_id TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+
+    def claim(self, session_id):
+        """소유권이 없거나 이미 이 워커의 것이거나 만료됐으면 차지(연장)하고 True."""
+        now = time.time()
+        with self._lock:
+            cursor = self.conn.execute("""
+                INSERT INTO resume_job_claims (session_id, owner, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(session_id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                WHERE resume_job_claims.owner = excluded.owner OR resume_job_claims.expires_at < ?
+            """, (session_id, self.owner, now + self.lease, now))
+        return cursor.rowcount > 0
+
+    def release(self, session_id):
+        with self._lock:
+            self.conn.execute(
+                "DELETE FROM resume_job_claims WHERE session_id = ? AND owner = ?", (session_id, self.owner)
+            )
+
+    async def aclaim(self, session_id):
+        return await asyncio.to_thread(self.claim, session_id)
+
+    async def arelease(self, session_id):
+        await asyncio.to_thread(self.release, session_id)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def create_job_claims(backend=CHECKPOINTER_BACKEND):
+    """세션 저장소와 같은 범위의 작업 소유권. SQLite면 워커들이 공유하는 같은 파일에 기록한다."""
+    if backend == "sqlite":
+        return SQLiteJobClaims(SQLITE_CHECKPOINT_PATH)
+    return LocalJobClaims()
+
+
+class ResumeJobQueue:
+    """지원서(지원 동기) 생성을 HTTP 요청과 분리해 처리하는 백그라운드 작업 큐.
+
+    워커 수와 대기열 크기가 정해져 있어 동시에 많은 지원자가 대화를 마쳐도 LLM 호출이 몰리지 않는다.
+    결과는 체크포인터의 세션 상태에 저장되므로, 작업 기록이 사라져도 상태를 다시 읽으면 된다.
+    여러 워커가 세션을 공유하면 claims(SQLiteJobClaims)로 세션마다 한 워커만 작업을 실행한다.
+    """
+
+    def __init__(self, workers=4, max_queue=1000, max_failed=1000, claims=None):
+        self.workers = workers
+        self.claims = claims or LocalJobClaims()
+        self.max_failed = max_failed
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.skipped = 0
+        self._jobs = {}
+        self._failures = OrderedDict()
+        self._latencies = deque(maxlen=1000)
+        self._tasks = []
+        self._langgraph_app = None
+
+    def start(self, langgraph_app):
+        self._langgraph_app = langgraph_app
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.claims.close()
+
+    async def submit(self, session_id):
+        """작업을 등록. 이미 대기/실행 중이거나 다른 워커가 맡고 있으면 그대로 두고, 대기열이 가득 차면 False."""
+        if session_id in self._jobs:
+            return True
+        if self.queue.full():
+            self.rejected += 1
+            return False
+        # 소유권을 확인하는 동안 같은 세션이 다시 등록되지 않도록 먼저 기록
+        self._jobs[session_id] = "queued"
+        try:
+            claimed = await self.claims.aclaim(session_id)
+        except Exception:
+            self._jobs.pop(session_id, None)
+            raise
+        if not claimed:
+            self._jobs.pop(session_id, None)
+            return True
+        try:
+            self.queue.put_nowait((session_id, time.perf_counter()))
+        except asyncio.QueueFull:
+            self._jobs.pop(session_id, None)
+            await self.claims.arelease(session_id)
+            self.rejected += 1
+            return False
+        self._failures.pop(session_id, None)
+        return True
+
+    def status(self, session_id):
+        if session_id in self._jobs:
+            return self._jobs[session_id]
+        if session_id in self._failures:
+            return "failed"
+        return None
+
+    def failure(self, session_id):
+        return self._failures.get(session_id)
+
+    async def _worker(self):
+        while True:
+            session_id, enqueued_at = await self.queue.get()
+            self._jobs[session_id] = "running"
+            trace = start_trace(session_id, "resume_job")
+            try:
+                if await self._run(session_id):
+                    self.completed += 1
+                    self._latencies.append((time.perf_counter() - enqueued_at) * 1000)
+                else:
+                    self.skipped += 1
+                finish_trace(trace)
+            except Exception as e:
+                finish_trace(trace, error=type(e).__name__)
+                print(f"[{session_id}] 지원서 생성 작업 실패: {e}")
+                self.failed += 1
+                self._failures[session_id] = str(e)
+                while len(self._failures) > self.max_failed:
+                    self._failures.popitem(last=False)
+            finally:
+                self._jobs.pop(session_id, None)
+                with contextlib.suppress(Exception):
+                    await self.claims.arelease(session_id)
+                self.queue.task_done()
+
+    async def _run(self, session_id):
+        """작업 하나를 실행. 기다리는 동안 다른 워커가 소유권을 가져갔거나 이미 끝낸 세션이면 실행하지 않고 False."""
+        if not await self.claims.aclaim(session_id):
+            return False
+        config = {"configurable": {"thread_id": session_id}}
+        state = (await self._langgraph_app.aget_state(config)).values
+        if state.get("next_question") != "generate_resume":
+            return False
+        await self._langgraph_app.ainvoke({}, config=config)
+        return True
+
+    def stats(self):
+        ordered = sorted(self._latencies)
+        return {
+            "queue_depth": self.queue.qsize(),
+            "running": sum(1 for status in self._jobs.values() if status == "running"),
+            "workers": self.workers,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "skipped": self.skipped,
+            "latency_p50_ms": round(ordered[len(ordered) // 2], 1) if ordered else None,
+            "latency_p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1) if ordered else None,
+        }
@@ -0,0 +1,63 @@
+import threading
+import time
+
+
+class LazyLLM:
+    """LLM 클라이언트와 구조화 출력 래퍼를 처음 사용할 때 한 번만 만든다.
+
+    클라이언트 라이브러리는 불러오는 데만 1초 이상 걸리므로, 서버는 이를 기다리지 않고 먼저 뜬 뒤
+    백그라운드에서 미리 만들어 둔다 (app.bot.nodes.warm_up). 만들다 실패하면 error에 남기고 다음 사용 때 다시 시도한다.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._llm = None
+        self._structured = {}
+        self.init_seconds = None
+        self.error = None
+
+    @property
+    def ready(self):
+        return self._llm is not None
+
+    def get(self):
+        if self._llm is None:
+            with self._lock:
+                if self._llm is None:
+                    started = time.perf_counter()
+                    try:
+                        llm = self._factory()
+                    except Exception as e:
+                        self.error = f"{type(e).__name__}: {e}"
+                        raise
+                    self.init_seconds = time.perf_counter() - started
+                    self.error = None
+                    self._llm = llm
+                    print(f"[LLM] 클라이언트 준비 완료 ({self.init_seconds:.2f}s)")
+        return self._llm
+
+    def structured(self, schema):
+        """schema 형식으로 응답하는 래퍼 (스키마별로 한 번만 만든다)."""
+        runnable = self._structured.get(schema)
+        if runnable is None:
+            runnable = self.get().with_structured_output(schema)
+            self._structured = {**self._structured, schema: runnable}
+        return runnable
+
+    def reset(self, factory=None):
+        """다음 사용 때 클라이언트를 다시 만든다. factory를 주면 그것으로 바꾼다 (벤치마크의 가짜 모델 등)."""
+        with self._lock:
+            if factory is not None:
+                self._factory = factory
+            self._llm = None
+            self._structured = {}
+            self.init_seconds = None
+            self.error = None
+
+    def stats(self):
+        return {
+            "ready": self.ready,
+            "init_seconds": round(self.init_seconds, 3) if self.init_seconds is not None else None,
+            "error": self.error,
+        }
@@ -0,0 +1,214 @@
+import asyncio
+import random
+import time
+
+import httpx
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables.config import ensure_config, merge_configs
+
+from app.metrics import track_llm_call, llm_retries, llm_hedges, llm_rejections
+
+
+class LLMUnavailableError(Exception):
+    """LLM 제공자가 응답하지 못할 때 (회로 차단 중, 재시도까지 모두 실패, 제한 시간 초과)."""
+
+
+def is_retryable(error):
+    """다시 보내면 성공할 수 있는 오류인지. 요청 자체가 잘못된 경우(4xx, 출력 파싱 실패 등)는 제외."""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    # langchain-core의 ModelError 계열은 재시도 가능 여부를 직접 알려준다
+    retryable = getattr(error, "is_retryable", None)
+    if retryable is not None:
+        return bool(retryable)
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    if isinstance(code, int):
+        return code in (408, 429) or code >= 500
+    return False
+
+
+class _TokenWatcher(BaseCallbackHandler):
+    """시도 중에 스트리밍 토큰이 나왔는지 기록한다 (이미 클라이언트로 나간 토큰은 되돌릴 수 없으므로 재시도하지 않는다)."""
+
+    run_inline = True
+
+    def __init__(self):
+        self.emitted = False
+
+    def on_llm_new_token(self, token, **kwargs):
+        if token:
+            self.emitted = True
+
+
+class CircuitBreaker:
+    """연속 실패가 failure_threshold번 쌓이면 reset_timeout초 동안 호출을 막는다(open).
+
+    시간이 지나면 시험 호출 하나만 통과시키고(half_open), 성공하면 다시 정상(closed)으로 돌아간다.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = None
+        self._probing = False
+
+    def allow(self):
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = "half_open"
+            self._probing = False
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self._probing = False
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.opened += 1
+                print(f"[LLM] 연속 실패 {self.failures}회, {self.reset_timeout:.0f}초 동안 LLM 호출을 중단합니다.")
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    def release(self):
+        """결과를 알 수 없이 끝난 호출(취소 등)이 시험 호출이었으면 다음 호출이 다시 시험할 수 있게 한다."""
+        self._probing = False
+
+
+class LLMGateway:
+    """모든 노드가 공유하는 LLM 호출 창구.
+
+    - 동시 호출 수 제한 (자리는 전체 제한 시간 안에서만 기다린다. 대기 시간 초과는 제공자 장애로 세지 않는다)
+    - 시도별 제한 시간(자리를 얻은 뒤부터)과 재시도를 포함한 전체 제한 시간
+    - 재시도 가능한 오류는 지터를 준 지수 백오프로 재시도 (스트리밍 토큰이 이미 나간 시도는 재시도하지 않는다)
+    - 회로 차단기: 제공자 장애 중에는 바로 LLMUnavailableError
+    - hedge=True인 호출은 hedge_delay 안에 응답이 없으면 같은 요청을 하나 더 보내 먼저 온 응답 사용
+    """
+
+    def __init__(self, *, max_concurrency=32, timeout=15.0, deadline=30.0, max_retries=2,
+                 backoff_base=0.5, backoff_max=4.0, breaker=None, hedge_delay=0.0):
+        self.max_concurrency = max_concurrency
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.hedge_delay = hedge_delay
+        self.unavailable = 0
+        self.queue_timeouts = 0
+
+    async def ainvoke(self, runnable, llm_input, name, *, hedge=False):
+        """name은 /metrics에서 호출을 구분하는 라벨. 모든 호출은 부작용이 없어 재시도해도 안전하다."""
+        with track_llm_call(name):
+            if not self.breaker.allow():
+                llm_rejections.inc(name)
+                self.unavailable += 1
+                raise LLMUnavailableError(f"LLM 호출 차단 중 ({name})")
+
+            deadline = time.monotonic() + self.deadline
+            attempt = 0
+            while True:
+                try:
+                    await self._acquire(deadline, name)
+                except BaseException:
+                    # 자리를 기다리다 제한 시간을 넘기거나 취소된 경우: 제공자 장애가 아니므로 회로 차단기에 기록하지 않는다
+                    self.breaker.release()
+                    raise
+                watcher = _TokenWatcher()
+                try:
+                    try:
+                        timeout = min(self.timeout, deadline - time.monotonic())
+                        if hedge and self.hedge_delay > 0:
+                            call = self._hedged(runnable, llm_input, name, watcher)
+                        else:
+                            call = self._call(runnable, llm_input, watcher)
+                        result = await asyncio.wait_for(call, timeout)
+                    finally:
+                        self.semaphore.release()
+                except asyncio.CancelledError:
+                    self.breaker.release()
+                    raise
+                except Exception as e:
+                    if not is_retryable(e):
+                        # 제공자는 응답했으므로 장애로 보지 않는다
+                        self.breaker.record_success()
+                        raise
+                    self.breaker.record_failure()
+                    attempt += 1
+                    backoff = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+                    if (watcher.emitted or attempt > self.max_retries or time.monotonic() + backoff >= deadline
+                            or not self.breaker.allow()):
+                        self.unavailable += 1
+                        raise LLMUnavailableError(f"LLM 호출 실패 ({name}): {type(e).__name__} {e}") from e
+                    llm_retries.inc(name)
+                    await asyncio.sleep(backoff)
+                    continue
+                self.breaker.record_success()
+                return result
+
+    async def _acquire(self, deadline, name):
+        """동시 호출 자리를 전체 제한 시간 안에서 기다린다. 못 얻으면 LLMUnavailableError."""
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), max(deadline - time.monotonic(), 0))
+        except asyncio.TimeoutError:
+            self.queue_timeouts += 1
+            self.unavailable += 1
+            raise LLMUnavailableError(f"LLM 호출 대기 시간 초과 ({name})") from None
+
+    @staticmethod
+    async def _call(runnable, llm_input, watcher):
+        # 그래프의 콜백(스트리밍 등)은 그대로 두고 토큰 감시용 콜백만 더한다
+        config = merge_configs(ensure_config(), {"callbacks": [watcher]})
+        return await runnable.ainvoke(llm_input, config)
+
+    async def _hedged(self, runnable, llm_input, name, watcher):
+        pending = {asyncio.create_task(self._call(runnable, llm_input, watcher))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.hedge_delay)
+            # 동시 호출 한도에 여유가 있을 때만 추가 요청 (장애 중에 부하를 두 배로 만들지 않도록)
+            if not done and not self.semaphore.locked():
+                llm_hedges.inc(name)
+                pending.add(asyncio.create_task(self._extra_call(runnable, llm_input, watcher)))
+            error = None
+            while done or pending:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _extra_call(self, runnable, llm_input, watcher):
+        """hedge 요청은 자리가 비어 있을 때만 보내므로 기다리지 않고 바로 자리를 얻는다."""
+        async with self.semaphore:
+            return await self._call(runnable, llm_input, watcher)
+
+    def stats(self):
+        return {
+            "breaker_state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "breaker_opened": self.breaker.opened,
+            "unavailable": self.unavailable,
+            "queue_timeouts": self.queue_timeouts,
+            "max_concurrency": self.max_concurrency,
+        }
@@ -1,20 +1,145 @@
-import json
-from langchain_google_genai import ChatGoogleGenerativeAI
+import asyncio
+import contextvars
+import time
+from collections import deque
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.output_parsers import StrOutputParser
-from app.config import GOOGLE_API_KEY, CLUB_NAME, CLUB_INTRO, CLUB_POSITIONS, CLUB_DATA
-from .state import ApplicationFormState, UserInfo, PositionInfo, QASessionIntent
+from app.config import (
+    GOOGLE_API_KEY,
+    LLM_MAX_CONCURRENCY,
+    LLM_TIMEOUT_SECONDS,
+    LLM_DEADLINE_SECONDS,
+    LLM_MAX_RETRIES,
+    LLM_RETRY_BACKOFF_SECONDS,
+    LLM_BREAKER_FAILURES,
+    LLM_BREAKER_RESET_SECONDS,
+    LLM_HEDGE_DELAY_SECONDS,
+    QA_SPECULATIVE,
+    ANSWER_CACHE_THRESHOLD,
+    ANSWER_CACHE_MAX_SIZE,
+    ANSWER_CACHE_TTL_SECONDS,
+    QA_LOG_MAX,
+)
+from app.club import club_config
+from .state import ApplicationFormState, UserInfo, PositionInfo, QASessionIntent, fold_qa_summary
+from .intent import detect_intent_locally, detect_intent_with_llm, CONTINUE_CHAT, END_CHAT
+from .prompts import PromptRegistry, QA_ANSWER_TAG, QA_SPECULATIVE_TAG
+from .answer_cache import TenantAnswerCaches
+from .llm_gateway import LLMGateway, CircuitBreaker, LLMUnavailableError
+from .llm_client import LazyLLM
+from .extraction import (
+    USER_INFO_FIELDS,
+    extract_user_info,
+    merge_user_info,
+    record_user_info_sources,
+    extract_positions,
+    extraction_stats,
+)
 from langgraph.graph import END
 
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash-lite", temperature=0, api_key=GOOGLE_API_KEY)
 
-intro_extractor = llm.with_structured_output(UserInfo)
-position_extractor = llm.with_structured_output(PositionInfo)
-intent_classifier_llm = llm.with_structured_output(QASessionIntent)
+def create_llm():
+    # langchain_google_genai는 불러오는 데 1초 이상 걸려 서버 시작을 늦추므로 클라이언트를 만들 때 불러온다
+    from langchain_google_genai import ChatGoogleGenerativeAI
 
+    if not GOOGLE_API_KEY:
+        raise RuntimeError("GOOGLE_API_KEY가 설정되지 않았습니다.")
+    # 재시도는 llm_gateway에서 한다 (Google SDK는 max_retries=1이 '재시도 안 함', 0은 SDK 기본값 사용)
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.0-flash-lite",
+        temperature=0,
+        api_key=GOOGLE_API_KEY,
+        timeout=LLM_TIMEOUT_SECONDS,
+        max_retries=1,
+    )
 
-def start_node(state: ApplicationFormState):
+
+# 클라이언트와 구조화 출력 래퍼는 처음 사용할 때(보통은 서버 시작 후 warm_up에서) 만든다
+llm = LazyLLM(create_llm)
+STRUCTURED_SCHEMAS = (UserInfo, PositionInfo, QASessionIntent)
+
+prompt_registry = PromptRegistry(llm)
+answer_cache = TenantAnswerCaches(
+    threshold=ANSWER_CACHE_THRESHOLD, max_size=ANSWER_CACHE_MAX_SIZE, ttl=ANSWER_CACHE_TTL_SECONDS,
+)
+
+# 동아리 정보가 갱신되거나 새 테넌트를 불러오면 교체 전에 프롬프트 체인과 답변 캐시를 미리 준비
+club_config.subscribe(prompt_registry.warm)
+club_config.subscribe(answer_cache.sync)
+
+# 모든 노드가 공유하는 LLM 호출 창구 (동시 호출 수 제한, 제한 시간, 재시도, 회로 차단)
+llm_gateway = LLMGateway(
+    max_concurrency=LLM_MAX_CONCURRENCY,
+    timeout=LLM_TIMEOUT_SECONDS,
+    deadline=LLM_DEADLINE_SECONDS,
+    max_retries=LLM_MAX_RETRIES,
+    backoff_base=LLM_RETRY_BACKOFF_SECONDS,
+    breaker=CircuitBreaker(LLM_BREAKER_FAILURES, LLM_BREAKER_RESET_SECONDS),
+    hedge_delay=LLM_HEDGE_DELAY_SECONDS,
+)
+
+
+def _prepare_llm():
+    for schema in STRUCTURED_SCHEMAS:
+        llm.structured(schema)
+    prompt_registry.resume_chain
+    if club_config.loaded:
+        prompt_registry.warm(club_config.current())
+
+
+async def warm_up():
+    """LLM 클라이언트, 구조화 출력 래퍼, 현재 동아리 정보의 프롬프트 체인을 스레드에서 미리 만든다.
+
+    서버 시작 후 백그라운드에서 실행하며, 끝나야 /readyz가 준비 완료로 바뀐다.
+    """
+    await asyncio.to_thread(_prepare_llm)
+
+
+LLM_UNAVAILABLE_REPLY = "앗, 지금 답변을 준비하는 데 문제가 생겼어. 잠시 후에 다시 물어봐 줄래?"
+
+# Q&A 턴 소요 시간(ms) 기록. local: 의도를 로컬에서 판별, sequential: 분류 후 답변, speculative: 분류와 답변 동시 실행
+qa_turn_timings = {mode: deque(maxlen=1000) for mode in ("local", "sequential", "speculative")}
+qa_wasted_answers = 0
+
+
+class SpeculativeAnswerGate:
+    """스트리밍 턴에서 추측 실행한 답변 토큰을 의도가 확인될 때까지 붙잡아 두는 곳.
+
+    엔드포인트가 턴마다 만들어 qa_stream_gate에 넣고, qa_session_node가 의도를 확인하면 confirmed를 정한다.
+    """
+
+    def __init__(self):
+        self.confirmed = None
+        self.pending = []
+
+    def release(self):
+        """의도가 continue_chat으로 확인됐으면 모아 둔 토큰을 돌려주고, 아니면 빈 목록."""
+        if not self.confirmed:
+            return []
+        pending, self.pending = self.pending, []
+        return pending
+
+
+qa_stream_gate = contextvars.ContextVar("qa_stream_gate", default=None)
+
+
+async def ainvoke_llm(runnable, llm_input, name, hedge=False):
+    """name은 /metrics에서 호출을 구분하는 라벨 (intent_classifier, qa_answer 등).
+
+    LLM을 사용할 수 없으면 LLMUnavailableError.
+    """
+    return await llm_gateway.ainvoke(runnable, llm_input, name, hedge=hedge)
+
+
+async def classify_intent_with_llm(user_message):
+    classification: QASessionIntent = await ainvoke_llm(
+        llm.structured(QASessionIntent),
+        f"사용자 메시지: '{user_message}'\n\n이 사용자의 의도를 분류하세요. ('종료', '그만', '됐어', '지원서 생성')는 'end_chat', 그 외는 'continue_chat'입니다.",
+        "intent_classifier",
+        hedge=True)
+    return classification.intent
+
+
+async def start_node(state: ApplicationFormState):
     first_question = """좋았어! 이제 네 얘기도 좀 들려주라. 간단하게 자기소개 한번 해줄 수 있어?"""
     return {
         "messages": [AIMessage(content=f"{first_question}")],
@@ -22,7 +147,7 @@ def start_node(state: ApplicationFormState):
     }
 
 
-def process_introduction(state: ApplicationFormState):
+async def process_introduction(state: ApplicationFormState):
     user_message = state["messages"][-1].content
     user_message_lower = user_message.lower()
 
@@ -37,8 +162,18 @@ def process_introduction(state: ApplicationFormState):
             "next_question": "position"
         }
 
-    prompt = SystemMessage(content="사용자의 최신 응답에서 이름, 학과, 나이, 전화번호를 추출해. 만약 특정 정보가 언급되지 않았다면, 그 값은 반드시 None으로 남겨둬. 나이는 반드시 숫자로만 나타내")
-    extracted_data: UserInfo = intro_extractor.invoke([prompt] + state["messages"])
+    # 정규식으로 찾을 수 있는 필드는 로컬에서 채우고, 못 찾은 필드가 있고 더 읽을 내용이 남았을 때만 LLM 호출
+    local_data, residual_text = extract_user_info(user_message)
+    extracted_data = local_data
+    if residual_text and any(getattr(local_data, field) is None for field in USER_INFO_FIELDS):
+        prompt = SystemMessage(content="사용자의 최신 응답에서 이름, 학과, 나이, 전화번호를 추출해. 만약 특정 정보가 언급되지 않았다면, 그 값은 반드시 None으로 남겨둬. 나이는 반드시 숫자로만 나타내")
+        try:
+            llm_data: UserInfo = await ainvoke_llm(llm.structured(UserInfo), [prompt, HumanMessage(content=user_message)], "intro_extractor")
+            extracted_data = merge_user_info(local_data, llm_data)
+        except LLMUnavailableError as e:
+            # LLM 장애 중에는 정규식으로 찾은 값만으로 진행
+            print(f"[LLM] 자기소개 추출을 로컬 결과로 대체: {e}")
+    record_user_info_sources(local_data, extracted_data)
     if extracted_data.name:
         next_question = f"{extracted_data.name[-2:]}!, 그렇구나 너는 어떤 포지션에 관심 있니?"
     else:
@@ -53,7 +188,7 @@ def process_introduction(state: ApplicationFormState):
     }
 
 
-def process_position(state: ApplicationFormState):
+async def process_position(state: ApplicationFormState):
     user_message = state["messages"][-1].content
     user_message_lower = user_message.lower()
 
@@ -66,22 +201,29 @@ def process_position(state: ApplicationFormState):
             "next_question": "process_initial_motivation"
         }
 
-    prompt = SystemMessage(content=f"사용자의 최신 응답에서 관심있는 포지션 목록을 추출해. 선택지는 {CLUB_POSITIONS}이야.")
+    club_positions = club_config.current(state.get("tenant_id")).positions
     try:
-        extracted_data: PositionInfo = position_extractor.invoke([prompt] + state["messages"])
-        if not extracted_data.positions: raise ValueError("포지션이 선택되지 않음")
+        positions = extract_positions(user_message, club_positions)
+        if positions:
+            extraction_stats["positions"]["local"] += 1
+        else:
+            prompt = SystemMessage(content=f"사용자의 최신 응답에서 관심있는 포지션 목록을 추출해. 선택지는 {club_positions}이야.")
+            extracted_data: PositionInfo = await ainvoke_llm(llm.structured(PositionInfo), [prompt, HumanMessage(content=user_message)], "position_extractor")
+            positions = extracted_data.positions
+            extraction_stats["positions"]["llm" if positions else "missing"] += 1
+        if not positions: raise ValueError("포지션이 선택되지 않음")
         next_question_text = "좋아! 이제 동아리에 지원하게 된 동기를 편하게 말해줄래?"
         return {
             "messages": [AIMessage(content=next_question_text)],
-            "positions": extracted_data.positions,
+            "positions": positions,
             "next_question": "process_initial_motivation"
         }
     except Exception as e:
-        retry_message = f"포지션을 제대로 이해하지 못어, {CLUB_POSITIONS} 중에서 관심있는 포지션을 다시 말해줘!"
+        retry_message = f"포지션을 제대로 이해하지 못어, {club_positions} 중에서 관심있는 포지션을 다시 말해줘!"
         return {"messages": [AIMessage(content=retry_message)], "next_question": "position"}
 
 
-def process_initial_motivation_node(state: ApplicationFormState):
+async def process_initial_motivation_node(state: ApplicationFormState):
     user_message = state["messages"][-1].content
     user_message_lower = user_message.lower()
 
@@ -102,41 +244,105 @@ def process_initial_motivation_node(state: ApplicationFormState):
     }
 
 
-def qa_session_node(state: ApplicationFormState):
+async def qa_session_node(state: ApplicationFormState):
+    global qa_wasted_answers
+    started = time.perf_counter()
+    # 처리 도중 동아리 정보가 갱신되어도 이 턴은 시작할 때의 스냅샷을 사용
+    club = club_config.current(state.get("tenant_id"))
+    tenant_answer_cache = answer_cache.get(club.tenant_id)
     user_message = state["messages"][-1].content
-    classification: QASessionIntent = intent_classifier_llm.invoke(
-        f"사용자 메시지: '{user_message}'\n\n이 사용자의 의도를 분류하세요. ('종료', '그만', '됐어', '지원서 생성')는 'end_chat', 그 외는 'continue_chat'입니다.")
-
-    if classification.intent == "end_chat":
-        print("대화 종료 감지됨 (qa_session_node)")
-        return {"next_question": "generate_resume"}
-
-    qa_prompt = ChatPromptTemplate.from_messages([
-        ("system", f"""
-            당신은 [{CLUB_NAME}]의 홍보 담당 챗봇입니다.
-            사용자의 질문에 친근하고 정확하게 답변하세요.
-            아래 [동아리 정보]를 바탕으로 답변해야 합니다.
-            [동아리 정보]
-            {CLUB_DATA}
-            {CLUB_INTRO}
-            {CLUB_POSITIONS}
-            ---
-            사용자가 "종료" 신호를 보내기 전까지 대화를 계속 이어가세요.
-            Markdown 헤더(##), 제목, 이모티콘, 또는 기타 서식을 절대 포함하지 마세요.
-            """),
-        MessagesPlaceholder(variable_name="history")
-    ])
-    qa_chain = qa_prompt | llm | StrOutputParser()
-    response = qa_chain.invoke({"history": state["messages"][-10:]})
-    return {
+    intent = detect_intent_locally(user_message)
+
+    cached_answer = None
+    if intent != END_CHAT:
+        cached_answer = tenant_answer_cache.lookup(user_message, club.version)
+        # 메시지 대부분이 FAQ 질문과 겹쳐야 적중하므로, 적중한 메시지는 종료 요청이 아닌 질문으로 본다 (분류 LLM 호출 생략)
+        if cached_answer is not None and intent is None:
+            intent = CONTINUE_CHAT
+
+    if intent is not None:
+        mode = "local"
+    elif QA_SPECULATIVE:
+        mode = "speculative"
+    else:
+        mode = "sequential"
+
+    qa_chain = prompt_registry.qa_chain(club)
+    qa_input = prompt_registry.qa_input(state["messages"], club)
+
+    response = cached_answer
+    try:
+        if mode == "speculative":
+            # 분류 결과를 기다리지 않고 답변 생성을 같이 시작, 종료 의도면 답변은 취소하고 버린다
+            # with_config는 태그를 덮어쓰므로 답변 태그도 같이 붙인다
+            speculative_chain = qa_chain.with_config(tags=[QA_ANSWER_TAG, QA_SPECULATIVE_TAG])
+            answer_task = asyncio.create_task(ainvoke_llm(speculative_chain, qa_input, "qa_answer"))
+            try:
+                intent = await detect_intent_with_llm(user_message, classify_intent_with_llm)
+            except BaseException:
+                answer_task.cancel()
+                raise
+            gate = qa_stream_gate.get()
+            if gate is not None:
+                gate.confirmed = intent != END_CHAT
+            if intent == END_CHAT:
+                answer_task.cancel()
+                qa_wasted_answers += 1
+            else:
+                response = await answer_task
+        elif mode == "sequential":
+            intent = await detect_intent_with_llm(user_message, classify_intent_with_llm)
+
+        if intent == END_CHAT:
+            print("대화 종료 감지됨 (qa_session_node)")
+            qa_turn_timings[mode].append((time.perf_counter() - started) * 1000)
+            return {"next_question": "generate_resume"}
+
+        if response is None:
+            answer_started = time.perf_counter()
+            response = await ainvoke_llm(qa_chain, qa_input, "qa_answer")
+            tenant_answer_cache.record_llm_ms((time.perf_counter() - answer_started) * 1000)
+        if cached_answer is None:
+            # 질문만 FAQ 항목의 다른 표현으로 기억한다 (LLM 답변은 저장하지 않음)
+            tenant_answer_cache.learn(user_message, response, club.version)
+    except LLMUnavailableError as e:
+        # 질문 기록에는 남기지 않고 안내 메시지로 응답, 사용자가 다시 물어보면 그때 답한다
+        print(f"[LLM] Q&A 답변을 안내 메시지로 대체: {e}")
+        return {
+            "messages": [AIMessage(content=LLM_UNAVAILABLE_REPLY)],
+            "next_question": "qa_session"
+        }
+    qa_turn_timings[mode].append((time.perf_counter() - started) * 1000)
+    update = {
         "messages": [AIMessage(content=response)],
+        "qa_questions": [user_message],
         "next_question": "qa_session"
     }
+    # 이번 질문으로 QA 기록에서 밀려나는 질문은 지원 동기에서 빠지지 않도록 요약에 합친다
+    questions = state.get("qa_questions") or []
+    overflow = len(questions) + 1 - QA_LOG_MAX
+    if overflow > 0:
+        update["qa_summary"] = fold_qa_summary(state.get("qa_summary"), questions[:overflow])
+    return update
+
+
+def qa_timing_stats():
+    stats = {"wasted_answers": qa_wasted_answers}
+    for mode, timings in qa_turn_timings.items():
+        ordered = sorted(timings)
+        stats[mode] = {
+            "count": len(ordered),
+            "p50_ms": round(ordered[len(ordered) // 2], 1) if ordered else None,
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1) if ordered else None,
+        }
+    return stats
 
 
-def generate_resume_node(state: ApplicationFormState):
-    print("챗봇: 프로필을 생성하고 있습니다...")
+async def generate_motivation(state: ApplicationFormState):
+    """세션 상태로 '지원 동기 및 포부' 문단을 생성. 입력이 부족하면 None.
 
+    generate_resume_node와 일괄 재생성(app.batch)이 같은 로직을 사용한다.
+    """
     info = {
         "name": state.get("name") or "정보 없음",
         "department": state.get("department") or "정보 없음",
@@ -146,23 +352,11 @@ def generate_resume_node(state: ApplicationFormState):
     }
     initial_motivation = state.get("initial_motivation")
 
-    messages = state["messages"]
-    qa_conversation = ""
-    start_index = -1
-    for i, msg in enumerate(messages):
-        if "이야기해줘서" in msg.content and isinstance(msg, AIMessage):
-            start_index = i + 1
-            break
-    if start_index != -1:
-        qa_texts = [f"- {msg.content}" for msg in messages[start_index:] if isinstance(msg, HumanMessage)]
-        if qa_texts:
-            last_message = qa_texts[-1].replace("- ", "")
-            check_intent: QASessionIntent = intent_classifier_llm.invoke(f"'{last_message}'의 의도를 분류해줘.")
-            if check_intent.intent == "end_chat":
-                qa_texts.pop()
-        qa_conversation = "\n".join(qa_texts)
-    if not qa_conversation:
-        qa_conversation = "추가 질문 없음"
+    # qa_session_node가 종료 메시지를 제외한 질문만 기록해 두므로 메시지를 다시 훑을 필요가 없다
+    qa_texts = [f"- {question}" for question in state.get("qa_questions") or []]
+    if qa_summary := state.get("qa_summary"):
+        qa_texts.insert(0, f"- (앞선 질문) {qa_summary}")
+    qa_conversation = "\n".join(qa_texts) or "추가 질문 없음"
 
     total_input_length = 0
 
@@ -189,40 +383,26 @@ def generate_resume_node(state: ApplicationFormState):
         else:
             dynamic_output_rule = "- 300자 내외로 풍부하게 작성하세요."
 
-        # 2-2. 프롬프트 정의
-        resume_prompt = f"""
-                            # 지시사항
-                            당신은 지원자 본인 입니다. 아래 [지원자 정보]와 [대화 내역]을 바탕으로, 오직 '지원 동기 및 포부'에 대한 문단(paragraph)만 작성해 주세요.
-                            [대화 내역]에 흩어져 있는 지원자의 생각과 질문들을 하나의 통일된 '지원 동기' 스토리로 엮어내는 것이 핵심입니다.
-
-                            # [지원자 정보]
-                            이름: {info['name']}
-                            소속: {info['department']} ({info['age']})
-                            연락처: {info['phone_number']}
-                            희망 포지션: {info['positions']}
-
-                            # [초기 지원 동기]
-                            {initial_motivation}
-
-                            # [추가 Q&A 내역]
-                            {qa_conversation}
-
-                            # 출력 규칙
-                            {dynamic_output_rule}
-                            - 이름, 학과 등 개인정보를 반복하지 마세요.
-                            - Markdown 헤더(##), 제목, 또는 기타 서식을 절대 포함하지 마세요.
-                            - 오직 '지원 동기 및 포부' 문단 자체만 응답하세요.
-                            """
-
-        # 2-3. LLM 호출 및 파싱
-        generated_resume = llm.invoke(resume_prompt).content
+        # 2-2. LLM 호출 및 파싱 (지시사항은 고정된 시스템 프롬프트, 지원자별 내용만 변수로 전달)
+        generated_resume = await ainvoke_llm(prompt_registry.resume_chain, {
+            **info,
+            "initial_motivation": initial_motivation,
+            "qa_conversation": qa_conversation,
+            "output_rule": dynamic_output_rule
+        }, "resume")
         parts = generated_resume.split("\n\n", 1)
         if len(parts) > 1:
             motivation_text = parts[1].strip()
         else:
             motivation_text = parts[0].strip()
 
-    resume_summary_text = motivation_text
+    return motivation_text
+
+
+async def generate_resume_node(state: ApplicationFormState):
+    print("챗봇: 프로필을 생성하고 있습니다...")
+
+    resume_summary_text = await generate_motivation(state)
     print(resume_summary_text)
     final_message = f"대화가 종료되었습니다."
 
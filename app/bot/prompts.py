@@ -0,0 +1,158 @@
+from collections import OrderedDict
+
+from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.output_parsers import StrOutputParser
+
+from app.config import RETRIEVAL_TOP_K
+from .retrieval import ClubInfoIndex, chunk_club_info, render_chunks
+
+# 스트리밍 엔드포인트에서 Q&A 답변 토큰만 골라내기 위한 태그
+QA_ANSWER_TAG = "qa_answer"
+# 의도 분류와 동시에 추측 실행한 답변에 더 붙이는 태그 (종료 의도면 버려지므로 확인 전에는 보내지 않는다)
+QA_SPECULATIVE_TAG = "qa_speculative"
+
+RESUME_SYSTEM_PROMPT = """# 지시사항
+당신은 지원자 본인 입니다. 아래 [지원자 정보]와 [대화 내역]을 바탕으로, 오직 '지원 동기 및 포부'에 대한 문단(paragraph)만 작성해 주세요.
+[대화 내역]에 흩어져 있는 지원자의 생각과 질문들을 하나의 통일된 '지원 동기' 스토리로 엮어내는 것이 핵심입니다.
+
+# 출력 규칙
+- [분량]에 적힌 분량을 지키세요.
+- 이름, 학과 등 개인정보를 반복하지 마세요.
+- Markdown 헤더(##), 제목, 또는 기타 서식을 절대 포함하지 마세요.
+- 오직 '지원 동기 및 포부' 문단 자체만 응답하세요."""
+
+RESUME_HUMAN_TEMPLATE = """# [지원자 정보]
+이름: {name}
+소속: {department} ({age})
+연락처: {phone_number}
+희망 포지션: {positions}
+
+# [초기 지원 동기]
+{initial_motivation}
+
+# [추가 Q&A 내역]
+{qa_conversation}
+
+# [분량]
+{output_rule}"""
+
+
+QA_CONTEXT_TEMPLATE = """[관련 동아리 정보]
+{context}"""
+
+
+def render_qa_system_prefix(club_name, club_positions, club_data, club_intro="", retrieval=False):
+    """Q&A 턴마다 동일한 바이트로 전송되는 시스템 프롬프트.
+
+    대화 내역은 이 뒤에 붙으므로, 제공자 측 프롬프트/컨텍스트 캐시가 이 접두부를 재사용할 수 있다.
+    검색을 사용하면 club_data에는 항상 넣는 항목(소개, 모집 대상/방법, 문의)만 오고,
+    활동/FAQ처럼 항목이 많은 리스트는 질문마다 고른 것만 접두부 바로 뒤에 붙는다.
+    """
+    club_info_section = f"""[동아리 정보]
+{club_data}"""
+    if club_intro:
+        club_info_section += f"\n{club_intro}"
+    if retrieval:
+        club_info_section += "\n활동, FAQ 등은 질문과 관련된 항목만 [관련 동아리 정보]로 함께 제공됩니다."
+    return f"""당신은 [{club_name}]의 홍보 담당 챗봇입니다.
+사용자의 질문에 친근하고 정확하게 답변하세요.
+아래 동아리 정보를 바탕으로 답변해야 합니다.
+{club_info_section}
+모집 포지션: {club_positions}
+---
+사용자가 "종료" 신호를 보내기 전까지 대화를 계속 이어가세요.
+Markdown 헤더(##), 제목, 이모티콘, 또는 기타 서식을 절대 포함하지 마세요."""
+
+
+class PromptRegistry:
+    """동아리 정보 버전별로 미리 만들어 둔 프롬프트 체인 보관소.
+
+    파일이 갱신되는 동안 이전 스냅샷으로 처리 중인 요청이 있을 수 있으므로 테넌트마다 최근 max_versions개 버전을 유지한다.
+    llm은 LazyLLM이며, 체인은 처음 필요할 때 만든다. 모든 테넌트의 체인이 같은 LLM 클라이언트를 쓴다.
+    """
+
+    def __init__(self, llm, retrieval_top_k=RETRIEVAL_TOP_K, max_versions=2):
+        self.llm = llm
+        self.retrieval_top_k = retrieval_top_k
+        self.max_versions = max_versions
+        # tenant_id -> OrderedDict(version -> (체인, 검색 인덱스))
+        self._qa_entries = {}
+        self._resume_chain = None
+
+    @property
+    def resume_chain(self):
+        if self._resume_chain is None:
+            self._resume_chain = (
+                ChatPromptTemplate.from_messages([
+                    SystemMessage(content=RESUME_SYSTEM_PROMPT),
+                    ("human", RESUME_HUMAN_TEMPLATE)
+                ])
+                | self.llm.get()
+                | StrOutputParser()
+            )
+        return self._resume_chain
+
+    def reset(self):
+        """LLM 클라이언트를 바꾼 뒤 (LazyLLM.reset) 체인을 다시 만들게 한다."""
+        self._qa_entries = {}
+        self._resume_chain = None
+
+    def warm(self, club):
+        # 클라이언트가 아직 없으면 시작 시 준비 단계(warm_up)에서 만든다
+        if self.llm.ready:
+            self._qa_entry(club)
+
+    def qa_chain(self, club):
+        return self._qa_entry(club)[0]
+
+    def qa_input(self, messages, club):
+        """Q&A 체인 입력. 검색을 사용하면 최근 사용자 메시지로 관련 청크를 골라 넣는다."""
+        qa_input = {"history": messages[-10:]}
+        index = self._qa_entry(club)[1]
+        if index is not None:
+            recent_questions = [msg.content for msg in messages[-4:] if isinstance(msg, HumanMessage)]
+            qa_input["context"] = index.render_context(" ".join(recent_questions[-2:]), self.retrieval_top_k)
+        return qa_input
+
+    def _qa_entry(self, club):
+        entry = self._qa_entries.get(club.tenant_id, {}).get(club.version)
+        if entry is None:
+            entry = self._build_qa_entry(club)
+        return entry
+
+    def _build_qa_entry(self, club):
+        # 중괄호가 템플릿 변수로 해석되지 않도록 고정 접두부는 SystemMessage 그대로 넣는다
+        if self.retrieval_top_k > 0:
+            # 항상 넣는 항목은 접두부에 두어 캐시되게 하고, 검색한 리스트 항목만 턴마다 바뀐다
+            pinned, searchable = chunk_club_info(club.info)
+            index = ClubInfoIndex(searchable)
+            qa_prompt = ChatPromptTemplate.from_messages([
+                SystemMessage(content=render_qa_system_prefix(
+                    club.name, club.positions, render_chunks(pinned), retrieval=True
+                )),
+                ("system", QA_CONTEXT_TEMPLATE),
+                MessagesPlaceholder(variable_name="history")
+            ])
+        else:
+            index = None
+            qa_prompt = ChatPromptTemplate.from_messages([
+                SystemMessage(content=render_qa_system_prefix(club.name, club.positions, club.data, club.intro)),
+                MessagesPlaceholder(variable_name="history")
+            ])
+        chain = (qa_prompt | self.llm.get() | StrOutputParser()).with_config(tags=[QA_ANSWER_TAG])
+        entry = (chain, index)
+
+        # 다른 스레드에서 읽는 중일 수 있으므로 새 딕셔너리를 만들어 통째로 교체
+        versions = OrderedDict(self._qa_entries.get(club.tenant_id, ()))
+        versions[club.version] = entry
+        while len(versions) > self.max_versions:
+            versions.popitem(last=False)
+        self._qa_entries = {**self._qa_entries, club.tenant_id: versions}
+        return entry
+
+    def stats(self):
+        return {
+            "tenants": len(self._qa_entries),
+            "qa_chains": sum(len(versions) for versions in self._qa_entries.values()),
+        }
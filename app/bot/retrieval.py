@@ -0,0 +1,86 @@
+import math
+from collections import Counter
+
+from app.club import render_item
+from .intent import normalize
+
+_SECTION_TITLES = {
+    "introduction": "동아리 소개",
+    "activities": "주요 활동",
+    "targetAudience": "모집 대상",
+    "recruitment": "모집 기간 및 방법",
+    "faq": "자주 묻는 질문(FAQ)",
+    "contact": "문의",
+}
+
+
+def chunk_club_info(club_info):
+    """동아리 정보 JSON을 (항상 넣을 청크 목록, 검색할 청크 목록)으로 나눈다. 청크는 (제목, 본문).
+
+    소개, 모집 대상/방법, 문의처럼 한 덩어리인 항목은 어떤 질문에든 필요할 수 있어 항상 넣는다.
+    리스트 항목(활동, FAQ, 기수별 프로젝트 등)은 항목마다 하나의 청크가 되어 질문에 따라 고른다.
+    """
+    pinned, searchable = [], []
+    for key, value in club_info.items():
+        if key == "clubName":
+            continue
+        title = _SECTION_TITLES.get(key, key)
+        if isinstance(value, list):
+            for item in value:
+                searchable.append((title, render_item(item)))
+        else:
+            pinned.append((title, render_item(value)))
+    return pinned, searchable
+
+
+def render_chunks(chunks):
+    return "\n".join(f"- {title}: {text}" for title, text in chunks)
+
+
+def _tokens(text):
+    # 한국어는 띄어쓰기만으로 나누기 어려우므로 문자 bigram을 검색 단위로 사용
+    normalized = normalize(text)
+    if len(normalized) < 2:
+        return [normalized] if normalized else []
+    return [normalized[i:i + 2] for i in range(len(normalized) - 1)]
+
+
+class ClubInfoIndex:
+    """청크에 대한 BM25 인덱스 (프로세스 내부, 네트워크 없음)."""
+
+    def __init__(self, chunks, k1=1.5, b=0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self._term_freqs = [Counter(_tokens(f"{title} {text}")) for title, text in chunks]
+        self._lengths = [sum(freqs.values()) for freqs in self._term_freqs]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        doc_freqs = Counter()
+        for freqs in self._term_freqs:
+            doc_freqs.update(freqs.keys())
+        total = len(chunks)
+        self._idf = {
+            term: math.log(1 + (total - freq + 0.5) / (freq + 0.5))
+            for term, freq in doc_freqs.items()
+        }
+
+    def search(self, query, k):
+        query_terms = Counter(_tokens(query))
+        scores = []
+        for i, freqs in enumerate(self._term_freqs):
+            score = 0.0
+            length_norm = self.k1 * (1 - self.b + self.b * self._lengths[i] / (self._avg_length or 1.0))
+            for term in query_terms:
+                tf = freqs.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (self.k1 + 1) / (tf + length_norm)
+            scores.append((score, i))
+        ranked = [i for score, i in sorted(scores, key=lambda pair: (-pair[0], pair[1])) if score > 0][:k]
+        return ranked
+
+    def render_context(self, query, k):
+        """질문에 가장 관련된 상위 k개 청크를 문서 순서대로 이어 붙인다."""
+        selected = set(self.search(query, k))
+        if not selected:
+            return "질문과 관련된 항목 없음"
+        return render_chunks(chunk for i, chunk in enumerate(self.chunks) if i in selected)
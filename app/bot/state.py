@@ -1,9 +1,38 @@
 from typing import List, TypedDict, Annotated, Literal, Optional
-import operator
 from pydantic import BaseModel, Field
 from langchain_core.messages import BaseMessage
+from app.config import MESSAGE_WINDOW, QA_LOG_MAX, QA_SUMMARY_MAX_CHARS
 
 
+def add_messages_window(left: List[BaseMessage], right: List[BaseMessage]) -> List[BaseMessage]:
+    # 프롬프트에 필요한 최근 메시지만 남겨, 대화가 길어져도 체크포인트 크기가 일정하게 유지되도록 한다
+    return (left + right)[-MESSAGE_WINDOW:]
+
+
+def append_qa_log(left: List[str], right: List[str]) -> List[str]:
+    # 지원 동기 생성에 쓰는 Q&A 질문 기록 (최근 QA_LOG_MAX개, 밀려나는 질문은 qa_summary에 합친다)
+    return (left + right)[-QA_LOG_MAX:]
+
+
+def fold_qa_summary(summary: Optional[str], dropped: List[str]) -> Optional[str]:
+    """QA 기록에서 밀려나는 질문을 앞선 질문 요약(qa_summary)에 이어 붙인다.
+
+    같은 질문은 한 번만 넣고, QA_SUMMARY_MAX_CHARS를 넘는 질문은 버리고 "외 다수"로 표시한다.
+    """
+    summary = summary or ""
+    if summary.endswith("다수"):
+        return summary
+    for question in dropped:
+        question = " ".join(question.split())
+        if not question or question in summary.split(" / "):
+            continue
+        candidate = f"{summary} / {question}" if summary else question
+        if len(candidate) > QA_SUMMARY_MAX_CHARS:
+            summary = f"{summary} 외 다수" if summary else "앞선 질문 다수"
+            break
+        summary = candidate
+    return summary or None
+
 
 class UserInfo(BaseModel):
     name: Optional[str] = Field(default=None, description="사용자의 이름")
@@ -23,6 +52,8 @@ class QASessionIntent(BaseModel):
 
 
 class ApplicationFormState(TypedDict):
+    # 어느 동아리(테넌트)의 정보로 대화하는지 (/chat/start에서 정함, 이전 세션은 없으므로 기본 테넌트)
+    tenant_id: Optional[str]
     name: Optional[str]
     department: Optional[str]
     age: Optional[str]
@@ -31,7 +62,10 @@ class ApplicationFormState(TypedDict):
     motivation: Optional[str]
     initial_motivation: Optional[str]
 
-    messages: Annotated[List[BaseMessage], operator.add]
+    messages: Annotated[List[BaseMessage], add_messages_window]
+    qa_questions: Annotated[List[str], append_qa_log]
+    # QA 기록(최근 QA_LOG_MAX개)에서 밀려난 앞선 질문들
+    qa_summary: Optional[str]
 
     next_question: Literal[
         "intro", "position",
@@ -0,0 +1,322 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+from app.config import CLUB_INFO_PATH, CLUB_INFO_POLL_SECONDS, CLUB_INFO_DIR, DEFAULT_TENANT_ID
+
+DEFAULT_CLUB_POSITIONS = "PLANNING, DESIGN, FRONTEND, BACKEND, AI"
+
+# 테넌트 id는 CLUB_INFO_DIR 안의 파일 이름으로 쓰이므로 경로 문자를 허용하지 않는다
+TENANT_ID_PATTERN = r"^[A-Za-z0-9_-]{1,64}$"
+
+
+@dataclass(frozen=True)
+class ClubContext:
+    """한 시점의 동아리 정보 스냅샷. 한 번 만들어지면 바뀌지 않는다."""
+    version: str
+    info: Mapping
+    name: str
+    intro: str
+    positions: str
+    data: str
+    tenant_id: str = DEFAULT_TENANT_ID
+
+
+_FIELD_LABELS = {
+    "period": "모집 기간",
+    "howToApply": "지원 방법",
+}
+# render_club_data가 항목별로 직접 그리는 키
+_KNOWN_SECTIONS = ("clubName", "introduction", "positions", "activities", "targetAudience", "recruitment", "faq", "contact")
+
+
+def render_item(item):
+    """동아리 정보 JSON의 값 하나를 프롬프트용 텍스트로 바꾼다 (FAQ, 활동, 그 밖의 dict/list/값)."""
+    if isinstance(item, dict):
+        if "question" in item and "answer" in item:
+            return f"Q: {item['question']} A: {item['answer']}"
+        if "name" in item and "description" in item:
+            return f"{item['name']}: {item['description']}"
+        return "\n".join(f"{_FIELD_LABELS.get(key, key)}: {render_item(value)}" for key, value in item.items())
+    if isinstance(item, list):
+        return "\n".join(f"- {render_item(value)}" for value in item)
+    return str(item)
+
+
+def render_club_data(club_info):
+    data_lines = []
+
+    # 활동 내용
+    data_lines.append("- 주요 활동:")
+    for activity in club_info.get("activities", []):
+        data_lines.append(f"  - {activity['name']}: {activity['description']}")
+
+    # 모집 대상
+    data_lines.append(f"\n- 모집 대상: {club_info.get('targetAudience', '정보 없음')}")
+
+    # 모집 기간 및 방법
+    recruit_info = club_info.get("recruitment", {})
+    data_lines.append(f"\n- 모집 기간: {recruit_info.get('period', '정보 없음')}")
+    data_lines.append(f"- 지원 방법: {recruit_info.get('howToApply', '정보 없음')}")
+
+    # FAQ
+    data_lines.append("\n- 자주 묻는 질문(FAQ):")
+    for faq in club_info.get("faq", []):
+        data_lines.append(f"  - Q: {faq['question']} A: {faq['answer']}")
+
+    # 문의
+    data_lines.append(f"\n- 문의: {club_info.get('contact', '정보 없음')}")
+
+    # 기수별 프로젝트, 일정 등 그 밖의 섹션도 빠뜨리지 않는다
+    for key, value in club_info.items():
+        if key not in _KNOWN_SECTIONS:
+            data_lines.append(f"\n- {key}:")
+            data_lines.append(render_item(value if isinstance(value, list) else [value]))
+
+    # 모든 라인을 하나의 문자열로 결합
+    return "\n".join(data_lines)
+
+
+def build_club_context(raw: bytes, tenant_id=DEFAULT_TENANT_ID) -> ClubContext:
+    club_info = json.loads(raw.decode("utf-8"))
+    positions = club_info.get("positions")
+    return ClubContext(
+        # 동아리 정보 내용이 바뀌면 달라지는 버전 (프롬프트 체인/답변 캐시 키)
+        version=hashlib.sha256(raw).hexdigest()[:12],
+        info=MappingProxyType(club_info),
+        name=club_info.get("clubName", "동아리 이름 없음"),
+        intro=club_info.get("introduction", "동아리 소개 없음"),
+        positions=", ".join(positions) if positions else DEFAULT_CLUB_POSITIONS,
+        data=render_club_data(club_info),
+        tenant_id=tenant_id,
+    )
+
+
+class ClubConfigService:
+    """동아리 정보 파일을 감시하다가 바뀌면 새 스냅샷으로 원자적으로 교체한다.
+
+    요청 처리 코드는 current()로 받은 스냅샷을 끝까지 사용하므로,
+    처리 도중에 파일이 바뀌어도 시작할 때의 정보로 응답한다.
+    처음 읽기에 실패해도 프로세스를 끝내지 않고 error에 이유를 남긴다 (/readyz로 확인, 파일이 생기면 감시 중에 읽음).
+    """
+
+    def __init__(self, path, poll_interval=CLUB_INFO_POLL_SECONDS, tenant_id=DEFAULT_TENANT_ID):
+        self.path = path
+        self.tenant_id = tenant_id
+        self.poll_interval = poll_interval
+        self.reloads = 0
+        self.reload_errors = 0
+        self.error = None
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._task = None
+        self._stat = None
+        self._context = None
+        self.reload_if_changed()
+
+    @property
+    def loaded(self):
+        return self._context is not None
+
+    def current(self) -> ClubContext:
+        return self._context
+
+    def subscribe(self, listener):
+        """새 스냅샷으로 교체된 직후 호출될 함수 등록 (프롬프트 체인 미리 만들기 등)."""
+        self._listeners.append(listener)
+        if self._context is not None:
+            try:
+                listener(self._context)
+            except Exception as e:
+                # 리스너 하나의 오류로 테넌트 불러오기(/chat/start)가 실패하지 않도록 기록만 한다
+                print(f"[Club] '{self.path}' 리스너 오류: {type(e).__name__}: {e}")
+
+    def _file_stat(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_if_changed(self):
+        with self._lock:
+            try:
+                file_stat = self._file_stat()
+                if file_stat == self._stat:
+                    return False
+                with open(self.path, "rb") as f:
+                    context = build_club_context(f.read(), self.tenant_id)
+                if self._context is None or context.version != self._context.version:
+                    self._notify(context)
+            except Exception as e:
+                # 편집 중인 파일, 형식이 잘못된 파일(최상위가 객체가 아니거나 값의 타입이 다른 경우), 리스너 오류 모두
+                # 기존 스냅샷을 그대로 사용
+                error = f"{type(e).__name__}: {e}"
+                if self._context is None:
+                    # 아직 한 번도 읽지 못한 경우, 감시 주기마다 같은 오류를 반복해서 출력하지 않는다
+                    if error != self.error:
+                        print(f"오류: '{self.path}' 파일을 읽을 수 없습니다: {e}")
+                        if isinstance(e, FileNotFoundError):
+                            print("서버를 프로젝트 루트 폴더(mars7-invite-AI)에서 실행해야 합니다.")
+                else:
+                    self.reload_errors += 1
+                    print(f"[Club] '{self.path}' 다시 읽기 실패, 기존 정보를 유지합니다: {e}")
+                self.error = error
+                return False
+
+            self._stat = file_stat
+            self.error = None
+            if self._context is not None and context.version == self._context.version:
+                return False
+            if self._context is not None:
+                self.reloads += 1
+                print(f"[Club] 동아리 정보가 갱신되었습니다. (version={context.version})")
+            self._context = context
+            return True
+
+    def _notify(self, context):
+        """새 스냅샷을 리스너에 알린다. 하나라도 실패하면 모든 리스너를 기존 스냅샷으로 되돌리고 오류를 다시 던진다."""
+        try:
+            for listener in self._listeners:
+                listener(context)
+        except Exception:
+            if self._context is not None:
+                for listener in self._listeners:
+                    with contextlib.suppress(Exception):
+                        listener(self._context)
+            raise
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await asyncio.to_thread(self.reload_if_changed)
+            except Exception as e:
+                # 예상하지 못한 오류로 감시 태스크가 끝나면 이후 갱신을 모두 놓치므로 다음 주기에 다시 시도한다
+                print(f"[Club] '{self.path}' 감시 중 오류: {type(e).__name__}: {e}")
+
+    def start_watching(self):
+        if self._task is None and self.poll_interval > 0:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop_watching(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self):
+        return {
+            "version": self._context.version if self._context is not None else None,
+            "error": self.error,
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+        }
+
+
+class UnknownTenantError(Exception):
+    """CLUB_INFO_DIR에 정보 파일이 없는 테넌트."""
+
+
+class ClubRegistry:
+    """테넌트(동아리/기수)별 동아리 정보. 기본 테넌트는 CLUB_INFO_PATH, 나머지는 CLUB_INFO_DIR/<tenant_id>.json.
+
+    기본 테넌트 외에는 처음 요청될 때 읽는다. 그래프와 LLM 클라이언트는 모든 테넌트가 함께 쓰고,
+    테넌트마다 늘어나는 것은 동아리 정보 스냅샷과 이를 바탕으로 만든 프롬프트 체인, 답변 캐시뿐이다.
+    파일 감시는 태스크 하나가 모든 테넌트를 차례로 확인한다.
+    """
+
+    def __init__(self, default_service, directory=CLUB_INFO_DIR, poll_interval=CLUB_INFO_POLL_SECONDS):
+        self.default = default_service
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self._services = {default_service.tenant_id: default_service}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._task = None
+
+    @property
+    def loaded(self):
+        return self.default.loaded
+
+    @property
+    def error(self):
+        return self.default.error
+
+    def service(self, tenant_id=None) -> ClubConfigService:
+        if tenant_id is None:
+            return self.default
+        service = self._services.get(tenant_id)
+        if service is not None:
+            return service
+        if not re.match(TENANT_ID_PATTERN, tenant_id):
+            raise UnknownTenantError(tenant_id)
+        path = os.path.join(self.directory, f"{tenant_id}.json")
+        if not os.path.isfile(path):
+            raise UnknownTenantError(tenant_id)
+        with self._lock:
+            service = self._services.get(tenant_id)
+            if service is None:
+                service = ClubConfigService(path, self.poll_interval, tenant_id)
+                for listener in self._listeners:
+                    service.subscribe(listener)
+                # 다른 스레드(감시 태스크)가 순회 중일 수 있으므로 새 딕셔너리로 교체
+                self._services = {**self._services, tenant_id: service}
+                print(f"[Club] 테넌트 '{tenant_id}' 동아리 정보를 불러왔습니다. (테넌트 {len(self._services)}개)")
+        return service
+
+    def current(self, tenant_id=None) -> ClubContext:
+        """테넌트의 현재 스냅샷. 세션 상태의 tenant_id를 그대로 넘기면 된다 (None이면 기본 테넌트)."""
+        return self.service(tenant_id).current()
+
+    def subscribe(self, listener):
+        """모든 테넌트(나중에 불러오는 테넌트 포함)의 스냅샷이 바뀔 때 호출될 함수 등록."""
+        with self._lock:
+            self._listeners.append(listener)
+            services = list(self._services.values())
+        for service in services:
+            service.subscribe(listener)
+
+    def reload_if_changed(self):
+        return [service.reload_if_changed() for service in list(self._services.values())].count(True)
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await asyncio.to_thread(self.reload_if_changed)
+            except Exception as e:
+                print(f"[Club] 테넌트 동아리 정보 감시 중 오류: {type(e).__name__}: {e}")
+
+    def start_watching(self):
+        if self._task is None and self.poll_interval > 0:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop_watching(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self):
+        services = list(self._services.values())
+        return {
+            **self.default.stats(),
+            "reloads": sum(service.reloads for service in services),
+            "reload_errors": sum(service.reload_errors for service in services),
+            "tenants": len(services),
+            "tenant_errors": {service.tenant_id: service.error for service in services if service.error},
+        }
+
+
+club_config = ClubRegistry(ClubConfigService(CLUB_INFO_PATH))
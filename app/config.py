@@ -1,50 +1,91 @@
 import os
-import json
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# 설정되지 않아도 서버는 뜨고, /readyz가 준비되지 않은 이유로 알려준다
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 if not GOOGLE_API_KEY:
     print("오류: GOOGLE_API_KEY가 .env 파일에 설정되지 않았습니다.")
-    exit()
 
-json_path = "./mars_info.json"
-try:
-    with open(json_path, "r", encoding="utf-8") as f:
-        club_info = json.load(f)
-except FileNotFoundError:
-    print(f"오류: '{json_path}' 파일을 찾을 수 없습니다.")
-    print("서버를 프로젝트 루트 폴더(mars7-invite-AI)에서 실행해야 합니다.")
-    exit()
+# 동시에 진행할 수 있는 LLM 호출 수 (워커 하나 기준)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
 
-CLUB_NAME = club_info.get("clubName", "동아리 이름 없음")
-CLUB_INTRO = club_info.get("introduction", "동아리 소개 없음")
+# LLM 호출 시도 한 번의 제한 시간(초)과 재시도를 포함한 전체 제한 시간(초), 최대 재시도 횟수, 재시도 대기 기본값(초)
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "15"))
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BACKOFF_SECONDS = float(os.getenv("LLM_RETRY_BACKOFF_SECONDS", "0.5"))
+# 연속 실패가 이 횟수만큼 쌓이면 LLM_BREAKER_RESET_SECONDS 동안 LLM을 호출하지 않고 안내 메시지로 응답
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+# 의도 분류 호출이 이 시간(초) 안에 끝나지 않으면 같은 요청을 하나 더 보내 먼저 온 응답 사용 (0이면 사용 안 함)
+LLM_HEDGE_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_DELAY_SECONDS", "0"))
 
-CLUB_POSITIONS = "PLANNING, DESIGN, FRONTEND, BACKEND, AI"
+# Q&A 종료 의도 판별: 키워드 매칭 후 로컬 분류기 사용 여부, 로컬 분류기 최소 유사도, 메시지별 판별 결과 캐시 크기
+INTENT_LOCAL_CLASSIFIER = os.getenv("INTENT_LOCAL_CLASSIFIER", "true").lower() == "true"
+INTENT_LOCAL_THRESHOLD = float(os.getenv("INTENT_LOCAL_THRESHOLD", "0.6"))
+INTENT_CACHE_SIZE = int(os.getenv("INTENT_CACHE_SIZE", "4096"))
 
-data_lines = []
+# Q&A 턴에서 의도 분류와 답변 생성을 동시에 시작할지 여부 (지연은 줄고, 종료 턴의 답변 토큰은 버려짐)
+QA_SPECULATIVE = os.getenv("QA_SPECULATIVE", "false").lower() == "true"
 
-# 활동 내용
-data_lines.append("- 주요 활동:")
-for activity in club_info.get("activities", []):
-    data_lines.append(f"  - {activity['name']}: {activity['description']}")
+# Q&A 프롬프트에 넣을 동아리 정보 청크 수 (0이면 동아리 정보 전체를 넣음)
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "4"))
 
-# 모집 대상
-data_lines.append(f"\n- 모집 대상: {club_info.get('targetAudience', '정보 없음')}")
+# 동아리 정보 FAQ 답변 캐시: 질문이 FAQ 항목 질문에 들어 있어야 하는 최소 비율 (1보다 크면 사용 안 함),
+# FAQ 항목의 다른 표현으로 학습한 질문의 최대 개수와 보관 시간(초)
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.5"))
+ANSWER_CACHE_MAX_SIZE = int(os.getenv("ANSWER_CACHE_MAX_SIZE", "512"))
+ANSWER_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "86400"))
 
-# 모집 기간 및 방법
-recruit_info = club_info.get("recruitment", {})
-data_lines.append(f"\n- 모집 기간: {recruit_info.get('period', '정보 없음')}")
-data_lines.append(f"- 지원 방법: {recruit_info.get('howToApply', '정보 없음')}")
+# 세션 상태에 보관할 최근 메시지 수, Q&A 질문 기록 최대 개수, 기록에서 밀려난 질문을 모아 둘 최대 글자 수
+MESSAGE_WINDOW = int(os.getenv("MESSAGE_WINDOW", "20"))
+QA_LOG_MAX = int(os.getenv("QA_LOG_MAX", "50"))
+QA_SUMMARY_MAX_CHARS = int(os.getenv("QA_SUMMARY_MAX_CHARS", "500"))
 
-# FAQ
-data_lines.append("\n- 자주 묻는 질문(FAQ):")
-for faq in club_info.get("faq", []):
-    data_lines.append(f"  - Q: {faq['question']} A: {faq['answer']}")
+# 세션 체크포인터 설정
+SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", "10000"))
+SESSION_IDLE_TTL_SECONDS = float(os.getenv("SESSION_IDLE_TTL_SECONDS", "3600"))
+SESSION_MAX_CHECKPOINTS = int(os.getenv("SESSION_MAX_CHECKPOINTS", "1"))
+# "memory": 프로세스 내 메모리 (워커 1개), "sqlite": 로컬 SQLite 파일 (여러 워커가 세션 공유)
+CHECKPOINTER_BACKEND = os.getenv("CHECKPOINTER_BACKEND", "memory")
+SQLITE_CHECKPOINT_PATH = os.getenv("SQLITE_CHECKPOINT_PATH", "./sessions.db")
 
-# 문의
-data_lines.append(f"\n- 문의: {club_info.get('contact', '정보 없음')}")
+# 지원서 생성 백그라운드 작업: 워커 수, 대기열 크기
+RESUME_WORKERS = int(os.getenv("RESUME_WORKERS", "4"))
+RESUME_QUEUE_SIZE = int(os.getenv("RESUME_QUEUE_SIZE", "1000"))
+# 지원서 생성 작업 소유권 유지 시간(초). SQLite 저장소를 공유하는 워커 중 한 곳만 작업을 실행하며, 가장 긴 작업보다 길어야 한다
+RESUME_JOB_LEASE_SECONDS = float(os.getenv("RESUME_JOB_LEASE_SECONDS", "300"))
 
-# 모든 라인을 하나의 문자열로 결합
-CLUB_DATA = "\n".join(data_lines)
+# 요청 수용 제한: 동시에 실행할 턴 수, 대기열 크기, 최대 대기 시간(초)
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "64"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "256"))
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "10"))
+# 세션별, IP별 요청 빈도 제한 (초당 요청 수와 순간 허용량, 초당 요청 수가 0이면 제한 없음)
+SESSION_RATE_PER_SECOND = float(os.getenv("SESSION_RATE_PER_SECOND", "1"))
+SESSION_RATE_BURST = int(os.getenv("SESSION_RATE_BURST", "5"))
+IP_RATE_PER_SECOND = float(os.getenv("IP_RATE_PER_SECOND", "5"))
+IP_RATE_BURST = int(os.getenv("IP_RATE_BURST", "20"))
+# 프록시/CDN 뒤에서 실행할 때 X-Forwarded-For의 첫 주소를 클라이언트 IP로 사용
+TRUST_FORWARDED_FOR = os.getenv("TRUST_FORWARDED_FOR", "false").lower() == "true"
+
+# /chat/send 재시도 응답 보관: 보관할 세션 수, 세션당 최근 idempotency_key 수, 보관 시간(초)
+IDEMPOTENCY_MAX_SESSIONS = int(os.getenv("IDEMPOTENCY_MAX_SESSIONS", "10000"))
+IDEMPOTENCY_KEYS_PER_SESSION = int(os.getenv("IDEMPOTENCY_KEYS_PER_SESSION", "8"))
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "600"))
+
+# 관리자 API 토큰 (설정하지 않으면 /admin 기능 비활성화)과 지원서 내보내기 파일 저장 폴더
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+EXPORT_DIR = os.getenv("EXPORT_DIR", "./exports")
+
+# 동아리 정보 파일 경로와 변경 감시 주기(초, 0이면 감시하지 않음)
+CLUB_INFO_PATH = os.getenv("CLUB_INFO_PATH", "./mars_info.json")
+CLUB_INFO_POLL_SECONDS = float(os.getenv("CLUB_INFO_POLL_SECONDS", "5"))
+# 테넌트(다른 동아리/기수)별 정보 파일 폴더 (<tenant_id>.json), 테넌트를 지정하지 않은 세션이 쓰는 기본 테넌트 id (CLUB_INFO_PATH 사용)
+CLUB_INFO_DIR = os.getenv("CLUB_INFO_DIR", "./clubs")
+DEFAULT_TENANT_ID = os.getenv("DEFAULT_TENANT_ID", "default")
+
+# 세션별 처리 기록(/metrics/trace)을 보관할 세션 수와 세션당 최근 턴 수
+METRICS_TRACE_SESSIONS = int(os.getenv("METRICS_TRACE_SESSIONS", "1000"))
+METRICS_TRACE_TURNS = int(os.getenv("METRICS_TRACE_TURNS", "20"))
@@ -1,21 +1,89 @@
-import uvicorn
-from fastapi import FastAPI
+import asyncio
+import time
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, JSONResponse
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
-from .api.endpoints import router as api_router
+from .api.endpoints import router as api_router, readiness_problems
+from .api.admin import router as admin_router
 from .bot.graph import create_app as create_langgraph_app
+from .club import club_config
+from .bot.jobs import ResumeJobQueue, create_job_claims
+from .bot.nodes import answer_cache, llm_gateway, warm_up as warm_up_llm
+from .api.admission import AdmissionController
+from .api.idempotency import ReplayCache
+from .config import (
+    RESUME_WORKERS,
+    RESUME_QUEUE_SIZE,
+    ADMISSION_MAX_IN_FLIGHT,
+    ADMISSION_MAX_QUEUE,
+    ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    SESSION_RATE_PER_SECOND,
+    SESSION_RATE_BURST,
+    IP_RATE_PER_SECOND,
+    IP_RATE_BURST,
+    IDEMPOTENCY_MAX_SESSIONS,
+    IDEMPOTENCY_KEYS_PER_SESSION,
+    IDEMPOTENCY_TTL_SECONDS,
+)
+from .metrics import render_metrics, get_traces
+
+
+async def warm_up(app: FastAPI, retry_delay=5.0, max_retry_delay=60.0):
+    """LLM 클라이언트처럼 만드는 데 오래 걸리는 것들을 서버가 요청을 받기 시작한 뒤에 준비한다.
+
+    실패하면 (API 키 누락 등) 이유는 /readyz에 남기고, 간격을 늘려 가며 다시 시도한다.
+    """
+    while True:
+        started = time.perf_counter()
+        try:
+            await warm_up_llm()
+        except Exception as e:
+            print(f"서버 준비 실패, {retry_delay:.0f}초 후에 다시 시도합니다: {type(e).__name__}: {e}")
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(max_retry_delay, retry_delay * 2)
+            continue
+        app.state.ready_seconds = time.perf_counter() - app.state.started_at
+        print(f"서버 준비 완료. (준비 {time.perf_counter() - started:.2f}s, 시작 후 {app.state.ready_seconds:.2f}s)")
+        return
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    app.state.started_at = time.perf_counter()
+    app.state.ready_seconds = None
     print("서버 시작: LangGraph 앱을 로드합니다...")
     langgraph_app = create_langgraph_app()
     app.state.langgraph_app = langgraph_app
-    print("LangGraph 앱 로드 완료.")
+    print(f"LangGraph 앱 로드 완료. ({time.perf_counter() - app.state.started_at:.2f}s)")
+    club_config.start_watching()
+    warm_up_task = asyncio.create_task(warm_up(app))
+
+    resume_jobs = ResumeJobQueue(workers=RESUME_WORKERS, max_queue=RESUME_QUEUE_SIZE, claims=create_job_claims())
+    resume_jobs.start(langgraph_app)
+    app.state.resume_jobs = resume_jobs
+
+    app.state.admission = AdmissionController(
+        max_in_flight=ADMISSION_MAX_IN_FLIGHT,
+        max_queue=ADMISSION_MAX_QUEUE,
+        queue_timeout=ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        session_rate=SESSION_RATE_PER_SECOND,
+        session_burst=SESSION_RATE_BURST,
+        ip_rate=IP_RATE_PER_SECOND,
+        ip_burst=IP_RATE_BURST,
+    )
+    app.state.replay_cache = ReplayCache(
+        max_sessions=IDEMPOTENCY_MAX_SESSIONS,
+        max_keys_per_session=IDEMPOTENCY_KEYS_PER_SESSION,
+        ttl=IDEMPOTENCY_TTL_SECONDS,
+    )
 
     yield
 
     print("서버 종료.")
+    warm_up_task.cancel()
+    await resume_jobs.stop()
+    await club_config.stop_watching()
     app.state.langgraph_app = None
 
 
@@ -44,9 +112,75 @@ def read_root():
     return {"message": "마스외전 챗봇 API입니다."}
 
 
+@app.get("/healthz")
+def liveness():
+    """프로세스가 요청에 응답할 수 있는지 (설정 오류가 있어도 200, 재시작이 필요할 때만 실패)."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+def readiness():
+    """트래픽을 받을 준비가 됐는지. 안 됐으면 503과 함께 항목별 이유를 돌려준다."""
+    problems = readiness_problems(app.state)
+    if problems:
+        return JSONResponse(status_code=503, content={"status": "starting", "problems": problems})
+    return {"status": "ready", "ready_seconds": round(app.state.ready_seconds or 0, 3)}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus 수집용 지표. 노드/LLM 호출 지연 시간과 토큰 수에 세션, 작업 큐, 캐시 상태를 더한다.
+
+    지표가 담긴 dict/deque는 이벤트 루프에서만 바뀌므로 async로 두어 같은 루프에서 읽는다.
+    """
+    gauges, counters = [], []
+    langgraph_app = getattr(app.state, "langgraph_app", None)
+    checkpointer = langgraph_app.checkpointer if langgraph_app else None
+    if hasattr(checkpointer, "astats"):
+        # SQLite는 파일을 읽어야 하므로 스레드에서 센다
+        checkpointer_stats = await checkpointer.astats()
+    elif hasattr(checkpointer, "stats"):
+        checkpointer_stats = checkpointer.stats()
+    else:
+        checkpointer_stats = {}
+    gauges.append(("mars_sessions_live", "보관 중인 세션 수", checkpointer_stats.get("live_sessions")))
+    resume_jobs = getattr(app.state, "resume_jobs", None)
+    if resume_jobs is not None:
+        job_stats = resume_jobs.stats()
+        gauges.append(("mars_resume_jobs_queued", "대기 중인 지원서 생성 작업 수", job_stats["queue_depth"]))
+        gauges.append(("mars_resume_jobs_running", "실행 중인 지원서 생성 작업 수", job_stats["running"]))
+        counters.append(("mars_resume_jobs_completed_total", "완료한 지원서 생성 작업 수", job_stats["completed"]))
+        counters.append(("mars_resume_jobs_failed_total", "실패한 지원서 생성 작업 수", job_stats["failed"]))
+    cache_stats = answer_cache.stats()
+    counters.append(("mars_answer_cache_hits_total", "답변 캐시 적중 수", cache_stats["hits"]))
+    counters.append(("mars_answer_cache_misses_total", "답변 캐시 미스 수", cache_stats["misses"]))
+    admission = getattr(app.state, "admission", None)
+    if admission is not None:
+        admission_stats = admission.stats()
+        gauges.append(("mars_admission_in_flight", "실행 중인 턴 수", admission_stats["in_flight"]))
+        gauges.append(("mars_admission_queued", "실행을 기다리는 요청 수", admission_stats["queued"]))
+    gauges.append(("mars_llm_breaker_open", "LLM 호출 차단 여부 (1이면 차단 중)", int(llm_gateway.breaker.state == "open")))
+    gauges.append(("mars_ready", "요청을 처리할 준비가 됐는지 (1이면 준비 완료)", int(not readiness_problems(app.state))))
+    gauges.append(("mars_club_tenants", "불러온 테넌트(동아리 정보) 수", club_config.stats()["tenants"]))
+    counters.append(("mars_club_info_reloads_total", "동아리 정보 갱신 횟수", club_config.stats()["reloads"]))
+    return PlainTextResponse(render_metrics(gauges, counters), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/metrics/trace/{session_id}")
+async def get_session_trace(session_id: str):
+    """세션의 최근 턴별 처리 기록 (노드/LLM 호출별 소요 시간과 토큰 수)."""
+    traces = get_traces(session_id)
+    if traces is None:
+        raise HTTPException(status_code=404, detail="처리 기록이 없는 세션입니다.")
+    return {"session_id": session_id, "turns": traces}
+
+
 app.include_router(api_router, prefix="")
+app.include_router(admin_router)
 
 # 로컬에서 직접 실행하기 위한 코드
 if __name__ == "__main__":
+    import uvicorn
+
     # 터미널에서 uvicorn app.main:app --reload
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
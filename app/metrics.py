@@ -0,0 +1,308 @@
+"""그래프 노드와 LLM 호출의 지연 시간, 토큰 사용량, 오류 수 집계 (Prometheus 텍스트 형식)와 세션별 처리 기록.
+
+요청 처리 경로에서는 perf_counter 두 번과 dict 갱신만 하고, 문자열 변환은 /metrics 조회 때만 한다.
+"""
+import asyncio
+import contextvars
+import time
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+from app.config import METRICS_TRACE_SESSIONS, METRICS_TRACE_TURNS
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CALL_COUNT_BUCKETS = (0, 1, 2, 3, 4, 6, 8)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.label_names = labels
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, description, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = labels
+        self.buckets = buckets
+        # 라벨 값 -> [버킷별 개수(누적 아님, 마지막은 +Inf), 합계, 개수]
+        self._series = {}
+
+    def observe(self, value, *labels):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, *labels):
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        bucket_names = self.label_names + ("le",)
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_names, labels + (bound,))} {cumulative}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {round(total, 6)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+node_duration = Histogram("mars_graph_node_duration_seconds", "그래프 노드 실행 시간", ("node",))
+node_errors = Counter("mars_graph_node_errors_total", "그래프 노드 실행 중 발생한 예외 수", ("node",))
+llm_duration = Histogram("mars_llm_call_duration_seconds", "LLM 호출 시간 (동시 호출 제한 대기 포함)", ("call",))
+llm_errors = Counter("mars_llm_call_errors_total", "LLM 호출 실패 수", ("call",))
+llm_tokens = Counter("mars_llm_tokens_total", "LLM 토큰 사용량", ("call", "kind"))
+llm_retries = Counter("mars_llm_retries_total", "LLM 호출 재시도 수", ("call",))
+llm_hedges = Counter("mars_llm_hedged_requests_total", "응답이 늦어 추가로 보낸 LLM 요청 수", ("call",))
+llm_rejections = Counter("mars_llm_breaker_rejections_total", "회로 차단으로 보내지 않은 LLM 호출 수", ("call",))
+admission_wait = Histogram("mars_admission_wait_seconds", "요청이 실행되기 전 대기열에서 기다린 시간")
+admission_rejections = Counter("mars_admission_rejections_total", "429로 거절한 요청 수", ("reason",))
+idempotency_replays = Counter(
+    "mars_idempotency_replays_total", "같은 idempotency_key의 재시도에 그래프 실행 없이 돌려준 응답 수", ("endpoint", "state")
+)
+turn_duration = Histogram("mars_chat_turn_duration_seconds", "API 요청 하나(대화 한 턴) 처리 시간", ("endpoint",))
+turn_llm_calls = Histogram(
+    "mars_chat_turn_llm_calls", "대화 한 턴에서 실행한 LLM 호출 수", ("endpoint",), buckets=CALL_COUNT_BUCKETS
+)
+
+METRICS = (
+    node_duration, node_errors, llm_duration, llm_errors, llm_tokens, llm_retries, llm_hedges, llm_rejections,
+    admission_wait, admission_rejections, idempotency_replays, turn_duration, turn_llm_calls,
+)
+
+
+class Trace:
+    """API 요청 하나에서 어떤 노드와 LLM 호출에 시간이 쓰였는지 기록."""
+
+    __slots__ = ("session_id", "endpoint", "started_at", "started", "spans", "llm_calls",
+                 "input_tokens", "output_tokens", "elapsed_ms", "error")
+
+    def __init__(self, session_id, endpoint):
+        self.session_id = session_id
+        self.endpoint = endpoint
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.spans = []
+        self.llm_calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.elapsed_ms = None
+        self.error = None
+
+    def add_span(self, span):
+        span["offset_ms"] = round((span.pop("_started") - self.started) * 1000, 1)
+        self.spans.append(span)
+
+    def to_dict(self):
+        return {
+            "endpoint": self.endpoint,
+            "started_at": self.started_at,
+            "elapsed_ms": self.elapsed_ms,
+            "llm_calls": self.llm_calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "error": self.error,
+            "spans": self.spans,
+        }
+
+
+_current_trace = contextvars.ContextVar("mars_current_trace", default=None)
+_current_llm_span = contextvars.ContextVar("mars_current_llm_span", default=None)
+# 세션 id -> 최근 턴 기록 (LRU)
+_recent_traces = OrderedDict()
+
+
+def start_trace(session_id, endpoint):
+    """요청 처리 시작 시 호출. 이 요청에서 실행되는 노드/LLM 호출이 반환된 Trace에 기록된다."""
+    trace = Trace(session_id, endpoint)
+    _current_trace.set(trace)
+    return trace
+
+
+def finish_trace(trace, error=None):
+    trace.elapsed_ms = round((time.perf_counter() - trace.started) * 1000, 1)
+    trace.error = error
+    turn_duration.observe(trace.elapsed_ms / 1000, trace.endpoint)
+    turn_llm_calls.observe(trace.llm_calls, trace.endpoint)
+
+    turns = _recent_traces.get(trace.session_id)
+    if turns is None:
+        turns = _recent_traces[trace.session_id] = deque(maxlen=METRICS_TRACE_TURNS)
+    else:
+        _recent_traces.move_to_end(trace.session_id)
+    turns.append(trace)
+    while len(_recent_traces) > METRICS_TRACE_SESSIONS:
+        _recent_traces.popitem(last=False)
+
+
+def get_traces(session_id):
+    turns = _recent_traces.get(session_id)
+    if turns is None:
+        return None
+    return [trace.to_dict() for trace in turns]
+
+
+def _record_node(name, started, error):
+    elapsed = time.perf_counter() - started
+    node_duration.observe(elapsed, name)
+    if error is not None:
+        node_errors.inc(name)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_span({"kind": "node", "name": name, "ms": round(elapsed * 1000, 1), "error": error, "_started": started})
+
+
+def instrument_node(name, node):
+    """그래프 노드 함수를 감싸 실행 시간과 예외 수를 기록한다."""
+    if iscoroutinefunction(node):
+        @wraps(node)
+        async def wrapper(state):
+            started = time.perf_counter()
+            try:
+                result = await node(state)
+            except BaseException as e:
+                _record_node(name, started, type(e).__name__)
+                raise
+            _record_node(name, started, None)
+            return result
+    else:
+        @wraps(node)
+        def wrapper(state):
+            started = time.perf_counter()
+            try:
+                result = node(state)
+            except BaseException as e:
+                _record_node(name, started, type(e).__name__)
+                raise
+            _record_node(name, started, None)
+            return result
+    return wrapper
+
+
+@contextmanager
+def track_llm_call(name):
+    """LLM 호출 하나를 감싸 시간, 실패, 토큰 수를 기록한다. 토큰 수는 아래 콜백이 채운다."""
+    started = time.perf_counter()
+    span = {"kind": "llm", "name": name, "ms": None, "input_tokens": 0, "output_tokens": 0,
+            "error": None, "_started": started}
+    token = _current_llm_span.set(span)
+    try:
+        yield span
+    except asyncio.CancelledError:
+        # 추측 실행한 답변을 취소한 경우 등은 실패로 세지 않는다
+        span["error"] = "cancelled"
+        raise
+    except BaseException as e:
+        span["error"] = type(e).__name__
+        llm_errors.inc(name)
+        raise
+    finally:
+        _current_llm_span.reset(token)
+        elapsed = time.perf_counter() - started
+        span["ms"] = round(elapsed * 1000, 1)
+        llm_duration.observe(elapsed, name)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.llm_calls += 1
+            trace.add_span(span)
+
+
+class _TokenUsageHandler(BaseCallbackHandler):
+    """모든 LangChain 실행에 붙는 콜백. 채팅 모델 응답의 usage_metadata만 읽는다."""
+
+    run_inline = True
+    ignore_chain = True
+    ignore_agent = True
+    ignore_retriever = True
+    ignore_retry = True
+    ignore_custom_event = True
+
+    def on_llm_end(self, response, **kwargs):
+        input_tokens = output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if usage:
+                    input_tokens += usage.get("input_tokens", 0)
+                    output_tokens += usage.get("output_tokens", 0)
+        if not (input_tokens or output_tokens):
+            return
+
+        span = _current_llm_span.get()
+        name = span["name"] if span is not None else "other"
+        llm_tokens.inc(name, "prompt", amount=input_tokens)
+        llm_tokens.inc(name, "completion", amount=output_tokens)
+        if span is not None:
+            span["input_tokens"] += input_tokens
+            span["output_tokens"] += output_tokens
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.input_tokens += input_tokens
+            trace.output_tokens += output_tokens
+
+
+# 기본값으로 핸들러를 넣어 두면 LangChain이 모든 실행의 콜백 매니저에 자동으로 추가한다
+_token_usage_handler = contextvars.ContextVar("mars_token_usage_handler", default=_TokenUsageHandler())
+register_configure_hook(_token_usage_handler, inheritable=True)
+
+
+def render_metrics(gauges=(), counters=()):
+    """Prometheus 텍스트 형식으로 변환. gauges와 counters는 (이름, 설명, 값) 목록으로, 값이 None이면 건너뛴다.
+
+    counters에는 계속 늘어나기만 하는 누적 값을 넣는다 (rate()로 볼 수 있도록 이름은 _total로 끝낸다).
+    """
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for name, description, value in counters:
+        if value is None:
+            continue
+        counter = Counter(name, description)
+        counter.inc(amount=value)
+        lines.extend(counter.render())
+    for name, description, value in gauges:
+        if value is None:
+            continue
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,61 @@
+"""벤치마크 스크립트가 함께 쓰는 뼈대.
+
+- setup_env: app을 불러오기 전에 환경 변수 기본값을 정한다 (실제 API 키 없이, 동아리 정보 파일 감시 없이 실행)
+- make_parser: 공통 인자(--seed, --out, --verbose)를 가진 인자 파서
+- run: --verbose가 아니면 서버 로그(stdout)를 버리고 벤치마크를 실행한다
+- finish: 결과 JSON을 출력(--out이면 파일에도 저장)하고, 확인 항목(checks)이 하나라도 실패하면 종료 코드 1
+
+이 모듈은 app을 불러오지 않으므로, 스크립트는 setup_env를 부른 뒤에 app과 benchmarks.fake_llm을 불러온다.
+"""
+import argparse
+import asyncio
+import contextlib
+import inspect
+import json
+import os
+import sys
+
+DEFAULT_ENV = {
+    "GOOGLE_API_KEY": "benchmark-dummy-key",
+    "CLUB_INFO_POLL_SECONDS": "0",
+}
+
+
+def setup_env(**overrides):
+    """DEFAULT_ENV와 overrides를 환경 변수 기본값으로 둔다 (이미 설정된 값은 그대로)."""
+    for name, value in {**DEFAULT_ENV, **overrides}.items():
+        os.environ.setdefault(name, value)
+
+
+def make_parser(description, verbose_help="서버 로그를 그대로 출력"):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="결과 JSON을 저장할 경로")
+    parser.add_argument("--verbose", action="store_true", help=verbose_help)
+    return parser
+
+
+def run(benchmark, args):
+    """benchmark(args)를 실행해 결과를 돌려준다. 코루틴을 돌려주면 asyncio.run으로 끝까지 실행한다."""
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            # 요청마다 찍히는 서버 로그는 측정에 방해가 되므로 버린다
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+        result = benchmark(args)
+        if inspect.isawaitable(result):
+            result = asyncio.run(result)
+    return result
+
+
+def finish(result, args, passed=None):
+    """passed를 주지 않으면 result["checks"]가 모두 참일 때 통과로 본다."""
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+    if passed is None:
+        passed = all(result["checks"].values())
+    if not passed:
+        sys.exit(1)
@@ -0,0 +1,203 @@
+"""동아리 FAQ 답변 캐시가 흔한 다른 표현은 맞히고, 다른 대상을 묻는 질문에는 답하지 않는지 확인한다.
+
+1. 정답을 붙인 질문으로 AnswerCache.lookup을 실행한다.
+   - HITS: FAQ/활동/모집 대상 항목을 다르게 표현한 질문 (기대한 항목의 답이 나와야 한다)
+   - MISSES: 비슷한 단어를 쓰지만 다른 것을 묻는 질문, 포지션/활동처럼 대상이 다른 질문 (캐시를 쓰면 안 된다)
+2. 학습: 처음에는 못 맞힌 질문에 대해 LLM이 FAQ 답과 같은 내용으로 답하면 질문을 그 항목의 다른 표현으로 기억하고,
+   관계없는 답이면 기억하지 않는지, max_size(LRU)와 ttl이 지켜지는지 본다.
+3. 노드: 가짜 LLM으로 qa_session_node를 실행해 적중한 질문은 LLM을 한 번도 호출하지 않는지(의도 분류 포함) 센다.
+확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.answer_cache --iterations 2000
+"""
+import dataclasses
+import sys
+import time
+
+from benchmarks import _harness
+
+_harness.setup_env()
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+
+from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm  # noqa: E402
+
+MEETING = "정기 모임은 언제 어디서 하나요?"
+GRADUATES = "꼭 졸업생이나 현직자만 참여할 수 있나요?"
+ACTIVITIES = "어떤 활동을 하나요?"
+TARGET = "누가 지원할 수 있나요?"
+
+# (질문, 답을 가져와야 하는 항목 질문)
+HITS = [
+    ("모임은 언제 해?", MEETING),
+    ("모임 언제 해요?", MEETING),
+    ("모임은 어디서 해?", MEETING),
+    ("정기 모임은 언제 어디서 해요?", MEETING),
+    ("무슨 활동 해?", ACTIVITIES),
+    ("활동 뭐 해요?", ACTIVITIES),
+    ("어떤 활동을 하나요?", ACTIVITIES),
+    ("누가 지원할 수 있어?", TARGET),
+    ("누가 지원할 수 있나요?", TARGET),
+    ("지원 대상이 누구야?", TARGET),
+    ("졸업생만 참여할 수 있어?", GRADUATES),
+    ("현직자만 참여 가능해?", GRADUATES),
+]
+MISSES = [
+    "회비는 얼마예요?",
+    "비전공자도 따라갈 수 있을까요?",
+    "프로젝트는 몇 명이서 같이 해요?",
+    "해커톤도 나가나요?",
+    "지원 마감 언제야?",
+    "면접은 언제 봐?",
+    "스터디는 어떻게 진행돼?",
+    "모임 끝나고 뒤풀이 해?",
+    "다음 모임 주제는 뭐야?",
+    "합격 발표 언제 해?",
+    "지원서 어디서 내?",
+    "동아리방 어디야?",
+    "언제?",
+    # 대상(포지션, 활동, 숫자)이 다르면 글자가 비슷해도 다른 질문
+    "백엔드 누가 지원할 수 있나요?",
+    "외주 프로젝트는 어떤 활동을 하나요?",
+    "2학기 정기 모임은 언제 어디서 하나요?",
+]
+# (처음에는 못 맞히는 질문, 학습 후 같은 뜻으로 다시 묻는 질문)
+LEARN = ("정기적으로 모이는 요일이랑 장소 알려줘", "정기적으로 모이는 요일이랑 장소 알려줄래?")
+
+
+def seed_answers(club):
+    from app.bot.answer_cache import AnswerCache
+
+    return dict(AnswerCache._faq_pairs(club.info))
+
+
+def accuracy_report(cache, club, answers):
+    hits, wrong, false_hits = 0, [], []
+    for question, expected in HITS:
+        answer = cache.lookup(question, club.version)
+        if answer == answers[expected]:
+            hits += 1
+        else:
+            wrong.append(question)
+    for question in MISSES:
+        if cache.lookup(question, club.version) is not None:
+            false_hits.append(question)
+    return {
+        "expected_hits": len(HITS),
+        "hits": hits,
+        "recall": round(hits / len(HITS), 3),
+        "missed": wrong,
+        "expected_misses": len(MISSES),
+        "false_hits": false_hits,
+    }
+
+
+def learning_report(club, answers):
+    from app.bot.answer_cache import AnswerCache
+
+    cache = AnswerCache(max_size=2, ttl=0.2)
+    cache.sync(club)
+    asked, asked_again = LEARN
+    first = cache.lookup(asked, club.version)
+    # LLM이 대화 내역을 보고 FAQ 내용을 풀어서 답한 경우 (지원자 이름 등이 섞여 있어도 저장되는 것은 질문뿐)
+    llm_answer = f"김마스, 좋은 질문이야! {answers[MEETING]} 편하게 와!"
+    unrelated_learned = cache.learn("혹시 회비는 얼마인지 알 수 있을까요?", "회비는 학기당 2만원이야.", club.version)
+    learned = cache.learn(asked, llm_answer, club.version)
+    after = cache.lookup(asked_again, club.version)
+    served_seed_answer = after == answers[MEETING]
+
+    # max_size=2: 질문을 더 학습하면 가장 오래된 것부터 지운다
+    cache.learn("정기적으로 만나는 요일이 언제야", llm_answer, club.version)
+    cache.learn("정기적으로 모이는 장소는 어디야", llm_answer, club.version)
+    bounded = cache.stats()["learned_entries"] <= 2
+    time.sleep(0.25)
+    expired = cache.lookup(asked_again, club.version) is None
+
+    # 동아리 정보가 바뀌면 학습한 질문도 버린다
+    cache.learn(asked, llm_answer, club.version)
+    cache.sync(dataclasses.replace(club, version=f"{club.version}-next"))
+    return {
+        "first_lookup_hit": first is not None,
+        "learned": learned,
+        "unrelated_learned": unrelated_learned,
+        "hit_after_learning": after is not None,
+        "served_seed_answer": served_seed_answer,
+        "bounded": bounded,
+        "expired_after_ttl": expired,
+        "cleared_on_reload": cache.stats()["learned_entries"] == 0,
+        "stats": cache.stats(),
+    }
+
+
+async def node_report(args):
+    from app.bot import nodes
+
+    fake = install_fake_llm(FakeChatModel(latency=LatencyModel(args.latency_ms, "fixed"), seed=args.seed))
+    calls = {}
+    for question, _ in HITS:
+        before = sum(fake.calls.values())
+        await nodes.qa_session_node({"messages": [AIMessage(content="궁금한 거 있어?"), HumanMessage(content=question)]})
+        calls[question] = sum(fake.calls.values()) - before
+    return {"llm_calls": calls, "total_llm_calls": sum(calls.values())}
+
+
+async def run_benchmark(args):
+    from app.bot.answer_cache import AnswerCache
+    from app.club import club_config
+
+    club = club_config.current()
+    answers = seed_answers(club)
+    cache = AnswerCache()
+    cache.sync(club)
+
+    accuracy = accuracy_report(cache, club, answers)
+    learning = learning_report(club, answers)
+    nodes = await node_report(args)
+
+    questions = [question for question, _ in HITS] + MISSES
+    started = time.perf_counter()
+    for index in range(args.iterations):
+        cache.lookup(questions[index % len(questions)], club.version)
+    lookup_us = (time.perf_counter() - started) / args.iterations * 1_000_000
+
+    checks = {
+        "all_expected_hits": not accuracy["missed"],
+        "no_false_hits": not accuracy["false_hits"],
+        "learns_question_only": (
+            not learning["first_lookup_hit"] and learning["learned"] and learning["hit_after_learning"]
+            and learning["served_seed_answer"]
+        ),
+        "ignores_unrelated_answers": not learning["unrelated_learned"],
+        "learned_entries_bounded": (
+            learning["bounded"] and learning["expired_after_ttl"] and learning["cleared_on_reload"]
+        ),
+        "hits_skip_llm": nodes["total_llm_calls"] == 0,
+    }
+    return {
+        "config": {
+            "threshold": cache.threshold,
+            "faq_entries": cache.stats()["faq_entries"],
+            "iterations": args.iterations,
+            "python": sys.version.split()[0],
+        },
+        "accuracy": accuracy,
+        "learning": learning,
+        "qa_session_node": nodes,
+        "lookup_us": round(lookup_us, 2),
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("FAQ 답변 캐시의 적중/오적중과 질문 학습을 확인합니다.")
+    parser.add_argument("--iterations", type=int, default=2000, help="조회 시간을 잴 반복 수")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="LLM 호출 지연 시간(ms)")
+    args = parser.parse_args()
+
+    result = _harness.run(run_benchmark, args)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
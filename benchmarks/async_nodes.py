@@ -0,0 +1,198 @@
+"""LLM을 부르는 노드를 async로 실행할 때와 예전처럼 동기 함수로 실행할 때의 처리량(대화/초)을 비교한다.
+
+- threaded: 노드가 동기 함수라 LangGraph가 기본 스레드 풀에서 실행하고, LLM 호출(invoke) 동안 스레드를 붙잡는 구조
+  (노드를 async로 바꾸기 전과 같음. 동시 대화 수가 스레드 수를 넘으면 나머지는 스레드가 빌 때까지 기다린다)
+- async: 현재 구조. 노드가 LLM 응답을 await하고, 동시 LLM 호출 수는 LLM_MAX_CONCURRENCY로 제한
+
+두 방식 모두 같은 대화 시나리오와 같은 가짜 LLM 지연 시간으로 한 번씩 실행하고, 대화/초, 턴 지연 시간,
+실행 중 최대 스레드 수와 동시에 진행된 최대 LLM 호출 수를 JSON으로 출력한다. 확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.async_nodes --sessions 200 --concurrency 100 --latency-ms 300
+"""
+import asyncio
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import _harness
+
+# app을 불러오기 전에 설정해야 하는 값. 요청 수용 제한이 두 방식의 차이를 가리지 않도록 넉넉하게 두고,
+# Q&A 질문이 모두 LLM을 거치도록 답변 캐시는 끈다.
+# 모든 요청이 같은 주소(ASGI transport)에서 오므로 빈도 제한도 끈다.
+# 지원서 생성 대기열은 두 방식이 같으므로, 워커 수가 처리량을 제한하지 않도록 늘려 둔다
+_harness.setup_env(
+    ANSWER_CACHE_THRESHOLD="1.01",
+    ADMISSION_MAX_IN_FLIGHT="1000",
+    ADMISSION_MAX_QUEUE="1000",
+    ADMISSION_QUEUE_TIMEOUT_SECONDS="120",
+    IP_RATE_PER_SECOND="0",
+    SESSION_RATE_PER_SECOND="0",
+    RESUME_WORKERS="32",
+)
+
+import httpx  # noqa: E402
+
+from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm  # noqa: E402
+from benchmarks.load_test import LoadRunner, build_script, summarize  # noqa: E402
+
+# async를 먼저 실행한다 (threaded 방식이 늘려 둔 스레드 풀의 스레드는 끝난 뒤에도 남아 있으므로)
+MODES = ("async", "threaded")
+# LLM을 부르는 노드 (start_node 등 나머지는 LLM을 부르지 않으므로 두 방식에서 같다)
+LLM_NODES = ("process_introduction", "process_position", "qa_session_node", "generate_resume_node")
+
+
+def default_thread_pool_size():
+    # asyncio 기본 스레드 풀(ThreadPoolExecutor)의 기본 워커 수
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+@contextlib.contextmanager
+def threaded_nodes():
+    """LLM을 부르는 노드를 동기 함수로 바꾸고, LLM 호출은 응답이 올 때까지 스레드를 붙잡는 invoke로 바꾼다.
+
+    create_app()이 노드를 등록하기 전에 적용해야 한다.
+    """
+    from app.bot import graph, nodes
+
+    async def blocking_invoke(runnable, llm_input, name, hedge=False):
+        return runnable.invoke(llm_input)
+
+    def to_sync(node):
+        def sync_node(state):
+            return asyncio.run(node(state))
+        return sync_node
+
+    originals = {name: getattr(graph, name) for name in LLM_NODES}
+    original_invoke = nodes.ainvoke_llm
+    nodes.ainvoke_llm = blocking_invoke
+    for name, node in originals.items():
+        setattr(graph, name, to_sync(node))
+    try:
+        yield
+    finally:
+        nodes.ainvoke_llm = original_invoke
+        for name, node in originals.items():
+            setattr(graph, name, node)
+
+
+async def sample_threads(peak):
+    while True:
+        peak[0] = max(peak[0], threading.active_count())
+        await asyncio.sleep(0.01)
+
+
+async def run_mode(args, mode, fake):
+    from app.main import app as fastapi_app, lifespan
+
+    rng = random.Random(args.seed)
+    scripts = [build_script(rng, args.max_questions) for _ in range(args.warmup + args.sessions)]
+    fake.latency.rng.seed(args.seed)
+
+    with threaded_nodes() if mode == "threaded" else contextlib.nullcontext():
+        transport = httpx.ASGITransport(app=fastapi_app)
+        async with lifespan(fastapi_app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+                warmup = LoadRunner(client)
+                for script in scripts[:args.warmup]:
+                    await warmup.run_session(script)
+
+                fake.calls.clear()
+                fake.peak_in_flight = fake.in_flight
+                runner = LoadRunner(client, poll_interval=args.poll_ms / 1000)
+                semaphore = asyncio.Semaphore(args.concurrency)
+                peak_threads = [threading.active_count()]
+                sampler = asyncio.create_task(sample_threads(peak_threads))
+
+                async def limited(script):
+                    async with semaphore:
+                        await runner.run_session(script)
+
+                started = time.perf_counter()
+                await asyncio.gather(*(limited(script) for script in scripts[args.warmup:]))
+                elapsed = time.perf_counter() - started
+                sampler.cancel()
+
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "sessions_completed": runner.completed,
+        "sessions_failed": runner.failed,
+        "sessions_per_second": round(runner.completed / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            endpoint: summarize(runner.latencies[endpoint]) for endpoint in ("chat_send", "resume_wait", "session")
+        },
+        "llm_calls": sum(fake.calls.values()),
+        "peak_threads": peak_threads[0],
+        "llm_peak_in_flight": fake.peak_in_flight,
+    }
+
+
+async def run_benchmark(args):
+    from app.bot.nodes import llm_gateway
+
+    # 두 방식이 같은 크기의 스레드 풀을 쓰도록 고정 (threaded 방식의 동시 처리 한도)
+    thread_pool_size = args.threads or default_thread_pool_size()
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=thread_pool_size))
+    fake = install_fake_llm(FakeChatModel(
+        latency=LatencyModel(args.latency_ms, "uniform", rng=random.Random(args.seed)),
+        seed=args.seed,
+    ))
+
+    modes = {}
+    for mode in MODES:
+        modes[mode] = await run_mode(args, mode, fake)
+
+    threaded, native = modes["threaded"], modes["async"]
+    speedup = (
+        native["sessions_per_second"] / threaded["sessions_per_second"]
+        if threaded["sessions_per_second"] else None
+    )
+    checks = {
+        "all_sessions_completed": all(
+            result["sessions_completed"] == args.sessions and result["sessions_failed"] == 0
+            for result in modes.values()
+        ),
+        "async_faster": speedup is not None and speedup >= args.min_speedup,
+        # threaded 방식은 스레드 수만큼만 LLM을 동시에 기다리고, async 방식은 스레드 수와 관계없이 기다린다
+        "threaded_capped_by_pool": threaded["llm_peak_in_flight"] <= thread_pool_size,
+        "async_not_capped_by_threads": native["llm_peak_in_flight"] > native["peak_threads"],
+    }
+    return {
+        "config": {
+            "sessions": args.sessions,
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms,
+            "max_questions": args.max_questions,
+            "thread_pool_size": thread_pool_size,
+            "llm_max_concurrency": llm_gateway.max_concurrency,
+            "min_speedup": args.min_speedup,
+            "python": sys.version.split()[0],
+        },
+        "modes": modes,
+        "speedup": round(speedup, 2) if speedup is not None else None,
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("async 노드와 동기(스레드 풀) 노드의 처리량을 비교합니다.")
+    parser.add_argument("--sessions", type=int, default=200, help="방식마다 측정할 대화 수")
+    parser.add_argument("--concurrency", type=int, default=100, help="동시에 진행할 대화 수")
+    parser.add_argument("--warmup", type=int, default=3, help="측정 전에 실행할 대화 수")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="LLM 호출 지연 시간(평균, ms)")
+    parser.add_argument("--max-questions", type=int, default=4, help="대화당 최대 Q&A 질문 수")
+    parser.add_argument("--threads", type=int, help="스레드 풀 크기 (기본: 파이썬 기본값 min(32, CPU 수 + 4))")
+    parser.add_argument("--min-speedup", type=float, default=1.5, help="async 방식에 기대하는 최소 처리량 배수")
+    parser.add_argument("--poll-ms", type=float, default=200.0, help="/chat/status 폴링 간격(ms)")
+    args = parser.parse_args()
+
+    result = _harness.run(run_benchmark, args)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""지원서 일괄 재생성(app.batch)의 처리량(applications/minute)을 동시 처리 수(--concurrency)별로 측정한다.
+
+가짜 LLM(--latency-ms)과 임시 SQLite 세션 저장소에 대화를 마친 세션 --sessions 개를 만들어 두고,
+동시 처리 수마다 새 출력 파일로 ResumeExporter를 실행해 처리량, 실패 수, 동시에 진행된 최대 LLM 호출 수를 기록한다.
+마지막으로 같은 출력 파일로 한 번 더 실행해 이미 처리한 세션을 건너뛰는지(진행 기록) 본다.
+확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.batch_export --sessions 64 --concurrency 1,4,16,32 --latency-ms 200
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+from benchmarks import _harness
+
+_harness.setup_env()
+
+from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm  # noqa: E402
+
+MOTIVATION = "같이 프로젝트를 해 볼 사람들이 필요해서 지원하게 되었습니다."
+QA_QUESTIONS = ["스터디는 어떻게 진행돼?", "회비는 얼마야?"]
+
+
+async def seed_sessions(saver, count):
+    """대화를 마친("done") 세션 count개를 저장소에 만든다."""
+    from app.bot.graph import create_app
+
+    graph = create_app(saver)
+    for index in range(count):
+        config = {"configurable": {"thread_id": f"batch-{index}"}}
+        await graph.ainvoke({}, config=config)
+        await graph.aupdate_state(config, {
+            "name": f"지원자{index}",
+            "department": "컴퓨터공학과",
+            "age": "23",
+            "phone_number": "010-1234-5678",
+            "positions": ["BACKEND"],
+            "initial_motivation": MOTIVATION,
+            "qa_questions": QA_QUESTIONS,
+            "motivation": "이전에 생성한 지원 동기",
+            "next_question": "done",
+        })
+
+
+async def run_benchmark(args, data_dir):
+    from app.batch import ResumeExporter
+    from app.bot.checkpointer import SQLiteSaver
+    from app.config import LLM_MAX_CONCURRENCY
+
+    fake = install_fake_llm(FakeChatModel(latency=LatencyModel(args.latency_ms, "uniform"), seed=args.seed))
+    saver = SQLiteSaver(os.path.join(data_dir, "sessions.db"))
+    levels = sorted(int(level) for level in args.concurrency.split(","))
+    try:
+        await seed_sessions(saver, args.sessions)
+
+        runs = []
+        for level in levels:
+            fake.peak_in_flight = 0
+            exporter = ResumeExporter(os.path.join(data_dir, f"export-{level}.jsonl"), concurrency=level)
+            stats = await exporter.run(saver)
+            runs.append({
+                "concurrency": level,
+                "processed": stats["processed"],
+                "failed": stats["failed"],
+                "elapsed_seconds": stats["elapsed_seconds"],
+                "applications_per_minute": stats["applications_per_minute"],
+                "peak_llm_in_flight": fake.peak_in_flight,
+            })
+
+        # 같은 출력 파일로 다시 실행하면 진행 기록에 있는 세션은 모두 건너뛴다
+        rerun = await ResumeExporter(os.path.join(data_dir, f"export-{levels[-1]}.jsonl"), concurrency=levels[-1]).run(saver)
+        with open(os.path.join(data_dir, f"export-{levels[-1]}.jsonl"), encoding="utf-8") as f:
+            rows = sum(1 for _ in f)
+    finally:
+        saver.conn.close()
+
+    first, last = runs[0], runs[-1]
+    # LLM 지연 시간이 대부분이므로 동시 처리 수(LLM 동시 호출 한도까지)에 거의 비례해 빨라져야 한다
+    expected_speedup = min(last["concurrency"], LLM_MAX_CONCURRENCY) / min(first["concurrency"], LLM_MAX_CONCURRENCY)
+    speedup = last["applications_per_minute"] / first["applications_per_minute"]
+    checks = {
+        "all_processed": all(run["processed"] == args.sessions and run["failed"] == 0 for run in runs),
+        "throughput_scales": speedup >= expected_speedup * args.min_efficiency,
+        "concurrency_bounded": all(run["peak_llm_in_flight"] <= run["concurrency"] for run in runs),
+        "rerun_skips_done": rerun["processed"] == 0 and rerun["skipped"] == args.sessions and rows == args.sessions,
+    }
+    return {
+        "config": {
+            "sessions": args.sessions,
+            "concurrency": levels,
+            "latency_ms": args.latency_ms,
+            "llm_max_concurrency": LLM_MAX_CONCURRENCY,
+            "min_efficiency": args.min_efficiency,
+            "python": sys.version.split()[0],
+        },
+        "runs": runs,
+        "speedup": round(speedup, 2),
+        "expected_speedup": round(expected_speedup, 2),
+        "rerun": {"processed": rerun["processed"], "skipped": rerun["skipped"]},
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("지원서 일괄 재생성의 동시 처리 수별 처리량을 측정합니다.")
+    parser.add_argument("--sessions", type=int, default=64, help="대화를 마친 세션 수")
+    parser.add_argument("--concurrency", default="1,4,16,32", help="쉼표로 구분한 동시 처리 수 단계")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="LLM 호출 지연 시간(평균, ms)")
+    parser.add_argument("--min-efficiency", type=float, default=0.5,
+                        help="가장 큰 동시 처리 수에서 기대 배율 대비 최소 처리량 비율")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="mars-batch-export-")
+    try:
+        result = _harness.run(lambda args: run_benchmark(args, data_dir), args)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
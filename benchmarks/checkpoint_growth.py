@@ -0,0 +1,157 @@
+"""대화가 10, 100, 1000턴으로 길어져도 체크포인트 크기와 턴 지연 시간이 일정한지 확인한다.
+
+가짜 LLM(지연 없음)으로 그래프를 직접 실행해 대화 하나를 자기소개/포지션/지원 동기까지 진행한 뒤 Q&A 질문을 --turns 의
+가장 큰 값만큼 보내고, 각 단계(--turns)에 도달할 때마다 아래 값을 기록한다.
+- qa_questions, qa_summary_chars: 최근 Q&A 질문 기록 수와 기록에서 밀려난 질문을 모은 요약의 글자 수
+- checkpoint_bytes: 최신 체크포인트(모든 채널 값 포함)를 저장소의 serde로 직렬화한 크기
+- sqlite_bytes: SQLiteSaver 파일에 남아 있는 이 세션의 체크포인트/채널 blob 크기 합
+- turn_ms, put_us: 직전 --window 턴의 턴 처리 시간(ms)과 턴마다 체크포인트 저장(put)에 쓴 시간(µs)
+확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.checkpoint_growth --turns 10,100,1000
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks import _harness
+
+_harness.setup_env(
+    # Q&A 질문이 모두 LLM 체인을 거치도록 답변 캐시는 끈다
+    ANSWER_CACHE_THRESHOLD="1.01",
+)
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from app.bot.checkpointer import SQLiteSaver  # noqa: E402
+from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm  # noqa: E402
+from benchmarks.load_test import QUESTIONS, summarize  # noqa: E402
+
+SETUP = [
+    "안녕하세요 저는 김마스이고 23살, 컴퓨터공학과예요.",
+    "백엔드요",
+    "같이 프로젝트를 해 볼 사람들이 필요해서 지원하게 되었습니다.",
+]
+
+
+class TimedSQLiteSaver(SQLiteSaver):
+    """put 시간을 기록하는 SQLiteSaver."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.put_us = []
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        started = time.perf_counter()
+        try:
+            return super().put(config, checkpoint, metadata, new_versions)
+        finally:
+            self.put_us.append((time.perf_counter() - started) * 1_000_000)
+
+
+def checkpoint_bytes(saver, config):
+    checkpoint = saver.get_tuple(config).checkpoint
+    return len(saver.serde.dumps_typed(checkpoint)[1])
+
+
+def sqlite_bytes(saver, thread_id):
+    with saver._lock:
+        row = saver.conn.execute("""
+            SELECT (SELECT COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0) FROM checkpoints WHERE thread_id = ?)
+                 + (SELECT COALESCE(SUM(LENGTH(blob)), 0) FROM blobs WHERE thread_id = ?)
+                 + (SELECT COALESCE(SUM(LENGTH(blob)), 0) FROM writes WHERE thread_id = ?)
+        """, (thread_id, thread_id, thread_id)).fetchone()
+    return row[0]
+
+
+async def run_benchmark(args):
+    from app.main import app as fastapi_app, lifespan
+    from app.bot.graph import create_app
+    from app.config import MESSAGE_WINDOW, QA_LOG_MAX, QA_SUMMARY_MAX_CHARS
+
+    install_fake_llm(FakeChatModel(latency=LatencyModel(0, "fixed"), seed=args.seed))
+    milestones = sorted(int(turns) for turns in args.turns.split(","))
+    data_dir = tempfile.mkdtemp(prefix="mars-checkpoint-growth-")
+    saver = TimedSQLiteSaver(os.path.join(data_dir, "sessions.db"))
+    steps = []
+    try:
+        async with lifespan(fastapi_app):
+            graph = create_app(saver)
+            config = {"configurable": {"thread_id": "long-session"}}
+            await graph.ainvoke({}, config=config)
+            for message in SETUP:
+                state = await graph.ainvoke({"messages": [HumanMessage(content=message)]}, config=config)
+            setup_step = state.get("next_question")
+
+            turn_ms, turn_put_us = [], []
+            for turn in range(1, milestones[-1] + 1):
+                question = f"{QUESTIONS[turn % len(QUESTIONS)]} ({turn})"
+                puts = len(saver.put_us)
+                started = time.perf_counter()
+                state = await graph.ainvoke({"messages": [HumanMessage(content=question)]}, config=config)
+                turn_ms.append((time.perf_counter() - started) * 1000)
+                # 한 턴에 put이 여러 번(입력, 노드 실행 후) 일어나므로 턴마다 합친다
+                turn_put_us.append(sum(saver.put_us[puts:]))
+                if turn in milestones:
+                    steps.append({
+                        "turns": turn,
+                        "next_step": state.get("next_question"),
+                        "messages": len(state.get("messages", [])),
+                        "qa_questions": len(state.get("qa_questions", [])),
+                        "qa_summary_chars": len(state.get("qa_summary") or ""),
+                        "checkpoint_bytes": checkpoint_bytes(saver, config),
+                        "sqlite_bytes": sqlite_bytes(saver, "long-session"),
+                        "turn_ms": summarize(turn_ms[-args.window:]),
+                        "put_us": summarize(turn_put_us[-args.window:]),
+                    })
+    finally:
+        saver.conn.close()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    first, last = steps[0], steps[-1]
+    checks = {
+        "reached_qa": setup_step == "qa_session",
+        "still_in_qa": all(step["next_step"] == "qa_session" for step in steps),
+        "messages_windowed": all(step["messages"] <= MESSAGE_WINDOW for step in steps),
+        # QA 기록을 넘긴 질문은 버리지 않고 요약에 모으되, 요약도 최대 글자 수를 넘지 않는다
+        "qa_log_folded": all(
+            step["qa_questions"] == min(step["turns"], QA_LOG_MAX)
+            and (step["turns"] <= QA_LOG_MAX) == (step["qa_summary_chars"] == 0)
+            and step["qa_summary_chars"] <= QA_SUMMARY_MAX_CHARS + len(" 외 다수")
+            for step in steps
+        ),
+        "checkpoint_bytes_flat": last["checkpoint_bytes"] <= first["checkpoint_bytes"] * (1 + args.tolerance),
+        "sqlite_bytes_flat": last["sqlite_bytes"] <= first["sqlite_bytes"] * (1 + args.tolerance),
+        "turn_latency_flat": last["turn_ms"]["p50"] <= first["turn_ms"]["p50"] * (1 + args.tolerance),
+    }
+    return {
+        "config": {
+            "turns": milestones,
+            "window": args.window,
+            "message_window": MESSAGE_WINDOW,
+            "qa_log_max": QA_LOG_MAX,
+            "qa_summary_max_chars": QA_SUMMARY_MAX_CHARS,
+            "tolerance": args.tolerance,
+            "python": sys.version.split()[0],
+        },
+        "steps": steps,
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("대화 길이에 따른 체크포인트 크기와 턴 지연 시간을 측정합니다.")
+    parser.add_argument("--turns", default="10,100,1000", help="쉼표로 구분한 Q&A 턴 수 단계")
+    parser.add_argument("--window", type=int, default=10, help="단계마다 지연 시간을 요약할 직전 턴 수")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="첫 단계보다 늘어나도 되는 비율 (크기, 지연 시간)")
+    args = parser.parse_args()
+
+    result = _harness.run(run_benchmark, args)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
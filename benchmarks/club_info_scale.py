@@ -0,0 +1,152 @@
+"""동아리 정보 파일이 10배, 100배로 커질 때 Q&A 턴의 프롬프트 토큰 수와 지연 시간을 측정한다.
+
+mars_info.json에 기수별 프로젝트, 일정, FAQ 항목을 덧붙여 파일 크기를 --scales 배로 늘린 뒤 두 방식을 비교한다.
+- full: 동아리 정보 전체를 시스템 프롬프트에 넣는다 (RETRIEVAL_TOP_K=0)
+- retrieval: 질문과 관련된 청크 --top-k 개만 넣는다 (RETRIEVAL_TOP_K)
+Q&A 턴마다 프롬프트 토큰 수(글자 수 ÷ 2로 추정), 청크 검색과 프롬프트 준비 시간(µs), Q&A 체인 호출 시간(ms)을 잰다.
+가짜 LLM은 --latency-ms 에 프롬프트 토큰 1000개마다 --prefill-ms-per-1k 를 더한 만큼 걸린다.
+확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.club_info_scale --scales 1,10,100 --latency-ms 300
+"""
+import json
+import sys
+import time
+
+from benchmarks import _harness
+
+_harness.setup_env()
+
+from benchmarks.fake_llm import FakeChatModel, LatencyModel  # noqa: E402
+from benchmarks.load_test import summarize  # noqa: E402
+from benchmarks.prompt_cost import conversation, estimate_tokens, split_prompt  # noqa: E402
+
+TOPICS = ("웹 서비스", "모바일 앱", "Unity 게임", "데이터 분석", "AI 챗봇", "사내 도구")
+
+
+def grow_club_info(club_info, scale):
+    """기수별 프로젝트/일정/FAQ를 덧붙여 JSON 크기가 원래의 scale배 이상이 되게 만든다."""
+    grown = json.loads(json.dumps(club_info))
+    if scale <= 1:
+        return grown
+    target = len(json.dumps(club_info, ensure_ascii=False).encode("utf-8")) * scale
+    grown.setdefault("cohortProjects", [])
+    grown.setdefault("schedule", [])
+    cohort = 0
+    while len(json.dumps(grown, ensure_ascii=False).encode("utf-8")) < target:
+        cohort += 1
+        topic = TOPICS[cohort % len(TOPICS)]
+        grown["cohortProjects"].append({
+            "name": f"{cohort}기 {topic} 프로젝트",
+            "description": f"{cohort}기 멤버 {cohort % 5 + 3}명이 {topic}을(를) 기획부터 배포까지 진행했습니다. "
+                           f"매주 진행 상황을 공유하고 마스터의 코드 리뷰를 받았습니다.",
+        })
+        grown["schedule"].append(
+            f"{cohort}기 {cohort % 12 + 1}월: 오리엔테이션, {topic} 스터디, 중간 발표, 최종 발표 및 회고"
+        )
+        grown["faq"].append({
+            "question": f"{cohort}기 {topic} 프로젝트에는 어떤 기술을 썼나요?",
+            "answer": f"{cohort}기는 팀마다 기술을 정했고, {topic} 프로젝트는 마스터와 상의해 스택을 골랐습니다.",
+        })
+    return grown
+
+
+async def measure(registry, club, histories, repeat):
+    """Q&A 턴마다 (프롬프트 토큰 수, 검색+프롬프트 준비 µs, 체인 호출 ms)를 잰다."""
+    chain = registry.qa_chain(club)
+    tokens, prepare_us, latencies = [], [], []
+    for _ in range(repeat):
+        for history in histories:
+            started = time.perf_counter()
+            qa_input = registry.qa_input(history, club)
+            prompt = chain.bound.first.invoke(qa_input)
+            prepare_us.append((time.perf_counter() - started) * 1_000_000)
+            tokens.append(estimate_tokens("".join(split_prompt(prompt, 0))))
+
+            started = time.perf_counter()
+            await chain.ainvoke(registry.qa_input(history, club))
+            latencies.append((time.perf_counter() - started) * 1000)
+    return tokens, prepare_us, latencies
+
+
+async def run_benchmark(args):
+    from app.bot.prompts import PromptRegistry
+    from app.bot.llm_client import LazyLLM
+    from app.club import build_club_context, club_config
+
+    fake = FakeChatModel(latency=LatencyModel(args.latency_ms, "fixed"), prefill_ms_per_1k_tokens=args.prefill_ms_per_1k)
+    llm = LazyLLM(lambda: fake)
+    llm.get()
+    base_info = dict(club_config.current().info)
+    histories = conversation(args.turns)
+    scales = [int(scale) for scale in args.scales.split(",")]
+
+    results = []
+    for scale in scales:
+        raw = json.dumps(grow_club_info(base_info, scale), ensure_ascii=False).encode("utf-8")
+        club = build_club_context(raw)
+        step = {"scale": scale, "file_bytes": len(raw)}
+        for mode, top_k in (("full", 0), ("retrieval", args.top_k)):
+            registry = PromptRegistry(llm, retrieval_top_k=top_k)
+            started = time.perf_counter()
+            registry.warm(club)
+            build_ms = (time.perf_counter() - started) * 1000
+            tokens, prepare_us, latencies = await measure(registry, club, histories, args.repeat)
+            step[mode] = {
+                "build_ms": round(build_ms, 2),
+                "prompt_tokens": summarize(tokens),
+                "prepare_us": summarize(prepare_us),
+                "latency_ms": summarize(latencies),
+            }
+        results.append(step)
+
+    base, largest = results[0], results[-1]
+    checks = {
+        # 벤치마크가 실제로 파일을 키웠는지 (전체를 넣는 방식의 토큰 수가 파일 크기만큼 늘어야 한다)
+        "full_tokens_grow_with_file": largest["full"]["prompt_tokens"]["mean"]
+        >= base["full"]["prompt_tokens"]["mean"] * largest["scale"] / base["scale"] / 2,
+        # 검색을 쓰면 파일이 커져도 프롬프트는 상위 청크 수만큼만 커진다
+        "retrieval_tokens_bounded": largest["retrieval"]["prompt_tokens"]["max"]
+        <= base["retrieval"]["prompt_tokens"]["max"] * (1 + args.max_token_growth),
+        "retrieval_prepare_fast": all(
+            step["retrieval"]["prepare_us"]["p95"] <= args.max_prepare_ms * 1000 for step in results
+        ),
+        "retrieval_faster_when_grown": all(
+            step["retrieval"]["latency_ms"]["p50"] < step["full"]["latency_ms"]["p50"]
+            for step in results if step["scale"] > 1
+        ),
+    }
+    return {
+        "config": {
+            "scales": scales,
+            "top_k": args.top_k,
+            "turns": args.turns,
+            "repeat": args.repeat,
+            "latency_ms": args.latency_ms,
+            "prefill_ms_per_1k": args.prefill_ms_per_1k,
+            "python": sys.version.split()[0],
+        },
+        "steps": results,
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("동아리 정보 파일 크기에 따른 Q&A 프롬프트 토큰 수와 지연 시간을 측정합니다.")
+    parser.add_argument("--scales", default="1,10,100", help="쉼표로 구분한 파일 크기 배율 (첫 값이 기준)")
+    parser.add_argument("--top-k", type=int, default=4, help="retrieval 방식에서 고를 청크 수")
+    parser.add_argument("--turns", type=int, default=6, help="배율/방식마다 진행할 Q&A 턴 수")
+    parser.add_argument("--repeat", type=int, default=2, help="Q&A 턴 목록을 반복할 횟수")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="프롬프트 크기와 관계없는 LLM 호출 지연 시간(ms)")
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=20.0, help="프롬프트 토큰 1000개마다 더할 지연 시간(ms)")
+    parser.add_argument("--max-token-growth", type=float, default=1.0, help="retrieval 프롬프트 토큰이 기준보다 늘어도 되는 비율")
+    parser.add_argument("--max-prepare-ms", type=float, default=50.0, help="retrieval의 검색+프롬프트 준비에 허용할 p95(ms)")
+    args = parser.parse_args()
+
+    result = _harness.run(run_benchmark, args)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""대화가 진행되는 동안 동아리 정보 파일이 계속 바뀌어도(잘못된 내용 포함) 서버가 멈추지 않는지 확인한다.
+
+mars_info.json을 임시 파일(CLUB_INFO_PATH)로 복사하고 CLUB_INFO_POLL_SECONDS(기본 0.01초) 간격으로 감시하게 한 뒤,
+--sessions 개의 대화를 진행하는 동안 --write-ms 간격으로 파일을 아래 내용으로 번갈아 덮어쓴다.
+- 올바른 정보 (동아리 이름만 다른 여러 버전)
+- 잘못된 정보: 깨진 JSON, UTF-8이 아닌 바이트, 최상위가 리스트([1, 2]), 값의 타입이 다른 객체({"positions": [1, 2]}) 등
+또 --listener-error-every 번째 갱신마다 오류를 내는 리스너를 등록해, 리스너 오류도 기존 스냅샷을 유지하는지 본다.
+진행 중 current()가 항상 올바른 버전의 스냅샷을 돌려주는지, 모든 대화가 끝나는지, 감시 태스크가 살아 있는지,
+마지막에 쓴 올바른 정보로 답변 캐시까지 맞춰지는지를 JSON으로 출력한다. 확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.club_reload --sessions 50 --write-ms 20
+"""
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks import _harness
+
+# app을 불러오기 전에 설정해야 하는 값. 모든 요청이 같은 주소(ASGI transport)에서 오므로 빈도 제한은 끈다
+DATA_DIR = tempfile.mkdtemp(prefix="mars-club-reload-")
+CLUB_PATH = os.path.join(DATA_DIR, "mars_info.json")
+shutil.copyfile(os.environ.get("CLUB_INFO_PATH", "./mars_info.json"), CLUB_PATH)
+os.environ["CLUB_INFO_PATH"] = CLUB_PATH
+_harness.setup_env(
+    CLUB_INFO_POLL_SECONDS="0.01",
+    IP_RATE_PER_SECOND="0",
+    SESSION_RATE_PER_SECOND="0",
+)
+
+import httpx  # noqa: E402
+
+from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm  # noqa: E402
+from benchmarks.load_test import LoadRunner, build_script  # noqa: E402
+
+MALFORMED = {
+    "truncated_json": lambda raw: raw[:len(raw) // 2],
+    "not_utf8": lambda raw: b"\xff\xfe" + raw,
+    "top_level_list": lambda raw: b"[1, 2]",
+    "positions_not_strings": lambda raw: json.dumps({"positions": [1, 2]}).encode("utf-8"),
+    "faq_not_objects": lambda raw: json.dumps({**json.loads(raw), "faq": [1, 2]}).encode("utf-8"),
+    "empty": lambda raw: b"",
+}
+
+
+class FileWriter:
+    """CLUB_PATH를 올바른 버전과 잘못된 내용으로 번갈아 덮어쓴다."""
+
+    def __init__(self, base_raw, rng):
+        self.base = json.loads(base_raw)
+        self.base_raw = base_raw
+        self.rng = rng
+        self.valid_versions = set()
+        self.writes = {"valid": 0, **{kind: 0 for kind in MALFORMED}}
+        self._mtime_ns = time.time_ns()
+
+    def write(self, raw):
+        with open(CLUB_PATH, "wb") as f:
+            f.write(raw)
+        # 같은 크기의 파일을 같은 시각에 다시 써도 감시 쪽에서 바뀐 것을 알 수 있도록 mtime을 계속 늘린다
+        self._mtime_ns += 1_000_000
+        os.utime(CLUB_PATH, ns=(self._mtime_ns, self._mtime_ns))
+
+    def write_valid(self, index):
+        from app.club import build_club_context
+
+        raw = json.dumps({**self.base, "clubName": f"{self.base['clubName']} v{index}"}, ensure_ascii=False).encode("utf-8")
+        self.valid_versions.add(build_club_context(raw).version)
+        self.writes["valid"] += 1
+        self.write(raw)
+        return raw
+
+    def write_random(self, index):
+        if self.rng.random() < 0.5:
+            return self.write_valid(index)
+        kind = self.rng.choice(sorted(MALFORMED))
+        self.writes[kind] += 1
+        self.write(MALFORMED[kind](self.base_raw))
+        return None
+
+
+async def run_scenario(args):
+    from app.main import app as fastapi_app, lifespan
+    from app.bot import nodes
+    from app.club import build_club_context, club_config, ClubContext
+
+    install_fake_llm(FakeChatModel(latency=LatencyModel(args.latency_ms, "uniform"), seed=args.seed))
+    rng = random.Random(args.seed)
+    with open(CLUB_PATH, "rb") as f:
+        base_raw = f.read()
+    writer = FileWriter(base_raw, rng)
+    writer.valid_versions.add(build_club_context(base_raw).version)
+
+    notified = 0
+    listener_errors = 0
+
+    def flaky_listener(club):
+        nonlocal notified, listener_errors
+        notified += 1
+        if args.listener_error_every and notified % args.listener_error_every == 0:
+            listener_errors += 1
+            raise RuntimeError("리스너 오류 (벤치마크에서 일부러 발생)")
+
+    club_config.subscribe(flaky_listener)
+
+    invalid_snapshots = 0
+    samples = 0
+    done = asyncio.Event()
+
+    async def write_loop():
+        index = 0
+        while not done.is_set():
+            index += 1
+            writer.write_random(index)
+            await asyncio.sleep(args.write_ms / 1000)
+
+    async def sample_loop():
+        nonlocal invalid_snapshots, samples
+        while not done.is_set():
+            club = club_config.current()
+            samples += 1
+            if not isinstance(club, ClubContext) or club.version not in writer.valid_versions:
+                invalid_snapshots += 1
+            await asyncio.sleep(0.001)
+
+    transport = httpx.ASGITransport(app=fastapi_app)
+    async with lifespan(fastapi_app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            while (await client.get("/readyz")).status_code != 200:
+                await asyncio.sleep(0.01)
+            runner = LoadRunner(client, poll_interval=args.poll_ms / 1000)
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def limited(script):
+                async with semaphore:
+                    await runner.run_session(script)
+
+            background = [asyncio.create_task(write_loop()), asyncio.create_task(sample_loop())]
+            started = time.perf_counter()
+            await asyncio.gather(*(limited(build_script(rng, args.max_questions)) for _ in range(args.sessions)))
+            elapsed = time.perf_counter() - started
+            done.set()
+            await asyncio.gather(*background)
+
+            # 마지막으로 올바른 정보를 쓰고, 리스너 오류가 나지 않는 갱신이 반영될 때까지 기다린다
+            final_version = None
+            deadline = time.perf_counter() + args.settle_seconds
+            index = 10 ** 6
+            while time.perf_counter() < deadline:
+                index += 1
+                final_version = build_club_context(writer.write_valid(index)).version
+                await asyncio.sleep(args.poll_ms / 1000 * 5)
+                if club_config.current().version == final_version:
+                    break
+
+            stats = club_config.stats()
+            watcher_alive = club_config._task is not None and not club_config._task.done()
+            cache_version = nodes.answer_cache.get(club_config.current().tenant_id).version
+            ready = (await client.get("/readyz")).status_code
+
+    checks = {
+        "all_sessions_completed": runner.completed == args.sessions and runner.failed == 0,
+        "snapshot_always_valid": invalid_snapshots == 0 and samples > 0,
+        "malformed_files_rejected": stats["reload_errors"] > 0,
+        "reloaded_while_serving": stats["reloads"] > 0,
+        "listener_errors_survived": listener_errors > 0 or not args.listener_error_every,
+        "watcher_alive": watcher_alive,
+        "final_version_applied": club_config.current().version == final_version,
+        "answer_cache_in_sync": cache_version == final_version,
+        "ready_after_reloads": ready == 200,
+    }
+    return {
+        "config": {
+            "sessions": args.sessions,
+            "concurrency": args.concurrency,
+            "write_ms": args.write_ms,
+            "poll_seconds": club_config.poll_interval,
+            "listener_error_every": args.listener_error_every,
+            "latency_ms": args.latency_ms,
+            "python": sys.version.split()[0],
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "sessions_completed": runner.completed,
+        "sessions_failed": runner.failed,
+        "status_codes": dict(runner.status_codes),
+        "writes": writer.writes,
+        "club_info": stats,
+        "listener_errors": listener_errors,
+        "snapshot_samples": samples,
+        "invalid_snapshots": invalid_snapshots,
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("동아리 정보 파일이 계속 바뀌는 동안 대화가 끊기지 않는지 확인합니다.")
+    parser.add_argument("--sessions", type=int, default=50, help="진행할 대화 수")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시에 진행할 대화 수")
+    parser.add_argument("--write-ms", type=float, default=20.0, help="파일을 덮어쓰는 간격(ms)")
+    parser.add_argument("--listener-error-every", type=int, default=3, help="이 횟수마다 리스너가 오류를 낸다 (0이면 사용 안 함)")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="LLM 호출 지연 시간(평균, ms)")
+    parser.add_argument("--max-questions", type=int, default=3, help="대화당 최대 Q&A 질문 수")
+    parser.add_argument("--poll-ms", type=float, default=50.0, help="/chat/status 폴링 간격(ms)")
+    parser.add_argument("--settle-seconds", type=float, default=5.0, help="마지막 정보가 반영되기를 기다릴 최대 시간(초)")
+    args = parser.parse_args()
+
+    try:
+        result = _harness.run(run_scenario, args)
+    finally:
+        shutil.rmtree(DATA_DIR, ignore_errors=True)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""정답을 붙인 자기소개/포지션 메시지로 로컬 추출(정규식, 동의어 사전)의 필드별 정밀도와 LLM 호출 비용을 측정한다.
+
+1. 정확도: extract_user_info / extract_positions가 로컬에서 채운 값만 보고 필드별로
+   - precision: 로컬에서 채운 값 중 정답과 같은 비율 (틀린 값은 LLM이 고칠 기회 없이 그대로 저장될 수 있으므로 가장 중요)
+   - coverage: 정답이 있는 메시지 중 로컬에서 맞게 채운 비율 (나머지는 LLM이 채운다)
+   을 잰다. 이름은 확실한 형태("이름은 X", 메시지 첫머리의 "X입니다")만 로컬에서 채우므로 coverage가 낮은 것이 정상이다.
+2. 비용: 가짜 LLM(--latency-ms)으로 process_introduction / process_position 노드를 실행해 메시지당 LLM 호출 수와
+   평균 처리 시간을, 모든 메시지를 LLM으로 추출할 때(llm_only)와 비교한다.
+확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.extraction_corpus --latency-ms 300
+"""
+import random
+import sys
+import time
+
+from benchmarks import _harness
+
+_harness.setup_env()
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+
+from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm  # noqa: E402
+from benchmarks.load_test import summarize  # noqa: E402
+
+CLUB_POSITIONS = "PLANNING, DESIGN, FRONTEND, BACKEND, AI"
+
+# (메시지, {필드: 정답}). 정답에 없는 필드는 메시지에 나오지 않는 값 (None)
+INTRODUCTIONS = [
+    ("안녕하세요 저는 홍길동이고 23살, 컴퓨터공학과예요.", {"name": "홍길동", "department": "컴퓨터공학과", "age": "23"}),
+    ("홍길동입니다. 컴퓨터공학과 23살이에요", {"name": "홍길동", "department": "컴퓨터공학과", "age": "23"}),
+    ("안녕하세요! 김마스라고 합니다. 010-1234-5678", {"name": "김마스", "phone_number": "010-1234-5678"}),
+    ("제 이름은 이영희예요, 전자공학과 21학번입니다", {"name": "이영희", "department": "전자공학과", "age": "21학번"}),
+    ("이름은 박민수, 소프트웨어학과 25살", {"name": "박민수", "department": "소프트웨어학과", "age": "25"}),
+    ("저는 최지훈입니다 정보통신공학과 졸업했어요", {"name": "최지훈", "department": "정보통신공학과"}),
+    ("안녕 나는 정수아야 경영학과 22살", {"name": "정수아", "department": "경영학과", "age": "22"}),
+    ("전 한도윤이에요 01098765432", {"name": "한도윤", "phone_number": "010-9876-5432"}),
+    ("저는컴퓨터공학과 23살입니다", {"department": "컴퓨터공학과", "age": "23"}),
+    ("저는 컴공 3학년이에요", {}),
+    ("저는 그냥 개발 좋아하는 사람이에요", {}),
+    ("저는 서울에 살고 있어요 24살", {"age": "24"}),
+    ("저는 열심히 하는 사람입니다", {}),
+    ("저는 디자인 전공이에요", {}),
+    ("난 백엔드 개발자야 27살", {"age": "27"}),
+    ("저는 졸업생이고 현직 개발자입니다", {}),
+    ("컴퓨터공학과 졸업예정입니다", {"department": "컴퓨터공학과"}),
+    ("전자공학과 25살 최지훈입니다", {"name": "최지훈", "department": "전자공학과", "age": "25"}),
+    ("저는 동양미래대 기계공학부 재학생이에요", {"department": "기계공학부"}),
+    ("23살 취준생입니다 연락처는 010-5555-1234", {"age": "23", "phone_number": "010-5555-1234"}),
+    ("안녕하세요 반갑습니다 저는 오세훈이라고 합니다", {"name": "오세훈"}),
+    ("반가워요 저는 산업디자인학과 다니는 윤서연이에요", {"name": "윤서연", "department": "산업디자인학과"}),
+    ("이름은 강하늘이고 나이는 26세입니다", {"name": "강하늘", "age": "26"}),
+    ("저 신입입니다 잘 부탁드려요", {}),
+    ("여기 지원하려고 왔어요 010 2222 3333", {"phone_number": "010-2222-3333"}),
+    ("저는 통계학과 3학년 임채원입니다", {"name": "임채원", "department": "통계학과"}),
+    ("나는 처음 와봐요 잘 부탁해요", {}),
+    ("디자이너로 일하고 있는 송지아입니다 28살", {"name": "송지아", "age": "28"}),
+    ("저는 AI 전공자예요 컴퓨터소프트웨어전공", {"department": "컴퓨터소프트웨어전공"}),
+    ("안녕하세요 저는 문예린입니다 010-4321-8765 시각디자인학과", {"name": "문예린", "department": "시각디자인학과", "phone_number": "010-4321-8765"}),
+    ("저는 비전공자예요", {}),
+    ("비전공자인데 경영학과 다니고 있어요", {"department": "경영학과"}),
+    ("컴퓨터공학과 부전공 중인 25살입니다", {"department": "컴퓨터공학과", "age": "25"}),
+]
+
+# (메시지, 정답 포지션 목록)
+POSITION_MESSAGES = [
+    ("백엔드요", ["BACKEND"]),
+    ("프론트엔드 하고 싶어요", ["FRONTEND"]),
+    ("프론트 말고 백엔드", ["BACKEND"]),
+    ("기획은 별로고 백엔드 하고 싶어요", ["BACKEND"]),
+    ("디자인이랑 AI요", ["DESIGN", "AI"]),
+    ("fe, be 둘 다 관심 있어요", ["FRONTEND", "BACKEND"]),
+    ("서버 개발이요", ["BACKEND"]),
+    ("백엔드 말고도 프론트도 관심 있어요", ["FRONTEND", "BACKEND"]),
+    ("UI/UX 디자인이요", ["DESIGN"]),
+    ("머신러닝 쪽이요", ["AI"]),
+    ("PM 해보고 싶어요", ["PLANNING"]),
+    ("프론트엔드는 관심 없고 AI 할래요", ["AI"]),
+    ("디자인 빼고 다 좋아요", []),
+    ("아직 잘 모르겠어요", []),
+    ("개발 쪽이면 다 좋아요", []),
+    ("기획 아니고 프론트요", ["FRONTEND"]),
+    ("인공지능이랑 백엔드", ["BACKEND", "AI"]),
+    ("react로 웹 프론트 해봤어요", ["FRONTEND"]),
+    ("backend", ["BACKEND"]),
+    ("AI는 싫고 디자인이요", ["DESIGN"]),
+    ("fe 개발자, be 개발자 둘 다요", ["FRONTEND", "BACKEND"]),
+    ("pm 포지션이요", ["PLANNING"]),
+    ("ML 엔지니어 쪽이요", ["AI"]),
+    # 일반 영어 문장 속 짧은 단어(be, pm, planning, back)를 포지션으로 잡으면 안 되는 경우
+    ("I want to be a designer", ["DESIGN"]),
+    ("meeting at 3pm, frontend please", ["FRONTEND"]),
+    ("I'm planning to apply next week", []),
+    ("I'll be back after the exam", []),
+    ("maybe po or pm, not sure", []),
+]
+
+
+def field_scores(pairs):
+    """pairs: (로컬 값, 정답) 목록 → precision/coverage."""
+    filled = [(value, answer) for value, answer in pairs if value is not None]
+    correct = sum(1 for value, answer in filled if value == answer)
+    labelled = sum(1 for _, answer in pairs if answer is not None)
+    return {
+        "filled": len(filled),
+        "correct": correct,
+        "labelled": labelled,
+        "precision": round(correct / len(filled), 3) if filled else None,
+        "coverage": round(correct / labelled, 3) if labelled else None,
+    }
+
+
+def accuracy_report():
+    from app.bot.extraction import USER_INFO_FIELDS, extract_user_info, extract_positions
+
+    per_field = {field: [] for field in USER_INFO_FIELDS}
+    wrong = []
+    for message, labels in INTRODUCTIONS:
+        info, _ = extract_user_info(message)
+        for field in USER_INFO_FIELDS:
+            value = getattr(info, field)
+            per_field[field].append((value, labels.get(field)))
+            if value is not None and value != labels.get(field):
+                wrong.append({"message": message, "field": field, "local": value, "expected": labels.get(field)})
+
+    position_pairs = []
+    for message, expected in POSITION_MESSAGES:
+        found = extract_positions(message, CLUB_POSITIONS)
+        # 아무것도 찾지 못하면 LLM이 판단하므로 로컬에서는 채우지 않은 것으로 본다
+        position_pairs.append((sorted(found) or None, sorted(expected) or None))
+        if found and sorted(found) != sorted(expected):
+            wrong.append({"message": message, "field": "positions", "local": found, "expected": expected})
+
+    report = {field: field_scores(pairs) for field, pairs in per_field.items()}
+    report["positions"] = field_scores(position_pairs)
+    return report, wrong
+
+
+async def cost_report(args):
+    from app.bot import nodes
+
+    fake = install_fake_llm(FakeChatModel(
+        latency=LatencyModel(args.latency_ms, "uniform", rng=random.Random(args.seed)), seed=args.seed,
+    ))
+
+    async def run_node(node, message):
+        state = {"messages": [AIMessage(content="질문"), HumanMessage(content=message)]}
+        calls = sum(fake.calls.values())
+        started = time.perf_counter()
+        await node(state)
+        return (time.perf_counter() - started) * 1000, sum(fake.calls.values()) - calls
+
+    report = {}
+    for name, node, corpus in (
+        ("introduction", nodes.process_introduction, [message for message, _ in INTRODUCTIONS]),
+        ("position", nodes.process_position, [message for message, _ in POSITION_MESSAGES]),
+    ):
+        latencies, calls = [], 0
+        for message in corpus:
+            elapsed, used = await run_node(node, message)
+            latencies.append(elapsed)
+            calls += used
+        report[name] = {
+            "messages": len(corpus),
+            "llm_calls": calls,
+            "llm_call_rate": round(calls / len(corpus), 3),
+            "latency_ms": summarize(latencies),
+            # 예전처럼 메시지마다 LLM을 한 번씩 부를 때의 평균 (가짜 LLM 지연 시간의 평균)
+            "llm_only_mean_ms": args.latency_ms,
+        }
+    return report
+
+
+async def run_benchmark(args):
+    accuracy, wrong = accuracy_report()
+    cost = await cost_report(args)
+    checks = {
+        f"{field}_precise": scores["precision"] is None or scores["precision"] >= args.min_precision
+        for field, scores in accuracy.items()
+    }
+    checks["fewer_llm_calls"] = all(report["llm_call_rate"] < 1 for report in cost.values())
+    return {
+        "config": {
+            "introductions": len(INTRODUCTIONS),
+            "position_messages": len(POSITION_MESSAGES),
+            "latency_ms": args.latency_ms,
+            "min_precision": args.min_precision,
+            "python": sys.version.split()[0],
+        },
+        "accuracy": accuracy,
+        "wrong": wrong,
+        "cost": cost,
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("로컬 추출의 필드별 정밀도와 LLM 호출 비용을 측정합니다.")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="LLM 추출 호출 지연 시간(평균, ms)")
+    parser.add_argument("--min-precision", type=float, default=1.0, help="로컬에서 채운 값의 필드별 최소 정밀도")
+    args = parser.parse_args()
+
+    result = _harness.run(run_benchmark, args)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""벤치마크용 가짜 LLM. Gemini 대신 정해진 지연 시간 분포로 응답하고, 일정 확률로 오류를 낸다.
+
+같은 seed면 호출 순서가 같은 한 지연 시간, 오류 발생 위치, 응답 내용이 매번 같다.
+"""
+import asyncio
+import contextlib
+import random
+import threading
+import time
+from collections import Counter
+from typing import Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+from app.bot.state import UserInfo, PositionInfo, QASessionIntent
+
+DEFAULT_REPLY = (
+    "좋은 질문이야! 우리 동아리는 매주 정기 모임에서 프로젝트 진행 상황을 공유하고, "
+    "포지션별 스터디와 해커톤도 함께 하고 있어. 더 궁금한 게 있으면 편하게 물어봐!"
+)
+_END_WORDS = ("종료", "그만", "끝", "됐어", "지원서 생성")
+
+
+class FakeLLMError(RuntimeError):
+    """error_rate 확률로, 또는 outage="error"일 때 일부러 발생시키는 오류. 503처럼 재시도 가능한 오류로 분류된다."""
+
+    code = 503
+
+
+class LatencyModel:
+    """호출 한 번의 지연 시간(초)을 뽑는다.
+
+    dist: fixed(항상 mean_ms), uniform(mean_ms의 0.5~1.5배), lognormal(중앙값 mean_ms, 꼬리가 긴 분포)
+    """
+
+    def __init__(self, mean_ms=200.0, dist="lognormal", sigma=0.5, rng=None):
+        if dist not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"지원하지 않는 지연 시간 분포입니다: {dist}")
+        self.mean_ms = mean_ms
+        self.dist = dist
+        self.sigma = sigma
+        self.rng = rng or random.Random(0)
+
+    def sample(self):
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.dist == "fixed":
+            ms = self.mean_ms
+        elif self.dist == "uniform":
+            ms = self.rng.uniform(self.mean_ms * 0.5, self.mean_ms * 1.5)
+        else:
+            ms = self.mean_ms * self.rng.lognormvariate(0.0, self.sigma)
+        return ms / 1000
+
+
+def _last_text(llm_input):
+    if isinstance(llm_input, str):
+        return llm_input
+    if isinstance(llm_input, BaseMessage):
+        return str(llm_input.content)
+    if isinstance(llm_input, (list, tuple)) and llm_input:
+        return _last_text(llm_input[-1])
+    if hasattr(llm_input, "to_messages"):
+        return _last_text(llm_input.to_messages())
+    return str(llm_input)
+
+
+def structured_response(schema, text):
+    """구조화 출력 스키마별로 그럴듯한 응답을 만든다."""
+    if schema is UserInfo:
+        return UserInfo(name="김마스", department="컴퓨터공학과", age="23", phone_number=None)
+    if schema is PositionInfo:
+        return PositionInfo(positions=["BACKEND"])
+    if schema is QASessionIntent:
+        # 분류 프롬프트에 들어간 사용자 메시지 부분만 본다
+        message = text.split("\n", 1)[0]
+        ended = any(word in message for word in _END_WORDS)
+        return QASessionIntent(intent="end_chat" if ended else "continue_chat")
+    raise ValueError(f"가짜 LLM이 지원하지 않는 스키마입니다: {schema}")
+
+
+class FakeChatModel(BaseChatModel):
+    """ChatGoogleGenerativeAI 자리에 넣는 가짜 채팅 모델.
+
+    - 일반 호출/스트리밍: reply를 chunk_size 글자씩 나눠 보낸다 (첫 토큰까지 지연의 30%, 나머지는 나눠서)
+    - prefill_ms_per_1k_tokens: 프롬프트 토큰 1000개마다 더하는 지연 시간 (긴 프롬프트일수록 첫 토큰이 늦어지는 것을 흉내)
+    - 동기 호출(invoke)은 지연 시간 동안 스레드를 붙잡는다 (노드가 동기 함수이던 때와 비교할 때 사용)
+    - with_structured_output: UserInfo/PositionInfo/QASessionIntent 응답
+    - outage: None(정상), "error"(모든 호출 즉시 실패), "hang"(취소될 때까지 응답 없음),
+      "mid_stream"(스트리밍 호출이 첫 조각을 보낸 뒤 실패)
+    - calls: 호출 종류별 횟수, errors: 일부러 낸 오류 수, peak_in_flight: 동시에 진행된 최대 호출 수
+    """
+
+    latency: Any = None
+    error_rate: float = 0.0
+    reply: str = DEFAULT_REPLY
+    chunk_size: int = 8
+    rng: Any = None
+    calls: Any = None
+    errors: int = 0
+    outage: Any = None
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    lock: Any = None
+    prefill_ms_per_1k_tokens: float = 0.0
+
+    def __init__(self, latency=None, error_rate=0.0, seed=0, **kwargs):
+        rng = random.Random(seed)
+        super().__init__(
+            latency=latency or LatencyModel(rng=rng),
+            error_rate=error_rate,
+            rng=rng,
+            calls=Counter(),
+            lock=threading.Lock(),
+            **kwargs,
+        )
+
+    @contextlib.contextmanager
+    def _tracked(self):
+        # 동기 호출은 여러 스레드에서 동시에 들어오므로 잠금
+        with self.lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    @property
+    def _llm_type(self):
+        return "fake-benchmark"
+
+    def _maybe_fail(self, kind):
+        self.calls[kind] += 1
+        if self.outage == "error" or (self.error_rate and self.rng.random() < self.error_rate):
+            self.errors += 1
+            raise FakeLLMError(f"가짜 LLM 오류 ({kind})")
+
+    async def _respond_after_latency(self, kind, latency):
+        if self.outage == "hang":
+            self.calls[kind] += 1
+            # 제공자가 응답하지 않는 상황: 호출한 쪽이 취소할 때까지 기다린다
+            await asyncio.Event().wait()
+        with self._tracked():
+            await asyncio.sleep(latency)
+        self._maybe_fail(kind)
+
+    def _prefill_seconds(self, messages):
+        if not self.prefill_ms_per_1k_tokens:
+            return 0.0
+        prompt_chars = sum(len(str(message.content)) for message in messages)
+        return prompt_chars // 2 / 1000 * self.prefill_ms_per_1k_tokens / 1000
+
+    def _result(self, messages):
+        prompt_chars = sum(len(str(message.content)) for message in messages)
+        message = AIMessage(
+            content=self.reply,
+            usage_metadata={
+                "input_tokens": prompt_chars // 2,
+                "output_tokens": len(self.reply) // 2,
+                "total_tokens": prompt_chars // 2 + len(self.reply) // 2,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        with self._tracked():
+            time.sleep(self.latency.sample() + self._prefill_seconds(messages))
+        self._maybe_fail("chat")
+        return self._result(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await self._respond_after_latency("chat", self.latency.sample() + self._prefill_seconds(messages))
+        return self._result(messages)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        total = self.latency.sample()
+        pieces = [self.reply[i:i + self.chunk_size] for i in range(0, len(self.reply), self.chunk_size)]
+        await self._respond_after_latency("chat", total * 0.3 + self._prefill_seconds(messages))
+        for index, piece in enumerate(pieces):
+            if index:
+                await asyncio.sleep(total * 0.7 / max(len(pieces) - 1, 1))
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece))
+            if run_manager:
+                await run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+            if self.outage == "mid_stream":
+                self.errors += 1
+                raise FakeLLMError("가짜 LLM 오류 (스트리밍 도중)")
+
+    def with_structured_output(self, schema, **kwargs):
+        kind = f"structured:{schema.__name__}"
+
+        def respond_blocking(llm_input):
+            with self._tracked():
+                time.sleep(self.latency.sample())
+            self._maybe_fail(kind)
+            return structured_response(schema, _last_text(llm_input))
+
+        async def respond(llm_input):
+            await self._respond_after_latency(kind, self.latency.sample())
+            return structured_response(schema, _last_text(llm_input))
+
+        return RunnableLambda(respond_blocking, afunc=respond, name=kind)
+
+
+def install_fake_llm(fake):
+    """app.bot.nodes의 Gemini 클라이언트와 이를 감싼 체인을 모두 가짜 모델로 바꾼다.
+
+    GOOGLE_API_KEY 등 환경 변수는 app을 처음 불러오기 전에 설정돼 있어야 한다.
+    """
+    from app.bot import nodes
+    from app.club import club_config
+
+    nodes.llm.reset(lambda: fake)
+    nodes.llm.get()
+    nodes.prompt_registry.reset()
+    if club_config.loaded:
+        nodes.prompt_registry.warm(club_config.current())
+    return fake
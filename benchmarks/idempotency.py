@@ -0,0 +1,190 @@
+"""같은 idempotency_key로 /chat/send를 다시 보낼 때 그래프를 다시 실행하지 않는지 확인한다.
+
+1. concurrent_duplicates: 세션마다 같은 메시지를 같은 키로 동시에 여러 번 보냄
+   → 모두 같은 응답, 질문 기록은 한 번만 늘고, LLM 호출 수는 한 번 보낸 것과 같아야 함
+2. sequential_retry: 처리가 끝난 뒤 같은 키로 다시 보냄 → 저장된 응답을 LLM 호출 없이 돌려줘야 함
+3. stream_then_send: 스트리밍 요청을 처리하는 중에 같은 키로 /chat/send → 스트림의 done 응답과 같아야 함
+4. conflict: 같은 키로 다른 메시지 → 422
+5. without_key: 키 없이 같은 메시지를 두 번 → 두 번 모두 처리 (기존 동작 유지)
+확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.idempotency --sessions 20 --duplicates 5
+"""
+import asyncio
+import json
+import time
+from uuid import uuid4
+
+from benchmarks import _harness
+
+# app을 불러오기 전에 설정해야 하는 값. 답변 캐시와 빈도 제한(모든 요청이 같은 주소)은 끈다
+_harness.setup_env(
+    ANSWER_CACHE_THRESHOLD="1.01",
+    IP_RATE_PER_SECOND="0",
+    SESSION_RATE_PER_SECOND="0",
+)
+
+import httpx  # noqa: E402
+
+from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm  # noqa: E402
+from benchmarks.load_test import summarize  # noqa: E402
+from benchmarks.outage import SETUP_MESSAGES, prepare_session  # noqa: E402
+
+QUESTION = "스터디는 어떻게 진행돼?"
+
+
+def replays_served(metrics_text):
+    total = 0.0
+    for line in metrics_text.splitlines():
+        if line.startswith("mars_idempotency_replays_total{"):
+            total += float(line.rsplit(" ", 1)[1])
+    return total
+
+
+def parse_done_event(body):
+    for block in body.split("\n\n"):
+        if block.startswith("event: done"):
+            return json.loads(block.split("data: ", 1)[1])
+    return None
+
+
+async def run_scenario(args):
+    from app.main import app as fastapi_app, lifespan
+
+    fake = install_fake_llm(FakeChatModel(latency=LatencyModel(args.latency_ms, "uniform"), seed=args.seed))
+    phases = {}
+
+    transport = httpx.ASGITransport(app=fastapi_app)
+    async with lifespan(fastapi_app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            langgraph_app = fastapi_app.state.langgraph_app
+
+            async def qa_count(session_id):
+                state = await langgraph_app.aget_state({"configurable": {"thread_id": session_id}})
+                return len(state.values.get("qa_questions") or [])
+
+            async def send(session_id, message, key=None):
+                payload = {"session_id": session_id, "message": message}
+                if key is not None:
+                    payload["idempotency_key"] = key
+                started = time.perf_counter()
+                response = await client.post("/chat/send", json=payload)
+                return response, (time.perf_counter() - started) * 1000
+
+            # 질문 한 번에 드는 LLM 호출 수 (기준)
+            control = await prepare_session(client)
+            calls_before = sum(fake.calls.values())
+            await send(control, QUESTION, str(uuid4()))
+            calls_per_turn = sum(fake.calls.values()) - calls_before
+
+            session_ids = await asyncio.gather(*(prepare_session(client) for _ in range(args.sessions)))
+            keys = {session_id: str(uuid4()) for session_id in session_ids}
+            before = {session_id: await qa_count(session_id) for session_id in session_ids}
+            replays_before = replays_served((await client.get("/metrics")).text)
+
+            calls_before = sum(fake.calls.values())
+            results = await asyncio.gather(*(
+                send(session_id, QUESTION, keys[session_id])
+                for session_id in session_ids for _ in range(args.duplicates)
+            ))
+            duplicate_calls = sum(fake.calls.values()) - calls_before
+            after = {session_id: await qa_count(session_id) for session_id in session_ids}
+            by_session = {}
+            for session_id, (response, _) in zip(
+                [session_id for session_id in session_ids for _ in range(args.duplicates)], results
+            ):
+                by_session.setdefault(session_id, []).append(response)
+            phases["concurrent_duplicates"] = {
+                "latency_ms": summarize([ms for _, ms in results]),
+                "status_codes": sorted({response.status_code for response, _ in results}),
+                "identical_responses": all(
+                    len({json.dumps(response.json(), sort_keys=True) for response in responses}) == 1
+                    for responses in by_session.values()
+                ),
+                "turns_recorded": sum(after[session_id] - before[session_id] for session_id in session_ids),
+                "llm_calls": duplicate_calls,
+                "expected_llm_calls": calls_per_turn * args.sessions,
+            }
+
+            calls_before = sum(fake.calls.values())
+            retries = await asyncio.gather(*(send(session_id, QUESTION, keys[session_id]) for session_id in session_ids))
+            phases["sequential_retry"] = {
+                "latency_ms": summarize([ms for _, ms in retries]),
+                "status_codes": sorted({response.status_code for response, _ in retries}),
+                "matches_original": all(
+                    response.json() == by_session[session_id][0].json()
+                    for session_id, (response, _) in zip(session_ids, retries)
+                ),
+                "llm_calls": sum(fake.calls.values()) - calls_before,
+            }
+            replays_after = replays_served((await client.get("/metrics")).text)
+
+            stream_session = await prepare_session(client)
+            stream_key = str(uuid4())
+            stream_task = asyncio.create_task(client.post(
+                "/chat/send/stream",
+                json={"session_id": stream_session, "message": QUESTION, "idempotency_key": stream_key},
+            ))
+            await asyncio.sleep(args.latency_ms / 1000 / 4)
+            send_response, _ = await send(stream_session, QUESTION, stream_key)
+            stream_done = parse_done_event((await stream_task).text)
+            phases["stream_then_send"] = {
+                "status_code": send_response.status_code,
+                "matches_stream": stream_done is not None and send_response.json() == stream_done,
+                "turns_recorded": await qa_count(stream_session),
+            }
+
+            conflict, _ = await send(session_ids[0], "회비는 얼마야?", keys[session_ids[0]])
+            phases["conflict"] = {"status_code": conflict.status_code}
+
+            plain_session = await prepare_session(client)
+            for _ in range(2):
+                await send(plain_session, QUESTION)
+            phases["without_key"] = {"turns_recorded": await qa_count(plain_session)}
+
+            stats = (await client.get("/stats")).json()["idempotency"]
+
+    expected_replays = args.sessions * (args.duplicates - 1) + args.sessions
+    duplicates = phases["concurrent_duplicates"]
+    checks = {
+        "duplicates_all_ok": duplicates["status_codes"] == [200],
+        "duplicates_identical": duplicates["identical_responses"],
+        "duplicates_single_turn": duplicates["turns_recorded"] == args.sessions,
+        "duplicates_single_llm_run": duplicates["llm_calls"] == duplicates["expected_llm_calls"],
+        "retry_replayed_without_llm": phases["sequential_retry"]["matches_original"]
+        and phases["sequential_retry"]["llm_calls"] == 0,
+        "stream_and_send_share_turn": phases["stream_then_send"]["matches_stream"]
+        and phases["stream_then_send"]["turns_recorded"] == 1,
+        "conflict_rejected": phases["conflict"]["status_code"] == 422,
+        "without_key_unchanged": phases["without_key"]["turns_recorded"] == 2,
+        "replay_metric_counted": replays_after - replays_before == expected_replays,
+    }
+    return {
+        "config": {
+            "sessions": args.sessions,
+            "duplicates": args.duplicates,
+            "latency_ms": args.latency_ms,
+            "llm_calls_per_turn": calls_per_turn,
+            "setup_messages": len(SETUP_MESSAGES),
+        },
+        "phases": phases,
+        "replays_served": replays_after - replays_before,
+        "idempotency": stats,
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("idempotency_key 재시도가 그래프를 다시 실행하지 않는지 확인합니다.")
+    parser.add_argument("--sessions", type=int, default=20, help="동시에 재시도를 보낼 세션 수")
+    parser.add_argument("--duplicates", type=int, default=5, help="세션마다 동시에 보낼 같은 요청 수")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="LLM 지연 시간(ms)")
+    args = parser.parse_args()
+
+    result = _harness.run(run_scenario, args)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Q&A 턴의 의도 판별(종료/계속)이 단계(키워드 → 로컬 분류기 → LLM, 캐시)별로 얼마나 걸리는지 측정한다.
+
+정답을 붙인 메시지 목록을 두 방식으로 판별한다.
+- tiered: 현재 구조 (detect_intent). 로컬에서 결정하지 못한 메시지만 LLM 분류기를 부른다
+- llm_only: 예전처럼 모든 메시지를 LLM 분류기로 판별
+가짜 LLM은 --latency-ms 만큼 걸린다. 단계별 결정 수, 지연 시간(µs), 로컬 단계의 정확도와
+두 방식의 메시지당 평균 판별 시간을 JSON으로 출력한다. 확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.intent_tiers --latency-ms 300
+"""
+import random
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks import _harness
+
+_harness.setup_env()
+
+from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm  # noqa: E402
+from benchmarks.load_test import summarize  # noqa: E402
+
+END = "end_chat"
+CONTINUE = "continue_chat"
+
+# (메시지, 정답). 실제 Q&A 턴에서 자주 나오는 질문과 종료 표현, 판단이 애매한 문장을 섞었다
+LABELLED_MESSAGES = [
+    ("종료", END),
+    ("그만할게요", END),
+    ("이제 됐어", END),
+    ("지원서 생성해줘", END),
+    ("지원서 만들어 주세요", END),
+    ("궁금한 거 더 없어요", END),
+    ("질문 없습니다", END),
+    ("이제 괜찮아요 고마워", END),
+    ("충분해요 감사합니다", END),
+    ("대화 종료해줘", END),
+    ("마무리할게", END),
+    ("이만 마칠게요", END),
+    ("더 이상 궁금한 건 없어", END),
+    ("이 정도면 된 것 같아", END),
+    ("끝낼게요", END),
+    ("동아리 모임은 언제 해요?", CONTINUE),
+    ("활동은 어떻게 진행돼?", CONTINUE),
+    ("지원 자격이 뭐야?", CONTINUE),
+    ("회비는 얼마예요", CONTINUE),
+    ("프로젝트는 몇 개 정도 해?", CONTINUE),
+    ("백엔드 스터디도 있나요?", CONTINUE),
+    ("동아리방은 어디야", CONTINUE),
+    ("면접은 어떻게 봐요?", CONTINUE),
+    ("외주 프로젝트 얘기해줘", CONTINUE),
+    ("친목 활동 궁금해", CONTINUE),
+    ("하나만 더 물어볼게", CONTINUE),
+    ("깍두기가 뭐야", CONTINUE),
+    ("마스터는 누구야?", CONTINUE),
+    ("지원서는 언제까지 내야 해?", CONTINUE),
+    ("종료 후에도 활동할 수 있어?", CONTINUE),
+    ("해커톤도 나가요?", CONTINUE),
+    ("신입도 프론트 할 수 있나", CONTINUE),
+    ("디자이너도 뽑아요", CONTINUE),
+    ("저도 참여할 수 있어요", CONTINUE),
+    ("흠 그렇구나", CONTINUE),
+    ("오 좋다 재밌겠다", CONTINUE),
+    ("알겠어 근데 하나 더", CONTINUE),
+    ("응응", CONTINUE),
+    ("스터디 자료 공유해 줘", CONTINUE),
+    ("졸업생도 같이 하나요", CONTINUE),
+]
+
+
+def reset_intent_state():
+    from app.bot import intent
+
+    intent._verdict_cache.clear()
+    intent.intent_stats.clear()
+
+
+async def decide_tiered(text, llm_fallback):
+    """detect_intent와 같은 순서로 판별하고, 어느 단계에서 결정됐는지도 돌려준다."""
+    from app.bot.intent import detect_intent_locally, detect_intent_with_llm, intent_stats
+
+    before = dict(intent_stats)
+    intent = detect_intent_locally(text)
+    if intent is None:
+        intent = await detect_intent_with_llm(text, llm_fallback)
+    tier = next(tier for tier, count in intent_stats.items() if count != before.get(tier, 0))
+    return intent, tier
+
+
+async def run_benchmark(args):
+    from app.bot.nodes import classify_intent_with_llm
+    from app.config import INTENT_LOCAL_CLASSIFIER, INTENT_LOCAL_THRESHOLD
+
+    fake = install_fake_llm(FakeChatModel(
+        latency=LatencyModel(args.latency_ms, "uniform", rng=random.Random(args.seed)),
+        seed=args.seed,
+    ))
+    messages = LABELLED_MESSAGES * args.repeat
+
+    # tiered: 처음 보는 메시지는 단계별로, 같은 메시지를 다시 보면 캐시에서 결정된다
+    reset_intent_state()
+    fake.calls.clear()
+    tier_latencies = defaultdict(list)
+    tier_correct = defaultdict(int)
+    tiered_latencies = []
+    for text, label in messages:
+        started = time.perf_counter()
+        intent, tier = await decide_tiered(text, classify_intent_with_llm)
+        elapsed_us = (time.perf_counter() - started) * 1_000_000
+        tier_latencies[tier].append(elapsed_us)
+        tiered_latencies.append(elapsed_us)
+        tier_correct[tier] += intent == label
+    tiered_llm_calls = sum(fake.calls.values())
+
+    # llm_only: 예전처럼 모든 메시지를 LLM 분류기로 판별 (캐시 없음)
+    fake.calls.clear()
+    llm_only_latencies = []
+    for text, _ in messages:
+        started = time.perf_counter()
+        await classify_intent_with_llm(text)
+        llm_only_latencies.append((time.perf_counter() - started) * 1_000_000)
+    llm_only_calls = sum(fake.calls.values())
+    reset_intent_state()
+
+    tiers = {
+        tier: {
+            "decisions": len(samples),
+            "share": round(len(samples) / len(messages), 3),
+            "latency_us": summarize(samples),
+            "accuracy": round(tier_correct[tier] / len(samples), 3),
+        }
+        for tier, samples in sorted(tier_latencies.items())
+    }
+    local = [tier for tier in ("keyword", "local", "cache") if tier in tiers]
+    # 캐시는 앞서 결정한 결과(가짜 LLM의 답 포함)를 되풀이할 뿐이므로 정확도는 키워드와 분류기만 본다
+    judged = [tier for tier in ("keyword", "local") if tier in tiers]
+    local_decisions = sum(tiers[tier]["decisions"] for tier in judged)
+    local_accuracy = sum(tier_correct[tier] for tier in judged) / local_decisions if local_decisions else None
+    tiered_mean = sum(tiered_latencies) / len(tiered_latencies)
+    llm_only_mean = sum(llm_only_latencies) / len(llm_only_latencies)
+
+    checks = {
+        # 로컬 단계는 LLM 호출에 비해 무시할 수 있을 만큼 빨라야 한다
+        "local_tiers_fast": all(tiers[tier]["latency_us"]["p95"] <= args.max_local_us for tier in local),
+        "local_tiers_accurate": local_accuracy is not None and local_accuracy >= args.min_local_accuracy,
+        "fewer_llm_calls": tiered_llm_calls < llm_only_calls,
+        "tiered_faster": tiered_mean <= llm_only_mean * (1 - args.min_reduction),
+    }
+    return {
+        "config": {
+            "messages": len(messages),
+            "unique_messages": len(LABELLED_MESSAGES),
+            "latency_ms": args.latency_ms,
+            "local_classifier": INTENT_LOCAL_CLASSIFIER,
+            "local_threshold": INTENT_LOCAL_THRESHOLD,
+            "python": sys.version.split()[0],
+        },
+        "tiers": tiers,
+        "local_accuracy": round(local_accuracy, 3) if local_accuracy is not None else None,
+        "tiered": {
+            "mean_latency_ms": round(tiered_mean / 1000, 2),
+            "llm_calls": tiered_llm_calls,
+        },
+        "llm_only": {
+            "mean_latency_ms": round(llm_only_mean / 1000, 2),
+            "llm_calls": llm_only_calls,
+        },
+        "latency_reduction": round(1 - tiered_mean / llm_only_mean, 3) if llm_only_mean else None,
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("Q&A 의도 판별의 단계별 지연 시간을 측정합니다.")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="LLM 분류기 호출 지연 시간(평균, ms)")
+    parser.add_argument("--repeat", type=int, default=2, help="메시지 목록을 반복할 횟수 (두 번째부터는 캐시 단계)")
+    parser.add_argument("--max-local-us", type=float, default=1000.0, help="로컬 단계(키워드/분류기/캐시)에 허용할 p95(µs)")
+    parser.add_argument("--min-local-accuracy", type=float, default=0.95, help="키워드/분류기 단계에서 결정한 메시지의 최소 정확도")
+    parser.add_argument("--min-reduction", type=float, default=0.5, help="llm_only 대비 평균 판별 시간의 최소 감소율")
+    args = parser.parse_args()
+
+    result = _harness.run(run_benchmark, args)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
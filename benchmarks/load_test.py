@@ -0,0 +1,383 @@
+"""가짜 LLM으로 대화 시나리오를 실행해 처리량, 지연 시간, LLM 호출 수, 메모리 증가량을 측정한다.
+
+서버를 띄우지 않고 ASGI transport로 /chat/start, /chat/send, /chat/status를 직접 호출한다.
+--stream이면 /chat/send/stream을 ASGI 앱에 직접 보내 첫 token 이벤트까지의 시간(first_token)도 잰다.
+결과는 JSON으로 출력하고, --compare로 저장해 둔 기준 결과와 비교할 수 있다.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.load_test --sessions 200 --concurrency 50 --out baseline.json
+    python -m benchmarks.load_test --sessions 200 --concurrency 50 --compare baseline.json
+"""
+import asyncio
+import gc
+import json
+import os
+import random
+import resource
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks import _harness
+
+# app을 불러오기 전에 설정해야 하는 값 (실제 API 키가 없어도 실행되도록)
+_harness.setup_env(
+    # 모든 요청이 같은 주소(ASGI transport)에서 오므로 빈도 제한은 끈다
+    IP_RATE_PER_SECOND="0",
+    SESSION_RATE_PER_SECOND="0",
+)
+
+import httpx  # noqa: E402
+
+from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm  # noqa: E402
+
+INTRODUCTIONS = [
+    "안녕하세요 저는 홍길동이고 23살, 컴퓨터공학과예요. 번호는 010-1234-5678입니다",
+    "저는 이영희예요 21살이고 디자인학과 다니고 있어요",
+    "반가워! 나는 마스라고 불러줘. 공대생이야",
+    "스킵",
+]
+POSITIONS = ["백엔드요", "프론트엔드랑 디자인 관심있어요", "아직 잘 모르겠는데 서버 쪽?", "뭐든 좋아요"]
+MOTIVATIONS = [
+    "개발을 혼자 공부하다 보니 같이 프로젝트를 해 볼 사람들이 필요해서 지원하게 되었습니다.",
+    "선배들이 추천해줘서 왔어요. 열심히 하겠습니다!",
+    "스킵",
+]
+QUESTIONS = [
+    "정기 모임은 언제 어디서 해요?",
+    "어떤 활동을 하나요?",
+    "누가 지원할 수 있나요?",
+    "회비는 얼마예요?",
+    "비전공자도 따라갈 수 있을까요?",
+    "프로젝트는 몇 명이서 같이 해요?",
+    "해커톤도 나가나요?",
+]
+ENDINGS = ["종료", "이제 그만할게요", "궁금한 거 다 물어봤어 끝"]
+
+
+def build_script(rng, max_questions):
+    questions = rng.sample(QUESTIONS, rng.randint(0, max_questions))
+    return [
+        rng.choice(INTRODUCTIONS),
+        rng.choice(POSITIONS),
+        rng.choice(MOTIVATIONS),
+        *questions,
+        rng.choice(ENDINGS),
+    ]
+
+
+def rss_mb():
+    """현재 RSS(MB). /proc을 읽을 수 없으면 최대 RSS로 대신한다."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError):
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage / 1024 / 1024 if sys.platform == "darwin" else usage / 1024
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    if not ordered:
+        return {"count": 0}
+
+    def percentile(p):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 2)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 2),
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": round(ordered[-1], 2),
+    }
+
+
+async def stream_post(app, path, payload):
+    """ASGI 앱에 JSON POST를 보내고 (상태 코드, 본문, 첫 token 이벤트까지 걸린 초)를 돌려준다.
+
+    httpx의 ASGI transport는 응답을 다 받은 뒤에 돌려주므로, 스트리밍 응답의 조각이 도착하는 시각을
+    재기 위해 ASGI 앱을 직접 호출한다. token 이벤트가 없으면 세 번째 값은 None.
+    """
+    started = time.perf_counter()
+    body = json.dumps(payload).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"benchmark"), (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+    request_sent = False
+    finished = asyncio.Event()
+    status = None
+    chunks = []
+    first_token = None
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # 응답을 다 보낼 때까지 연결이 유지되는 것처럼 기다린다
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status, first_token
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunk = message.get("body", b"")
+            if first_token is None and b"event: token" in chunk:
+                first_token = time.perf_counter() - started
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                finished.set()
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        finished.set()
+    return status, b"".join(chunks).decode(), first_token
+
+
+class LoadRunner:
+    def __init__(self, client, poll_interval=0.05, resume_timeout=60.0, stream=False, app=None):
+        self.client = client
+        self.stream = stream
+        # stream일 때 app(ASGI 앱)을 주면 첫 토큰까지의 시간도 잰다
+        self.app = app
+        self.poll_interval = poll_interval
+        self.resume_timeout = resume_timeout
+        self.latencies = defaultdict(list)
+        self.status_codes = defaultdict(int)
+        self.completed = 0
+        self.failed = 0
+        self.requests = 0
+
+    async def _request(self, endpoint, method, url, **kwargs):
+        started = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        self.latencies[endpoint].append((time.perf_counter() - started) * 1000)
+        self.status_codes[str(response.status_code)] += 1
+        self.requests += 1
+        return response
+
+    async def _send(self, session_id, message):
+        payload = {"session_id": session_id, "message": message}
+        if not self.stream:
+            response = await self._request("chat_send", "POST", "/chat/send", json=payload)
+            return response.json() if response.status_code == 200 else None
+
+        if self.app is None:
+            # ASGI transport는 응답을 다 받은 뒤 돌려주므로 첫 토큰까지의 시간은 잴 수 없고 전체 시간만 잰다
+            response = await self._request("chat_send_stream", "POST", "/chat/send/stream", json=payload)
+            text = response.text
+        else:
+            started = time.perf_counter()
+            status, text, first_token = await stream_post(self.app, "/chat/send/stream", payload)
+            self.latencies["chat_send_stream"].append((time.perf_counter() - started) * 1000)
+            if first_token is not None:
+                self.latencies["first_token"].append(first_token * 1000)
+            self.status_codes[str(status)] += 1
+            self.requests += 1
+        event = None
+        for line in text.splitlines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: ") and event == "done":
+                return json.loads(line[len("data: "):])
+        return None
+
+    async def run_session(self, script):
+        started = time.perf_counter()
+        response = await self._request("chat_start", "POST", "/chat/start")
+        if response.status_code != 200:
+            self.failed += 1
+            return
+        session_id = response.json()["session_id"]
+
+        body = None
+        for message in script:
+            sent = await self._send(session_id, message)
+            if sent is None:
+                # 같은 메시지를 다시 보내는 대신 다음 메시지로 넘어간다 (사용자가 다시 입력하는 것과 같음)
+                continue
+            body = sent
+            if body["next_step"] in ("generating", "done"):
+                break
+
+        if body is None or body["next_step"] not in ("generating", "done"):
+            self.failed += 1
+            return
+
+        generating_started = time.perf_counter()
+        while body["next_step"] == "generating":
+            if time.perf_counter() - generating_started > self.resume_timeout:
+                self.failed += 1
+                return
+            await asyncio.sleep(self.poll_interval)
+            response = await self._request("chat_status", "GET", f"/chat/status/{session_id}")
+            if response.status_code == 200:
+                body = response.json()
+        self.latencies["resume_wait"].append((time.perf_counter() - generating_started) * 1000)
+        self.latencies["session"].append((time.perf_counter() - started) * 1000)
+        self.completed += 1
+
+
+async def run_benchmark(args):
+    from app.main import app as fastapi_app, lifespan
+
+    rng = random.Random(args.seed)
+    fake = install_fake_llm(FakeChatModel(
+        latency=LatencyModel(args.latency_ms, args.latency_dist, rng=random.Random(args.seed)),
+        error_rate=args.error_rate,
+        seed=args.seed,
+    ))
+    scripts = [build_script(rng, args.max_questions) for _ in range(args.warmup + args.sessions)]
+
+    transport = httpx.ASGITransport(app=fastapi_app)
+    async with lifespan(fastapi_app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            warmup = LoadRunner(client)
+            for script in scripts[:args.warmup]:
+                await warmup.run_session(script)
+
+            fake.calls.clear()
+            fake.errors = 0
+            gc.collect()
+            rss_start = rss_mb()
+
+            runner = LoadRunner(client, poll_interval=args.poll_ms / 1000, stream=args.stream, app=fastapi_app)
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def limited(script):
+                async with semaphore:
+                    await runner.run_session(script)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(limited(script) for script in scripts[args.warmup:]))
+            elapsed = time.perf_counter() - started
+
+            gc.collect()
+            rss_end = rss_mb()
+
+    llm_calls = sum(fake.calls.values())
+    return {
+        "config": {
+            "sessions": args.sessions,
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms,
+            "latency_dist": args.latency_dist,
+            "error_rate": args.error_rate,
+            "max_questions": args.max_questions,
+            "stream": args.stream,
+            "seed": args.seed,
+            "python": sys.version.split()[0],
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "sessions_completed": runner.completed,
+        "sessions_failed": runner.failed,
+        "throughput": {
+            "sessions_per_second": round(runner.completed / elapsed, 2) if elapsed else None,
+            "requests_per_second": round(runner.requests / elapsed, 2) if elapsed else None,
+        },
+        "latency_ms": {endpoint: summarize(samples) for endpoint, samples in sorted(runner.latencies.items())},
+        "status_codes": dict(runner.status_codes),
+        "llm_calls_per_session": {
+            "total": round(llm_calls / args.sessions, 2),
+            **{kind: round(count / args.sessions, 2) for kind, count in sorted(fake.calls.items())},
+        },
+        "injected_errors": fake.errors,
+        "rss_mb": {
+            "start": round(rss_start, 1),
+            "end": round(rss_end, 1),
+            "growth": round(rss_end - rss_start, 1),
+        },
+    }
+
+
+# (결과 JSON 경로, 값이 클수록 좋은지)
+COMPARED_METRICS = [
+    (("throughput", "sessions_per_second"), True),
+    (("throughput", "requests_per_second"), True),
+    (("latency_ms", "chat_send", "p50"), False),
+    (("latency_ms", "chat_send", "p95"), False),
+    (("latency_ms", "chat_send", "p99"), False),
+    (("latency_ms", "chat_send_stream", "p95"), False),
+    (("latency_ms", "first_token", "p50"), False),
+    (("latency_ms", "first_token", "p95"), False),
+    (("latency_ms", "session", "p95"), False),
+    (("llm_calls_per_session", "total"), False),
+    (("rss_mb", "growth"), False),
+]
+# RSS 증가량은 값 자체가 작아 비율만으로 보면 잡음이 크므로 이만큼(MB)은 허용
+RSS_NOISE_MB = 5.0
+
+
+def _lookup(result, path):
+    for key in path:
+        if not isinstance(result, dict) or key not in result:
+            return None
+        result = result[key]
+    return result
+
+
+def compare(result, baseline, tolerance, metrics=COMPARED_METRICS):
+    """기준 결과 대비 변화량. tolerance(비율)보다 나빠진 항목은 regression으로 표시한다."""
+    rows = []
+    for path, higher_is_better in metrics:
+        current, base = _lookup(result, path), _lookup(baseline, path)
+        if current is None or base is None:
+            continue
+        change = (current - base) / base if base else None
+        worse = (base - current) if higher_is_better else (current - base)
+        allowed = abs(base) * tolerance
+        if path == ("rss_mb", "growth"):
+            allowed = max(allowed, RSS_NOISE_MB)
+        rows.append({
+            "metric": ".".join(path),
+            "baseline": base,
+            "current": current,
+            "change": round(change, 3) if change is not None else None,
+            "regression": worse > allowed,
+        })
+    return rows
+
+
+def main():
+    parser = _harness.make_parser("가짜 LLM으로 챗봇 API 부하 테스트를 실행합니다.")
+    parser.add_argument("--sessions", type=int, default=100, help="측정할 대화 수")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시에 진행할 대화 수")
+    parser.add_argument("--warmup", type=int, default=5, help="측정 전에 실행할 대화 수")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="LLM 호출 지연 시간(중앙값, ms)")
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="LLM 호출 실패 확률 (0~1)")
+    parser.add_argument("--max-questions", type=int, default=4, help="대화당 최대 Q&A 질문 수")
+    parser.add_argument("--stream", action="store_true", help="/chat/send 대신 /chat/send/stream 사용 (첫 토큰까지의 시간도 측정)")
+    parser.add_argument("--poll-ms", type=float, default=50.0, help="/chat/status 폴링 간격(ms)")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="허용할 성능 저하 비율")
+    args = parser.parse_args()
+
+    result = _harness.run(run_benchmark, args)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            result["comparison"] = compare(result, json.load(f), args.tolerance)
+    _harness.finish(result, args, passed=not any(row["regression"] for row in result.get("comparison", [])))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""/metrics 계측(노드 감싸기, LLM 호출 기록, 토큰 콜백, 턴 기록)이 대화 한 턴에 더하는 시간이 예산(µs) 안인지 확인한다.
+
+1. 가짜 LLM으로 그래프를 실행해 Q&A 턴 하나에서 실제로 기록되는 노드 수와 LLM 호출 수를 센다.
+2. 같은 수의 노드/LLM 호출을 하는 턴을 아무 일도 하지 않는 노드로 흉내 내어
+   - bare: 계측 없이 노드만 실행
+   - instrumented: start_trace → instrument_node로 감싼 노드 → track_llm_call + 토큰 콜백(on_llm_end) → finish_trace
+   를 --iterations 번씩 --repeats 회 실행하고, 턴당 시간 차이(overhead_us)의 중앙값을 --budget-us와 비교한다.
+   세션 id는 METRICS_TRACE_SESSIONS보다 많이 돌려 써서 최근 기록(LRU) 정리 비용도 포함한다.
+/metrics 조회(render_metrics) 한 번에 걸리는 시간도 함께 출력한다. 확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.metrics_overhead --iterations 20000 --budget-us 50
+"""
+import statistics
+import sys
+import time
+
+from benchmarks import _harness
+
+_harness.setup_env(
+    # Q&A 질문이 LLM 체인을 거치도록 답변 캐시는 끈다
+    ANSWER_CACHE_THRESHOLD="1.01",
+)
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, LLMResult  # noqa: E402
+
+from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm  # noqa: E402
+
+SETUP = [
+    "안녕하세요 저는 김마스이고 23살, 컴퓨터공학과예요.",
+    "백엔드요",
+    "같이 프로젝트를 해 볼 사람들이 필요해서 지원하게 되었습니다.",
+]
+QUESTION = "스터디는 어떻게 진행돼?"
+
+
+async def measure_real_turn(seed):
+    """실제 Q&A 턴 하나의 기록에서 노드 수와 LLM 호출 수를 센다."""
+    from app.bot.checkpointer import BoundedInMemorySaver
+    from app.bot.graph import create_app
+    from app.metrics import finish_trace, get_traces, start_trace
+
+    install_fake_llm(FakeChatModel(latency=LatencyModel(0, "fixed"), seed=seed))
+    graph = create_app(BoundedInMemorySaver())
+    config = {"configurable": {"thread_id": "metrics-overhead"}}
+    await graph.ainvoke({}, config=config)
+    for message in SETUP:
+        await graph.ainvoke({"messages": [HumanMessage(content=message)]}, config=config)
+
+    trace = start_trace("metrics-overhead", "chat_send")
+    await graph.ainvoke({"messages": [HumanMessage(content=QUESTION)]}, config=config)
+    finish_trace(trace)
+    turn = get_traces("metrics-overhead")[-1]
+    return {
+        "nodes": sum(1 for span in turn["spans"] if span["kind"] == "node"),
+        "llm_calls": turn["llm_calls"],
+        "input_tokens": turn["input_tokens"],
+        "output_tokens": turn["output_tokens"],
+    }
+
+
+async def run_turns(iterations, nodes, llm_calls, instrumented, sessions):
+    from app.metrics import finish_trace, instrument_node, start_trace, track_llm_call, _token_usage_handler
+
+    async def node(state):
+        return state
+
+    handler = _token_usage_handler.get()
+    response = LLMResult(generations=[[ChatGeneration(message=AIMessage(
+        content="답변", usage_metadata={"input_tokens": 1200, "output_tokens": 80, "total_tokens": 1280},
+    ))]])
+    wrapped = instrument_node("qa_session_node", node)
+    state = {}
+
+    started = time.perf_counter()
+    if instrumented:
+        for index in range(iterations):
+            trace = start_trace(f"overhead-{index % sessions}", "chat_send")
+            for _ in range(nodes):
+                await wrapped(state)
+            for _ in range(llm_calls):
+                with track_llm_call("qa_answer"):
+                    handler.on_llm_end(response)
+            finish_trace(trace)
+    else:
+        for _ in range(iterations):
+            for _ in range(nodes):
+                await node(state)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+async def run_benchmark(args):
+    from app.config import METRICS_TRACE_SESSIONS
+    from app.metrics import render_metrics
+
+    turn = await measure_real_turn(args.seed)
+    # 실제 턴보다 적게 재지 않도록 최소 1씩은 넣는다
+    nodes, llm_calls = max(turn["nodes"], 1), max(turn["llm_calls"], 1)
+    sessions = METRICS_TRACE_SESSIONS * 2
+
+    await run_turns(min(args.iterations, 1000), nodes, llm_calls, True, sessions)  # 워밍업
+    bare, instrumented = [], []
+    for _ in range(args.repeats):
+        bare.append(await run_turns(args.iterations, nodes, llm_calls, False, sessions))
+        instrumented.append(await run_turns(args.iterations, nodes, llm_calls, True, sessions))
+    overhead = [with_metrics - without for with_metrics, without in zip(instrumented, bare)]
+    overhead_us = statistics.median(overhead)
+
+    render_started = time.perf_counter()
+    for _ in range(args.render_iterations):
+        render_metrics()
+    render_ms = (time.perf_counter() - render_started) / args.render_iterations * 1000
+
+    checks = {
+        "real_turn_recorded": turn["nodes"] > 0 and turn["llm_calls"] > 0,
+        "overhead_within_budget": overhead_us <= args.budget_us,
+    }
+    return {
+        "config": {
+            "iterations": args.iterations,
+            "repeats": args.repeats,
+            "budget_us": args.budget_us,
+            "trace_sessions": sessions,
+            "python": sys.version.split()[0],
+        },
+        "real_turn": turn,
+        "per_turn_us": {
+            "bare": round(statistics.median(bare), 2),
+            "instrumented": round(statistics.median(instrumented), 2),
+            "overhead": round(overhead_us, 2),
+            "overhead_runs": [round(value, 2) for value in overhead],
+        },
+        "render_metrics_ms": round(render_ms, 3),
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("/metrics 계측이 대화 한 턴에 더하는 시간을 측정합니다.")
+    parser.add_argument("--iterations", type=int, default=20000, help="반복마다 실행할 턴 수")
+    parser.add_argument("--repeats", type=int, default=5, help="반복 횟수 (중앙값 사용)")
+    parser.add_argument("--budget-us", type=float, default=50.0, help="턴당 허용하는 계측 시간(µs)")
+    parser.add_argument("--render-iterations", type=int, default=100, help="/metrics 변환 시간을 잴 반복 수")
+    args = parser.parse_args()
+
+    result = _harness.run(run_benchmark, args)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
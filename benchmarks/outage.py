@@ -0,0 +1,210 @@
+"""LLM 제공자 장애 상황을 흉내 내어 Q&A 응답 시간이 제한되는지, 장애 후 스레드/태스크/소켓이 남지 않는지 확인한다.
+
+정상 → 응답 없음(hang) → 즉시 실패(error) → 복구 순서로 같은 세션들에 질문을 보내고,
+단계별 지연 시간, 안내 메시지로 대체된 응답 수, 회로 차단기 상태를 JSON으로 출력한다.
+이어서 아래 두 단계를 더 확인한다.
+- saturated: 제공자는 정상이지만 동시 호출 자리가 하나뿐이라 대부분 자리를 기다리다 제한 시간을 넘기는 경우.
+  대기 시간 초과는 제공자 장애가 아니므로 회로 차단기가 열리면 안 된다.
+- mid_stream: 스트리밍 답변이 첫 조각을 보낸 뒤 실패하는 경우. 이미 보낸 토큰이 재시도로 다시 나가면 안 된다.
+확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.outage --sessions 50
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+
+from benchmarks import _harness
+
+# app을 불러오기 전에 설정해야 하는 값. 장애 구간이 짧게 끝나도록 제한 시간을 줄이고, 답변 캐시는 끈다
+_harness.setup_env(
+    ANSWER_CACHE_THRESHOLD="1.01",
+    LLM_TIMEOUT_SECONDS="0.5",
+    LLM_DEADLINE_SECONDS="1.5",
+    LLM_RETRY_BACKOFF_SECONDS="0.05",
+    LLM_BREAKER_RESET_SECONDS="1",
+    # 모든 요청이 같은 주소(ASGI transport)에서 오므로 빈도 제한은 끈다
+    IP_RATE_PER_SECOND="0",
+    SESSION_RATE_PER_SECOND="0",
+)
+
+import httpx  # noqa: E402
+
+from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm  # noqa: E402
+from benchmarks.load_test import summarize  # noqa: E402
+
+SETUP_MESSAGES = [
+    "안녕하세요 저는 홍길동이고 23살, 컴퓨터공학과예요. 번호는 010-1234-5678입니다",
+    "백엔드요",
+    "같이 프로젝트를 해 볼 사람들이 필요해서 지원하게 되었습니다.",
+]
+
+
+def open_fds():
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+def resources():
+    return {
+        "threads": threading.active_count(),
+        "asyncio_tasks": len(asyncio.all_tasks()),
+        "open_fds": open_fds(),
+    }
+
+
+async def prepare_session(client):
+    response = await client.post("/chat/start")
+    session_id = response.json()["session_id"]
+    for message in SETUP_MESSAGES:
+        await client.post("/chat/send", json={"session_id": session_id, "message": message})
+    return session_id
+
+
+async def run_phase(client, session_ids, name, canned_reply):
+    latencies = []
+    status_codes = {}
+    canned = 0
+
+    async def ask(index, session_id):
+        nonlocal canned
+        started = time.perf_counter()
+        response = await client.post(
+            "/chat/send", json={"session_id": session_id, "message": f"{name} 단계 질문 {index}번: 스터디는 어떻게 진행돼?"}
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+        status_codes[str(response.status_code)] = status_codes.get(str(response.status_code), 0) + 1
+        if response.status_code == 200 and response.json()["response_message"] == canned_reply:
+            canned += 1
+
+    await asyncio.gather(*(ask(index, session_id) for index, session_id in enumerate(session_ids)))
+    return {"latency_ms": summarize(latencies), "status_codes": status_codes, "canned_replies": canned}
+
+
+async def run_stream_phase(client, session_ids, first_piece):
+    """스트리밍 질문을 보내고 토큰 이벤트에 첫 조각이 두 번 이상 나온 스트림 수를 센다."""
+    repeated = 0
+    status_codes = {}
+
+    async def ask(index, session_id):
+        nonlocal repeated
+        response = await client.post(
+            "/chat/send/stream", json={"session_id": session_id, "message": f"스트리밍 질문 {index}번: 회비는 얼마야?"}
+        )
+        status_codes[str(response.status_code)] = status_codes.get(str(response.status_code), 0) + 1
+        tokens = [
+            json.loads(line[len("data: "):])["content"]
+            for event in response.text.split("\n\n") if event.startswith("event: token")
+            for line in event.splitlines() if line.startswith("data: ")
+        ]
+        if tokens.count(first_piece) > 1:
+            repeated += 1
+
+    await asyncio.gather(*(ask(index, session_id) for index, session_id in enumerate(session_ids)))
+    return {"status_codes": status_codes, "repeated_token_streams": repeated}
+
+
+async def run_scenario(args):
+    from app.main import app as fastapi_app, lifespan
+    from app.bot import nodes
+
+    fake = install_fake_llm(FakeChatModel(latency=LatencyModel(args.latency_ms, "uniform"), seed=args.seed))
+    gateway = nodes.llm_gateway
+    phases = {}
+
+    transport = httpx.ASGITransport(app=fastapi_app)
+    async with lifespan(fastapi_app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            session_ids = [await prepare_session(client) for _ in range(args.sessions)]
+            phases["healthy"] = await run_phase(client, session_ids, "healthy", nodes.LLM_UNAVAILABLE_REPLY)
+            before = resources()
+
+            for outage in ("hang", "error"):
+                fake.outage = outage
+                phases[f"outage_{outage}"] = await run_phase(
+                    client, session_ids, f"outage_{outage}", nodes.LLM_UNAVAILABLE_REPLY
+                )
+                phases[f"outage_{outage}"]["breaker_state"] = gateway.breaker.state
+
+            fake.outage = None
+            await asyncio.sleep(gateway.breaker.reset_timeout + 0.1)
+            # 회로가 반쯤 열린 상태에서는 시험 호출 하나가 성공해야 나머지가 통과한다
+            phases["recovery_probe"] = await run_phase(client, session_ids[:1], "probe", nodes.LLM_UNAVAILABLE_REPLY)
+            phases["recovered"] = await run_phase(client, session_ids, "recovered", nodes.LLM_UNAVAILABLE_REPLY)
+            phases["recovered"]["breaker_state"] = gateway.breaker.state
+
+            # 자리가 하나뿐이고 호출마다 시도별 제한 시간에 가깝게 걸리면 대부분은 자리를 기다리다 전체 제한 시간을 넘긴다
+            semaphore, latency = gateway.semaphore, fake.latency
+            gateway.semaphore = asyncio.Semaphore(1)
+            fake.latency = LatencyModel(gateway.timeout * 800, "fixed")
+            queue_timeouts, opened = gateway.queue_timeouts, gateway.breaker.opened
+            try:
+                phases["saturated"] = await run_phase(client, session_ids, "saturated", nodes.LLM_UNAVAILABLE_REPLY)
+            finally:
+                gateway.semaphore, fake.latency = semaphore, latency
+            phases["saturated"]["queue_timeouts"] = gateway.queue_timeouts - queue_timeouts
+            phases["saturated"]["breaker_opened"] = gateway.breaker.opened - opened
+
+            fake.outage = "mid_stream"
+            calls = fake.calls["chat"]
+            phases["mid_stream"] = await run_stream_phase(client, session_ids, fake.reply[:fake.chunk_size])
+            phases["mid_stream"]["chat_calls"] = fake.calls["chat"] - calls
+            fake.outage = None
+
+            await asyncio.sleep(0.1)
+            after = resources()
+
+    # 제한 시간 뒤 응답을 만드는 데 드는 여유 시간
+    bound_ms = gateway.deadline * 1000 + args.slack_ms
+    checks = {
+        "outage_latency_bounded": all(
+            phases[name]["latency_ms"]["max"] <= bound_ms for name in ("outage_hang", "outage_error")
+        ),
+        "no_http_errors": all(set(phase["status_codes"]) == {"200"} for phase in phases.values()),
+        "breaker_opened": phases["outage_error"]["breaker_state"] == "open",
+        "recovered": phases["recovered"]["canned_replies"] == 0 and phases["recovered"]["breaker_state"] == "closed",
+        "queue_timeouts_keep_breaker_closed": (
+            phases["saturated"]["queue_timeouts"] > 0 and phases["saturated"]["breaker_opened"] == 0
+        ),
+        "no_repeated_stream_tokens": phases["mid_stream"]["repeated_token_streams"] == 0,
+        "no_retry_after_tokens": phases["mid_stream"]["chat_calls"] <= args.sessions,
+        "no_thread_leak": after["threads"] <= before["threads"],
+        "no_task_leak": after["asyncio_tasks"] <= before["asyncio_tasks"],
+        "no_fd_leak": after["open_fds"] is None or after["open_fds"] <= before["open_fds"],
+    }
+    return {
+        "config": {
+            "sessions": args.sessions,
+            "latency_ms": args.latency_ms,
+            "llm_timeout_seconds": gateway.timeout,
+            "llm_deadline_seconds": gateway.deadline,
+            "llm_max_retries": gateway.max_retries,
+            "breaker_failures": gateway.breaker.failure_threshold,
+            "breaker_reset_seconds": gateway.breaker.reset_timeout,
+            "latency_bound_ms": bound_ms,
+        },
+        "phases": phases,
+        "resources": {"before": before, "after": after},
+        "gateway": gateway.stats(),
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("LLM 장애 상황에서 응답 시간과 자원 누수를 확인합니다.")
+    parser.add_argument("--sessions", type=int, default=30, help="동시에 질문할 세션 수")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="정상 상태의 LLM 지연 시간(ms)")
+    parser.add_argument("--slack-ms", type=float, default=500.0, help="제한 시간 외에 허용할 처리 시간(ms)")
+    args = parser.parse_args()
+
+    result = _harness.run(run_scenario, args)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
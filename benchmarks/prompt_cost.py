@@ -0,0 +1,191 @@
+"""Q&A 턴마다 프롬프트를 준비하는 CPU 시간과, 제공자 캐시가 재사용할 수 있는 고정 접두부의 크기를 측정한다.
+
+1. CPU: 가짜 LLM으로 Q&A 턴 하나의 프롬프트를 만드는 데 걸리는 CPU 시간(µs)을 세 방식으로 잰다 (LLM 호출 제외)
+   - rebuild: 예전처럼 턴마다 동아리 정보를 넣은 템플릿과 체인을 새로 만들고 프롬프트를 만든다
+   - registry: PromptRegistry가 미리 만든 체인으로 프롬프트만 만든다 (동아리 정보 전체를 접두부에 넣는 경우)
+   - registry_retrieval: 소개/모집 대상 등은 접두부에 두고, 활동/FAQ 항목은 질문마다 골라 접두부 뒤에 붙인다 (RETRIEVAL_TOP_K)
+2. 토큰: 예시 대화의 Q&A 턴마다 LLM에 보내는 메시지를 접두부(모든 턴/세션에서 같은 바이트)와
+   턴마다 달라지는 나머지로 나눠 크기를 비교한다. 토큰 수는 가짜 LLM과 같은 방식(글자 수 ÷ 2)으로 추정한다.
+   검색을 써도 접두부가 전체의 --min-cacheable-share 이상이어야 한다.
+확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.prompt_cost --iterations 2000
+"""
+import sys
+import time
+
+from benchmarks import _harness
+
+_harness.setup_env()
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from langchain_core.output_parsers import StrOutputParser  # noqa: E402
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder  # noqa: E402
+
+from benchmarks.fake_llm import FakeChatModel, LatencyModel  # noqa: E402
+from benchmarks.load_test import QUESTIONS, summarize  # noqa: E402
+
+
+def estimate_tokens(text):
+    # 가짜 LLM의 usage_metadata와 같은 근사 (글자 수 ÷ 2)
+    return len(text) // 2
+
+
+def conversation(turns):
+    """Q&A 턴마다 그때까지의 대화 내역 (시작 인사와 자기소개/포지션/지원 동기 턴 포함)."""
+    messages = [
+        AIMessage(content="좋았어! 이제 네 얘기도 좀 들려주라. 간단하게 자기소개 한번 해줄 수 있어?"),
+        HumanMessage(content="안녕하세요 저는 홍길동이고 23살, 컴퓨터공학과예요."),
+        AIMessage(content="길동!, 그렇구나 너는 어떤 포지션에 관심 있니?"),
+        HumanMessage(content="백엔드요"),
+        AIMessage(content="좋아! 이제 동아리에 지원하게 된 동기를 편하게 말해줄래?"),
+        HumanMessage(content="같이 프로젝트를 해 볼 사람들이 필요해서 지원하게 되었습니다."),
+        AIMessage(content="이야기해줘서 정말 고마워! 자 이제부터는 내가 너의 질문에 대답해 줄 차례야"),
+    ]
+    histories = []
+    for turn in range(turns):
+        messages = messages + [HumanMessage(content=QUESTIONS[turn % len(QUESTIONS)])]
+        histories.append(messages)
+        messages = messages + [AIMessage(content="좋은 질문이야! 우리 동아리는 매주 정기 모임에서 프로젝트 진행 상황을 공유해.")]
+    return histories
+
+
+def rebuild_prompt(club, llm, history):
+    """기존 qa_session_node처럼 턴마다 동아리 정보를 넣은 템플릿과 체인을 새로 만들고 프롬프트를 만든다."""
+    system = f"""
+            당신은 [{club.name}]의 홍보 담당 챗봇입니다.
+            사용자의 질문에 친근하고 정확하게 답변하세요.
+            아래 [동아리 정보]를 바탕으로 답변해야 합니다.
+            [동아리 정보]
+            {club.data}
+            {club.intro}
+            {club.positions}
+            ---
+            사용자가 "종료" 신호를 보내기 전까지 대화를 계속 이어가세요.
+            Markdown 헤더(##), 제목, 이모티콘, 또는 기타 서식을 절대 포함하지 마세요.
+            """
+    # 동아리 정보의 중괄호가 템플릿 변수로 해석되지 않도록 이스케이프 (템플릿 파싱 비용은 그대로 남는다)
+    qa_prompt = ChatPromptTemplate.from_messages([
+        ("system", system.replace("{", "{{").replace("}", "}}")),
+        MessagesPlaceholder(variable_name="history")
+    ])
+    qa_chain = qa_prompt | llm | StrOutputParser()
+    return qa_chain.first.invoke({"history": history[-10:]})
+
+
+def registry_prompt(registry, club, history):
+    chain = registry.qa_chain(club)
+    # 미리 만든 체인은 태그를 붙인 RunnableBinding이므로 안쪽 시퀀스의 첫 단계(프롬프트)만 실행한다
+    return chain.bound.first.invoke(registry.qa_input(history, club))
+
+
+def cpu_per_turn(render, histories, iterations):
+    samples = []
+    for index in range(iterations):
+        history = histories[index % len(histories)]
+        started = time.process_time()
+        render(history)
+        samples.append((time.process_time() - started) * 1_000_000)
+    return summarize(samples)
+
+
+def split_prompt(prompt_value, prefix_messages):
+    """프롬프트 메시지를 (접두부 텍스트, 나머지 텍스트)로 나눈다. 접두부는 앞에서부터 prefix_messages개."""
+    messages = prompt_value.to_messages()
+    prefix = "".join(str(message.content) for message in messages[:prefix_messages])
+    suffix = "".join(str(message.content) for message in messages[prefix_messages:])
+    return prefix, suffix
+
+
+def token_report(registry, club, histories):
+    prefixes = set()
+    turns = []
+    for history in histories:
+        prompt = registry.qa_chain(club).bound.first.invoke(registry.qa_input(history, club))
+        prefix, suffix = split_prompt(prompt, 1)
+        prefixes.add(prefix)
+        turns.append({
+            "prefix_tokens": estimate_tokens(prefix),
+            "suffix_tokens": estimate_tokens(suffix),
+        })
+    prefix_total = sum(turn["prefix_tokens"] for turn in turns)
+    suffix_total = sum(turn["suffix_tokens"] for turn in turns)
+    return {
+        "prefix_identical": len(prefixes) == 1,
+        "prefix_bytes": len(next(iter(prefixes)).encode("utf-8")),
+        "prefix_tokens": turns[0]["prefix_tokens"],
+        "suffix_tokens_per_turn": [turn["suffix_tokens"] for turn in turns],
+        "cacheable_share": round(prefix_total / (prefix_total + suffix_total), 3),
+    }
+
+
+def run_benchmark(args):
+    from app.bot.prompts import PromptRegistry
+    from app.bot.llm_client import LazyLLM
+    from app.club import club_config
+
+    fake = FakeChatModel(latency=LatencyModel(0, "fixed"))
+    llm = LazyLLM(lambda: fake)
+    llm.get()
+    club = club_config.current()
+    full = PromptRegistry(llm, retrieval_top_k=0)
+    retrieval = PromptRegistry(llm, retrieval_top_k=args.top_k)
+    full.warm(club)
+    retrieval.warm(club)
+    histories = conversation(args.turns)
+
+    cpu = {
+        "rebuild": cpu_per_turn(lambda history: rebuild_prompt(club, fake, history), histories, args.iterations),
+        "registry": cpu_per_turn(lambda history: registry_prompt(full, club, history), histories, args.iterations),
+        "registry_retrieval": cpu_per_turn(
+            lambda history: registry_prompt(retrieval, club, history), histories, args.iterations),
+    }
+    tokens = {
+        "registry": token_report(full, club, histories),
+        "registry_retrieval": token_report(retrieval, club, histories),
+    }
+    # 다른 세션(다른 대화 내역)에서도 접두부가 같은 바이트인지 확인
+    other_session = conversation(1)[0][:1] + [HumanMessage(content="다른 세션의 질문이에요")]
+    cross_session = all(
+        split_prompt(registry_prompt(registry, club, other_session), 1)[0]
+        == split_prompt(registry_prompt(registry, club, histories[-1]), 1)[0]
+        for registry in (full, retrieval)
+    )
+
+    checks = {
+        "registry_less_cpu": cpu["registry"]["p50"] < cpu["rebuild"]["p50"],
+        "prefix_identical_across_turns": all(report["prefix_identical"] for report in tokens.values()),
+        "prefix_identical_across_sessions": cross_session,
+        "retrieval_prefix_cacheable": tokens["registry_retrieval"]["cacheable_share"] >= args.min_cacheable_share,
+    }
+    return {
+        "config": {
+            "iterations": args.iterations,
+            "turns": args.turns,
+            "retrieval_top_k": args.top_k,
+            "min_cacheable_share": args.min_cacheable_share,
+            "club_version": club.version,
+            "python": sys.version.split()[0],
+        },
+        "cpu_us_per_turn": cpu,
+        "tokens": tokens,
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("Q&A 프롬프트 준비 CPU 시간과 캐시 가능한 접두부 크기를 측정합니다.")
+    parser.add_argument("--iterations", type=int, default=2000, help="방식마다 프롬프트를 만들 횟수")
+    parser.add_argument("--turns", type=int, default=6, help="토큰 보고서에 사용할 Q&A 턴 수")
+    parser.add_argument("--top-k", type=int, default=4, help="registry_retrieval에서 고를 청크 수")
+    parser.add_argument("--min-cacheable-share", type=float, default=0.5,
+                        help="registry_retrieval에서 캐시 가능한 접두부가 차지해야 하는 최소 비율")
+    args = parser.parse_args()
+
+    result = _harness.run(run_benchmark, args)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""지원서 생성 작업이 워커가 여럿이어도 세션마다 한 번만 실행되는지 확인한다.
+
+1. workers: SQLite 파일을 공유하는 워커 --workers 개(그래프, 저장소 연결, 작업 큐를 각자 가짐)를 한 프로세스에 만들고,
+   대화를 마친 세션 --sessions 개를 모든 워커가 /chat/status 폴링처럼 계속 등록하게 한다.
+   - sqlite_claims: 작업 소유권을 SQLite 행(resume_job_claims)으로 나눠 갖는 현재 방식
+   - local_claims: 워커마다 자기 작업 기록만 보던 예전 방식 (비교용)
+   generate_resume_node 실행 횟수가 세션 수와 같은지 본다.
+2. send_while_generating: API로 대화를 마친 직후 "generating" 상태에서 /chat/send, /chat/send/stream을 보내도
+   그래프를 실행하지 않고 "generating"을 돌려주는지, 지원서가 세션마다 한 번만 생성되는지 본다.
+확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.resume_claims --workers 4 --sessions 50 --latency-ms 200
+"""
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks import _harness
+
+# app을 불러오기 전에 설정해야 하는 값. 모든 요청이 같은 주소(ASGI transport)에서 오므로 빈도 제한은 끈다
+DATA_DIR = tempfile.mkdtemp(prefix="mars-resume-claims-")
+os.environ["CHECKPOINTER_BACKEND"] = "sqlite"
+os.environ["SQLITE_CHECKPOINT_PATH"] = os.path.join(DATA_DIR, "api.db")
+_harness.setup_env(
+    IP_RATE_PER_SECOND="0",
+    SESSION_RATE_PER_SECOND="0",
+)
+
+import httpx  # noqa: E402
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm  # noqa: E402
+from benchmarks.load_test import build_script  # noqa: E402
+
+EXTRA_MESSAGE = "혹시 하나만 더 물어봐도 돼?"
+
+
+def resume_runs():
+    from app.metrics import node_duration
+
+    return node_duration.count("generate_resume_node")
+
+
+async def finish_conversation(graph, session_id, script):
+    """대화를 처음부터 진행해 지원서 생성 직전("generate_resume")까지 만든다."""
+    config = {"configurable": {"thread_id": session_id}}
+    state = await graph.ainvoke({}, config=config)
+    for message in script:
+        state = await graph.ainvoke({"messages": [HumanMessage(content=message)]}, config=config)
+        if state.get("next_question") == "generate_resume":
+            return True
+    return False
+
+
+async def run_workers(mode, args, rng):
+    from app.bot.checkpointer import SQLiteSaver
+    from app.bot.graph import create_app
+    from app.bot.jobs import LocalJobClaims, ResumeJobQueue, SQLiteJobClaims
+
+    db_path = os.path.join(DATA_DIR, f"{mode}.db")
+    workers = []
+    for _ in range(args.workers):
+        graph = create_app(SQLiteSaver(db_path))
+        claims = SQLiteJobClaims(db_path) if mode == "sqlite_claims" else LocalJobClaims()
+        queue = ResumeJobQueue(workers=4, claims=claims)
+        queue.start(graph)
+        workers.append((graph, queue))
+
+    session_ids = [f"{mode}-{index}" for index in range(args.sessions)]
+    prepared = await asyncio.gather(*(
+        finish_conversation(workers[0][0], session_id, build_script(rng, args.max_questions))
+        for session_id in session_ids
+    ))
+
+    before = resume_runs()
+    pending = set(session_ids)
+    started = time.perf_counter()
+    try:
+        # 폴링이 모든 워커로 골고루 가는 상황: 워커마다 아직 생성 중인 세션을 등록한다
+        while pending and time.perf_counter() - started < args.timeout:
+            for graph, queue in workers:
+                for session_id in list(pending):
+                    state = (await graph.aget_state({"configurable": {"thread_id": session_id}})).values
+                    if state.get("next_question") == "generate_resume":
+                        await queue.submit(session_id)
+                    elif state.get("next_question") == "done":
+                        pending.discard(session_id)
+            await asyncio.sleep(args.poll_ms / 1000)
+    finally:
+        for _, queue in workers:
+            await queue.stop()
+
+    return {
+        "prepared": sum(prepared),
+        "completed": len(session_ids) - len(pending),
+        "resume_runs": resume_runs() - before,
+        "skipped": sum(queue.skipped for _, queue in workers),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+async def run_send_while_generating(args, rng):
+    from app.main import app as fastapi_app, lifespan
+
+    generating_responses = 0
+    unexpected = []
+    completed = 0
+
+    async def session(client):
+        nonlocal generating_responses, completed
+        response = await client.post("/chat/start")
+        session_id = response.json()["session_id"]
+        body = None
+        for message in build_script(rng, args.max_questions):
+            body = (await client.post("/chat/send", json={"session_id": session_id, "message": message})).json()
+            if body["next_step"] == "generating":
+                break
+        if body is None or body["next_step"] != "generating":
+            unexpected.append("not_generating")
+            return
+
+        # 생성 중에 보낸 메시지는 그래프를 실행하지 않고 현재 상태("generating")만 돌려받아야 한다
+        payload = {"session_id": session_id, "message": EXTRA_MESSAGE}
+        sent = (await client.post("/chat/send", json=payload)).json()
+        streamed = (await client.post("/chat/send/stream", json=payload)).text
+        if sent["next_step"] == "generating":
+            generating_responses += 1
+        else:
+            unexpected.append(f"send:{sent['next_step']}")
+        if "event: token" in streamed or '"next_step": "generating"' not in streamed:
+            unexpected.append("stream")
+        else:
+            generating_responses += 1
+
+        started = time.perf_counter()
+        while body["next_step"] == "generating" and time.perf_counter() - started < args.timeout:
+            await asyncio.sleep(args.poll_ms / 1000)
+            response = await client.get(f"/chat/status/{session_id}")
+            if response.status_code == 200:
+                body = response.json()
+        if body["next_step"] == "done":
+            completed += 1
+
+    transport = httpx.ASGITransport(app=fastapi_app)
+    async with lifespan(fastapi_app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            while (await client.get("/readyz")).status_code != 200:
+                await asyncio.sleep(0.01)
+            before = resume_runs()
+            await asyncio.gather(*(session(client) for _ in range(args.sessions)))
+            runs = resume_runs() - before
+
+    return {
+        "completed": completed,
+        "generating_responses": generating_responses,
+        "unexpected": unexpected[:10],
+        "resume_runs": runs,
+    }
+
+
+async def run_benchmark(args):
+    install_fake_llm(FakeChatModel(latency=LatencyModel(args.latency_ms, "uniform"), seed=args.seed))
+    rng = random.Random(args.seed)
+    workers = {mode: await run_workers(mode, args, rng) for mode in ("sqlite_claims", "local_claims")}
+    send = await run_send_while_generating(args, rng)
+
+    claims = workers["sqlite_claims"]
+    checks = {
+        "all_sessions_prepared": all(result["prepared"] == args.sessions for result in workers.values()),
+        "claims_all_completed": claims["completed"] == args.sessions,
+        "claims_one_run_per_session": claims["resume_runs"] == args.sessions,
+        # 소유권이 없으면 실제로 중복 실행되는 상황이어야 비교할 의미가 있다
+        "local_claims_would_duplicate": args.workers < 2 or workers["local_claims"]["resume_runs"] > args.sessions,
+        "send_returns_generating": send["generating_responses"] == args.sessions * 2 and not send["unexpected"],
+        "send_all_completed": send["completed"] == args.sessions,
+        "send_one_run_per_session": send["resume_runs"] == args.sessions,
+    }
+    return {
+        "config": {
+            "workers": args.workers,
+            "sessions": args.sessions,
+            "latency_ms": args.latency_ms,
+            "poll_ms": args.poll_ms,
+            "python": sys.version.split()[0],
+        },
+        "workers": workers,
+        "send_while_generating": send,
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("지원서 생성 작업이 워커 수와 관계없이 세션마다 한 번만 실행되는지 확인합니다.")
+    parser.add_argument("--workers", type=int, default=4, help="SQLite 파일을 공유하는 워커 수")
+    parser.add_argument("--sessions", type=int, default=50, help="지원서를 생성할 세션 수")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="LLM 호출 지연 시간(평균, ms)")
+    parser.add_argument("--max-questions", type=int, default=2, help="대화당 최대 Q&A 질문 수")
+    parser.add_argument("--poll-ms", type=float, default=20.0, help="/chat/status 폴링 간격(ms)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="모든 지원서가 생성되기를 기다릴 최대 시간(초)")
+    args = parser.parse_args()
+
+    try:
+        result = _harness.run(run_benchmark, args)
+    finally:
+        shutil.rmtree(DATA_DIR, ignore_errors=True)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""세션이 10만 개 쌓여도 BoundedInMemorySaver를 쓰는 서버의 메모리(RSS)가 일정 수준에서 멈추는지 확인한다.
+
+1. 가짜 LLM으로 실제 그래프에서 대화 하나를 끝까지 진행하며 체크포인터에 들어가는 put/put_writes 호출을 기록하고
+2. 세션 ID만 바꿔 같은 호출을 --sessions 개 세션만큼 체크포인터에 그대로 재생한다 (그래프 실행 비용 없이 저장량만 재현)
+3. 일정 간격마다 RSS를 기록해, max_sessions를 채운 뒤로는 늘어나지 않는지 본다.
+비교용으로 제한 없는 InMemorySaver도 --baseline-sessions 개까지 같은 방식으로 측정한다 (RSS가 계속 늘어나므로 나중에 실행).
+확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.sessions_memory --sessions 100000 --max-sessions 10000
+"""
+import asyncio
+import gc
+import random
+import sys
+import time
+
+from benchmarks import _harness
+
+_harness.setup_env(
+    ANSWER_CACHE_THRESHOLD="1.01",
+)
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+from langgraph.checkpoint.memory import InMemorySaver  # noqa: E402
+
+from app.bot.checkpointer import BoundedInMemorySaver  # noqa: E402
+from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm  # noqa: E402
+from benchmarks.load_test import build_script, rss_mb  # noqa: E402
+
+
+class RecordingSaver(InMemorySaver):
+    """put/put_writes 호출을 순서대로 기록하는 InMemorySaver."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        self.calls.append(("put", config, checkpoint, metadata, new_versions))
+        return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        self.calls.append(("put_writes", config, writes, task_id, task_path))
+        return super().put_writes(config, writes, task_id, task_path)
+
+
+async def record_session(args):
+    """대화 하나를 끝까지(지원서 생성 포함) 진행하고 체크포인터 호출 기록을 돌려준다."""
+    from app.main import app as fastapi_app, lifespan
+    from app.bot.graph import create_app
+
+    install_fake_llm(FakeChatModel(latency=LatencyModel(0, "fixed"), seed=args.seed))
+    script = build_script(random.Random(args.seed), args.max_questions)
+    recorder = RecordingSaver()
+    async with lifespan(fastapi_app):
+        graph = create_app(recorder)
+        config = {"configurable": {"thread_id": "recorded"}}
+        state = await graph.ainvoke({}, config=config)
+        for message in script:
+            state = await graph.ainvoke({"messages": [HumanMessage(content=message)]}, config=config)
+        if state.get("next_question") == "generate_resume":
+            state = await graph.ainvoke({}, config=config)
+    return recorder.calls, len(script), state.get("next_question")
+
+
+def with_thread(config, thread_id):
+    return {**config, "configurable": {**config["configurable"], "thread_id": thread_id}}
+
+
+def replay(saver, calls, thread_id):
+    for kind, config, *rest in calls:
+        if kind == "put":
+            saver.put(with_thread(config, thread_id), *rest)
+        else:
+            saver.put_writes(with_thread(config, thread_id), *rest)
+
+
+def fill(saver, calls, sessions, sample_every):
+    """세션 sessions개를 저장하며 sample_every개마다 (세션 수, RSS MB)를 기록한다."""
+    gc.collect()
+    samples = [(0, round(rss_mb(), 1))]
+    started = time.perf_counter()
+    for index in range(1, sessions + 1):
+        replay(saver, calls, f"session-{index}")
+        if index % sample_every == 0 or index == sessions:
+            gc.collect()
+            samples.append((index, round(rss_mb(), 1)))
+    return samples, time.perf_counter() - started
+
+
+def rss_at(samples, sessions):
+    """sessions개 이상 저장했을 때 처음 기록한 RSS."""
+    return next(rss for count, rss in samples if count >= sessions)
+
+
+def run_benchmark(args):
+    calls, turns, final_step = asyncio.run(record_session(args))
+
+    bounded = BoundedInMemorySaver(max_sessions=args.max_sessions, idle_ttl=3600.0, max_checkpoints=1)
+    bounded_samples, bounded_seconds = fill(bounded, calls, args.sessions, args.sample_every)
+    # max_sessions의 두 배를 저장한 뒤로는 제거와 추가가 반복될 뿐이므로 메모리가 늘지 않아야 한다
+    plateau_from = min(args.max_sessions * 2, args.sessions)
+    plateau_growth = bounded_samples[-1][1] - rss_at(bounded_samples, plateau_from)
+    bounded_stats = bounded.stats()
+    del bounded
+    gc.collect()
+
+    unbounded = InMemorySaver()
+    unbounded_samples, _ = fill(unbounded, calls, args.baseline_sessions, args.sample_every)
+    unbounded_growth = unbounded_samples[-1][1] - unbounded_samples[0][1]
+    unbounded_mb_per_1k = unbounded_growth / args.baseline_sessions * 1000
+    del unbounded
+    gc.collect()
+
+    checks = {
+        "recorded_full_session": final_step == "done",
+        "bounded_live_sessions_capped": bounded_stats["live_sessions"] == min(args.sessions, args.max_sessions),
+        "bounded_evictions_match": bounded_stats["evictions"] == max(0, args.sessions - args.max_sessions),
+        "bounded_rss_flat": plateau_growth <= args.max_growth_mb,
+        # 같은 세션 수를 제한 없이 저장했다면 늘었을 메모리(추정)가 허용 범위보다 커야 비교할 의미가 있다
+        "unbounded_would_grow": unbounded_mb_per_1k * args.sessions / 1000 > args.max_growth_mb,
+    }
+    return {
+        "config": {
+            "sessions": args.sessions,
+            "max_sessions": args.max_sessions,
+            "baseline_sessions": args.baseline_sessions,
+            "turns_per_session": turns,
+            "checkpointer_calls_per_session": len(calls),
+            "max_growth_mb": args.max_growth_mb,
+            "python": sys.version.split()[0],
+        },
+        "bounded": {
+            "rss_mb": [{"sessions": count, "rss_mb": rss} for count, rss in bounded_samples],
+            "plateau_from_sessions": plateau_from,
+            "plateau_growth_mb": round(plateau_growth, 1),
+            "sessions_per_second": round(args.sessions / bounded_seconds, 1) if bounded_seconds else None,
+            "stats": bounded_stats,
+        },
+        "unbounded": {
+            "rss_mb": [{"sessions": count, "rss_mb": rss} for count, rss in unbounded_samples],
+            "growth_mb": round(unbounded_growth, 1),
+            "mb_per_1k_sessions": round(unbounded_mb_per_1k, 2),
+            "projected_growth_mb": round(unbounded_mb_per_1k * args.sessions / 1000, 1),
+        },
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("세션이 많이 쌓여도 메모리가 일정 수준에서 멈추는지 확인합니다.")
+    parser.add_argument("--sessions", type=int, default=100000, help="BoundedInMemorySaver에 저장할 세션 수")
+    parser.add_argument("--max-sessions", type=int, default=10000, help="BoundedInMemorySaver의 max_sessions")
+    parser.add_argument("--baseline-sessions", type=int, default=5000, help="제한 없는 InMemorySaver에 저장할 세션 수")
+    parser.add_argument("--sample-every", type=int, default=5000, help="RSS를 기록할 세션 수 간격")
+    parser.add_argument("--max-growth-mb", type=float, default=20.0, help="max_sessions의 두 배를 채운 뒤 허용할 RSS 증가량(MB)")
+    parser.add_argument("--max-questions", type=int, default=4, help="기록할 대화의 최대 Q&A 질문 수")
+    args = parser.parse_args()
+
+    result = _harness.run(run_benchmark, args)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
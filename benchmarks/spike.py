@@ -0,0 +1,161 @@
+"""모집 공지 직후처럼 요청이 한꺼번에 몰릴 때 요청 수용 제한(429 + Retry-After)이 제대로 동작하는지 확인한다.
+
+1. spike: 많은 세션이 동시에 Q&A 질문을 보냄 → 일부는 바로 거절되고, 받아들인 요청의 지연 시간은 제한되어야 함
+2. session_flood: 한 세션이 같은 순간에 메시지를 여러 개 보냄 → 하나만 처리되어야 함
+3. ip_flood: 한 IP가 /chat/start를 계속 보냄 → 순간 허용량을 넘으면 거절되어야 함
+확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.spike --sessions 300 --latency-ms 200
+"""
+import asyncio
+import time
+from collections import Counter
+
+from benchmarks import _harness
+
+# app을 불러오기 전에 설정해야 하는 값. 세션마다 다른 IP로 보이도록 X-Forwarded-For를 사용하고, 답변 캐시는 끈다
+_harness.setup_env(
+    ANSWER_CACHE_THRESHOLD="1.01",
+    TRUST_FORWARDED_FOR="true",
+    ADMISSION_MAX_IN_FLIGHT="16",
+    ADMISSION_MAX_QUEUE="32",
+    ADMISSION_QUEUE_TIMEOUT_SECONDS="2",
+)
+
+import httpx  # noqa: E402
+
+from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm  # noqa: E402
+from benchmarks.load_test import summarize  # noqa: E402
+from benchmarks.outage import SETUP_MESSAGES  # noqa: E402
+
+
+def client_headers(index):
+    return {"X-Forwarded-For": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}"}
+
+
+class PhaseResult:
+    def __init__(self):
+        self.latencies = []
+        self.status_codes = Counter()
+        self.rejections = Counter()
+        self.missing_retry_after = 0
+
+    def record(self, response, started):
+        self.status_codes[str(response.status_code)] += 1
+        if response.status_code == 200:
+            self.latencies.append((time.perf_counter() - started) * 1000)
+        elif response.status_code == 429:
+            self.rejections[response.json()["detail"]] += 1
+            if not response.headers.get("retry-after"):
+                self.missing_retry_after += 1
+
+    def to_dict(self):
+        return {
+            "admitted_latency_ms": summarize(self.latencies),
+            "status_codes": dict(self.status_codes),
+            "rejections": dict(self.rejections),
+            "missing_retry_after": self.missing_retry_after,
+        }
+
+
+async def prepare_session(client, index):
+    headers = client_headers(index)
+    response = await client.post("/chat/start", headers=headers)
+    session_id = response.json()["session_id"]
+    for message in SETUP_MESSAGES:
+        await client.post("/chat/send", json={"session_id": session_id, "message": message}, headers=headers)
+    return session_id
+
+
+async def send(client, result, session_id, index, message):
+    started = time.perf_counter()
+    response = await client.post(
+        "/chat/send", json={"session_id": session_id, "message": message}, headers=client_headers(index)
+    )
+    result.record(response, started)
+
+
+async def run_scenario(args):
+    from app.main import app as fastapi_app, lifespan
+
+    install_fake_llm(FakeChatModel(latency=LatencyModel(args.latency_ms, "uniform"), seed=args.seed))
+    phases = {}
+
+    transport = httpx.ASGITransport(app=fastapi_app)
+    async with lifespan(fastapi_app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            admission = fastapi_app.state.admission
+            session_ids = []
+            # 준비 단계에서는 거절되지 않도록 대기열 한도 안에서 나눠 보낸다
+            batch_size = admission.max_in_flight + admission.max_queue // 2
+            for start in range(0, args.sessions, batch_size):
+                batch = range(start, min(start + batch_size, args.sessions))
+                session_ids.extend(await asyncio.gather(*(prepare_session(client, index) for index in batch)))
+
+            spike = PhaseResult()
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                send(client, spike, session_id, index, f"질문 {index}번: 스터디는 어떻게 진행돼?")
+                for index, session_id in enumerate(session_ids)
+            ))
+            phases["spike"] = {**spike.to_dict(), "elapsed_seconds": round(time.perf_counter() - started, 3)}
+
+            flood = PhaseResult()
+            await asyncio.gather(*(
+                send(client, flood, session_ids[0], 0, f"같은 세션 질문 {attempt}번: 회비는 얼마야?")
+                for attempt in range(args.flood)
+            ))
+            phases["session_flood"] = flood.to_dict()
+
+            ip_flood = PhaseResult()
+            for _ in range(args.flood * 3):
+                started = time.perf_counter()
+                response = await client.post("/chat/start", headers={"X-Forwarded-For": "192.0.2.1"})
+                ip_flood.record(response, started)
+            phases["ip_flood"] = ip_flood.to_dict()
+
+            admission_stats = admission.stats()
+            queue_timeout = admission.queue_timeout
+
+    admitted_bound_ms = (queue_timeout + args.latency_ms / 1000 * 4) * 1000
+    checks = {
+        "spike_rejected_some": phases["spike"]["status_codes"].get("429", 0) > 0,
+        "spike_admitted_latency_bounded": phases["spike"]["admitted_latency_ms"].get("max", 0) <= admitted_bound_ms,
+        "retry_after_on_all_429": all(phase["missing_retry_after"] == 0 for phase in phases.values()),
+        "session_flood_single_turn": phases["session_flood"]["status_codes"].get("200", 0) == 1,
+        "ip_flood_rejected": phases["ip_flood"]["status_codes"].get("429", 0) > 0,
+        "no_server_errors": all(
+            not code.startswith("5") for phase in phases.values() for code in phase["status_codes"]
+        ),
+        "slots_released": admission_stats["in_flight"] == 0 and admission_stats["queued"] == 0,
+    }
+    return {
+        "config": {
+            "sessions": args.sessions,
+            "latency_ms": args.latency_ms,
+            "flood": args.flood,
+            "max_in_flight": admission_stats["max_in_flight"],
+            "max_queue": admission_stats["max_queue"],
+            "queue_timeout_seconds": queue_timeout,
+            "admitted_latency_bound_ms": admitted_bound_ms,
+        },
+        "phases": phases,
+        "admission": admission_stats,
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("요청이 몰릴 때 429 거절과 대기열 동작을 확인합니다.")
+    parser.add_argument("--sessions", type=int, default=200, help="동시에 질문할 세션 수")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="LLM 지연 시간(ms)")
+    parser.add_argument("--flood", type=int, default=20, help="한 세션이 동시에 보낼 메시지 수")
+    args = parser.parse_args()
+
+    result = _harness.run(run_scenario, args)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
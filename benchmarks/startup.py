@@ -0,0 +1,141 @@
+"""서버 시작 시간을 측정한다: app.main을 불러오는 시간과 /readyz가 준비 완료를 돌려줄 때까지의 시간.
+
+실행할 때마다 새 파이썬 프로세스를 띄워 측정하고 (이미 불러온 모듈의 영향을 받지 않도록),
+항목별 중앙값/최솟값/최댓값을 JSON으로 출력한다. --compare로 이전 릴리스의 결과와 비교할 수 있다.
+LLM 클라이언트는 실제 클라이언트를 만들지만 호출은 하지 않으므로 API 키가 없어도 된다.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.startup --runs 5 --out startup-baseline.json
+    python -m benchmarks.startup --runs 5 --compare startup-baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks import _harness
+
+# 측정 프로세스가 부모 프로세스를 띄운 시각(time.time())을 전달받는 환경 변수
+SPAWNED_AT_ENV = "STARTUP_BENCHMARK_SPAWNED_AT"
+
+STARTUP_METRICS = [
+    "interpreter_seconds",
+    "import_seconds",
+    "serving_seconds",
+    "healthz_seconds",
+    "ready_seconds",
+    "process_ready_seconds",
+    "llm_init_seconds",
+]
+
+# (결과 JSON 경로, 값이 클수록 좋은지)
+COMPARED_METRICS = [
+    (("startup", "import_seconds", "median"), False),
+    (("startup", "serving_seconds", "median"), False),
+    (("startup", "ready_seconds", "median"), False),
+    (("startup", "process_ready_seconds", "median"), False),
+]
+
+
+async def measure_child(poll_interval):
+    """측정 프로세스 안에서 실행. 시간은 모두 app.main을 불러오기 시작한 시점 기준(초)."""
+    spawned_at = float(os.environ[SPAWNED_AT_ENV])
+    interpreter_seconds = time.time() - spawned_at
+    started = time.perf_counter()
+    from app.main import app, lifespan
+    import_seconds = time.perf_counter() - started
+
+    import httpx
+    from app.bot.nodes import llm
+
+    transport = httpx.ASGITransport(app=app)
+    async with lifespan(app):
+        serving_seconds = time.perf_counter() - started
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            response = await client.get("/healthz")
+            healthz_seconds = time.perf_counter() - started if response.status_code == 200 else None
+            while True:
+                response = await client.get("/readyz")
+                if response.status_code == 200:
+                    break
+                await asyncio.sleep(poll_interval)
+            ready_seconds = time.perf_counter() - started
+            process_ready_seconds = time.time() - spawned_at
+
+    return {
+        "interpreter_seconds": interpreter_seconds,
+        "import_seconds": import_seconds,
+        "serving_seconds": serving_seconds,
+        "healthz_seconds": healthz_seconds,
+        "ready_seconds": ready_seconds,
+        "process_ready_seconds": process_ready_seconds,
+        "llm_init_seconds": llm.init_seconds,
+    }
+
+
+def run_child(args):
+    _harness.setup_env()
+    result = _harness.run(lambda args: measure_child(args.poll_ms / 1000), args)
+    print(json.dumps(result))
+
+
+def spawn_run(args, timeout):
+    command = [sys.executable, "-m", "benchmarks.startup", "--child", "--poll-ms", str(args.poll_ms)]
+    env = {**os.environ, SPAWNED_AT_ENV: repr(time.time())}
+    completed = subprocess.run(command, env=env, capture_output=True, text=True, timeout=timeout)
+    if completed.returncode != 0:
+        raise RuntimeError(f"측정 프로세스 실패 (종료 코드 {completed.returncode}):\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def aggregate(runs):
+    startup = {}
+    for metric in STARTUP_METRICS:
+        samples = [run[metric] for run in runs if run.get(metric) is not None]
+        if not samples:
+            continue
+        startup[metric] = {
+            "median": round(statistics.median(samples), 3),
+            "min": round(min(samples), 3),
+            "max": round(max(samples), 3),
+        }
+    return startup
+
+
+def main():
+    parser = _harness.make_parser("서버를 불러오는 시간과 준비 완료까지 걸리는 시간을 측정합니다.",
+                                  verbose_help="서버 로그를 그대로 출력 (--child와 함께)")
+    parser.add_argument("--runs", type=int, default=5, help="측정 횟수 (매번 새 프로세스)")
+    parser.add_argument("--poll-ms", type=float, default=10.0, help="/readyz 확인 간격(ms)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="측정 한 번의 제한 시간(초)")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="허용할 성능 저하 비율")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    runs = [spawn_run(args, args.timeout) for _ in range(args.runs)]
+    result = {
+        "config": {"runs": args.runs, "python": sys.version.split()[0]},
+        "startup": aggregate(runs),
+        "runs": [{metric: round(value, 3) if value is not None else None for metric, value in run.items()} for run in runs],
+    }
+
+    if args.compare:
+        from benchmarks.load_test import compare
+
+        with open(args.compare, "r", encoding="utf-8") as f:
+            result["comparison"] = compare(result, json.load(f), args.tolerance, COMPARED_METRICS)
+
+    _harness.finish(result, args, passed=not any(row["regression"] for row in result.get("comparison", [])))
+
+
+if __name__ == "__main__":
+    main()
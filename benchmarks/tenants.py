@@ -0,0 +1,207 @@
+"""테넌트(동아리) 수를 1개에서 200개까지 늘려도 Q&A 지연 시간과 메모리가 거의 그대로인지 확인한다.
+
+mars_info.json을 바탕으로 테넌트별 정보 파일을 임시 폴더(CLUB_INFO_DIR)에 만들고, 단계마다
+1. 새 테넌트마다 /chat/start를 한 번 보내 정보를 불러오고 (이때 늘어난 메모리를 tracemalloc과 RSS로 측정)
+2. 같은 수의 대화를 모든 테넌트에 나눠 진행하며 Q&A 응답 시간을 측정한다.
+테넌트마다 다른 FAQ 답을 넣어, 답이 섞이지 않는지도 확인한다.
+확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.tenants --steps 1,10,50,100,200 --sessions 50
+"""
+import asyncio
+import gc
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import _harness
+
+# app을 불러오기 전에 설정해야 하는 값. 모든 요청이 같은 주소(ASGI transport)에서 오므로 빈도 제한은 끈다
+# 답변 캐시는 FAQ와 글자까지 같은 질문에만 쓰이도록 해, 일반 질문은 단계와 관계없이 항상 LLM을 거치게 한다
+TENANT_DIR = tempfile.mkdtemp(prefix="mars-tenants-")
+os.environ["CLUB_INFO_DIR"] = TENANT_DIR
+_harness.setup_env(
+    ANSWER_CACHE_THRESHOLD="0.99",
+    IP_RATE_PER_SECOND="0",
+    SESSION_RATE_PER_SECOND="0",
+)
+
+import httpx  # noqa: E402
+
+from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm  # noqa: E402
+from benchmarks.load_test import summarize, rss_mb  # noqa: E402
+from benchmarks.outage import SETUP_MESSAGES  # noqa: E402
+
+SECRET_QUESTION = "동아리 암호가 뭐야?"
+QUESTION_TEMPLATE = "질문 {number}: 스터디는 어떻게 진행돼?"
+
+
+def tenant_id(index):
+    return f"club-{index:03d}"
+
+
+def write_tenant_files(base_path, count):
+    with open(base_path, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    for index in range(count):
+        info = dict(base)
+        info["clubName"] = f"{base.get('clubName', '동아리')} {index}기"
+        info["faq"] = list(base.get("faq", [])) + [{"question": SECRET_QUESTION, "answer": f"{tenant_id(index)} 암호"}]
+        with open(os.path.join(TENANT_DIR, f"{tenant_id(index)}.json"), "w", encoding="utf-8") as f:
+            json.dump(info, f, ensure_ascii=False)
+
+
+async def run_scenario(args):
+    from app.main import app as fastapi_app, lifespan
+    from app.bot import nodes
+    from app.config import CLUB_INFO_PATH
+
+    fake = install_fake_llm(FakeChatModel(latency=LatencyModel(args.latency_ms, "uniform"), seed=args.seed))
+    llm_builds = 0
+
+    def counting_factory():
+        nonlocal llm_builds
+        llm_builds += 1
+        return fake
+
+    nodes.llm.reset(counting_factory)
+    write_tenant_files(CLUB_INFO_PATH, max(args.steps))
+    steps = []
+    mismatched = 0
+    errors = 0
+    questions = 0
+
+    transport = httpx.ASGITransport(app=fastapi_app)
+    async with lifespan(fastapi_app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            graph = fastapi_app.state.langgraph_app
+            # LLM 클라이언트를 바꿔 두었으므로 시작 후 준비(warm_up)가 끝날 때까지 기다린다
+            while (await client.get("/readyz")).status_code != 200:
+                await asyncio.sleep(0.01)
+
+            async def start(tenant):
+                nonlocal errors
+                response = await client.post("/chat/start", json={"tenant_id": tenant})
+                if response.status_code != 200:
+                    errors += 1
+                    return None
+                return response.json()["session_id"]
+
+            async def converse(tenant, latencies):
+                nonlocal mismatched, errors, questions
+                session_id = await start(tenant)
+                if session_id is None:
+                    return
+                for message in SETUP_MESSAGES:
+                    await client.post("/chat/send", json={"session_id": session_id, "message": message})
+                questions += 1
+                for question in (QUESTION_TEMPLATE.format(number=questions), SECRET_QUESTION):
+                    started = time.perf_counter()
+                    response = await client.post("/chat/send", json={"session_id": session_id, "message": question})
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    if response.status_code != 200:
+                        errors += 1
+                    elif question == SECRET_QUESTION and f"{tenant} 암호" not in response.json()["response_message"]:
+                        mismatched += 1
+
+            loaded = 0
+            await converse(tenant_id(0), [])  # 첫 요청에만 드는 준비 비용을 측정에서 뺀다
+            loaded = 1
+            for count in args.steps:
+                gc.collect()
+                rss_before = rss_mb()
+                tracemalloc.start()
+                load_started = time.perf_counter()
+                for index in range(loaded, count):
+                    await start(tenant_id(index))
+                load_seconds = time.perf_counter() - load_started
+                gc.collect()
+                traced_bytes = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+                new_tenants = count - loaded
+                loaded = max(loaded, count)
+                gc.collect()
+                rss_after_load = rss_mb()
+
+                latencies = []
+                semaphore = asyncio.Semaphore(args.concurrency)
+
+                async def limited(index):
+                    async with semaphore:
+                        # 단계의 모든 테넌트에 고르게 나눈다
+                        await converse(tenant_id(index * count // args.sessions), latencies)
+
+                await asyncio.gather(*(limited(index) for index in range(args.sessions)))
+                steps.append({
+                    "tenants": count,
+                    "new_tenants": new_tenants,
+                    "load_ms_per_tenant": round(load_seconds * 1000 / new_tenants, 2) if new_tenants else None,
+                    "traced_kb_per_tenant": round(traced_bytes / 1024 / new_tenants, 1) if new_tenants else None,
+                    "rss_mb": round(rss_after_load, 1),
+                    "rss_growth_mb": round(rss_after_load - rss_before, 2),
+                    "qa_latency_ms": summarize(latencies),
+                })
+
+            stats = (await client.get("/stats")).json()
+            shared_graph = fastapi_app.state.langgraph_app is graph
+
+    first, last = steps[0], steps[-1]
+    growth_steps = [step for step in steps if step["new_tenants"]]
+    rss_per_tenant_kb = (
+        (last["rss_mb"] - first["rss_mb"]) * 1024 / (last["tenants"] - first["tenants"])
+        if last["tenants"] > first["tenants"] else 0.0
+    )
+    latency_bound_ms = first["qa_latency_ms"]["p95"] * (1 + args.tolerance) + args.slack_ms
+    checks = {
+        "no_errors": errors == 0,
+        "answers_not_mixed": mismatched == 0,
+        "single_llm_client": llm_builds == 1,
+        "single_graph": shared_graph,
+        "all_tenants_loaded": stats["club_info"]["tenants"] == max(args.steps) + 1,
+        "latency_flat": last["qa_latency_ms"]["p95"] <= latency_bound_ms,
+        "memory_per_tenant_bounded": all(step["traced_kb_per_tenant"] <= args.max_tenant_kb for step in growth_steps)
+        and rss_per_tenant_kb <= args.max_tenant_kb,
+    }
+    return {
+        "config": {
+            "steps": args.steps,
+            "sessions_per_step": args.sessions,
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms,
+            "latency_bound_ms": round(latency_bound_ms, 1),
+            "max_tenant_kb": args.max_tenant_kb,
+        },
+        "steps": steps,
+        "rss_kb_per_tenant": round(rss_per_tenant_kb, 1),
+        "llm_client_builds": llm_builds,
+        "prompt_chains": stats["prompt_chains"],
+        "answer_cache": {key: stats["answer_cache"][key] for key in ("tenants", "hits", "misses", "faq_entries")},
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("테넌트 수에 따른 지연 시간과 메모리 변화를 측정합니다.")
+    parser.add_argument("--steps", type=lambda value: [int(part) for part in value.split(",")], default=[1, 10, 50, 100, 200],
+                        help="단계별 테넌트 수 (쉼표로 구분, 오름차순)")
+    parser.add_argument("--sessions", type=int, default=50, help="단계마다 진행할 대화 수")
+    parser.add_argument("--concurrency", type=int, default=25, help="동시에 진행할 대화 수")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="LLM 지연 시간(ms)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="첫 단계 대비 허용할 p95 증가 비율")
+    parser.add_argument("--slack-ms", type=float, default=25.0, help="비율 외에 허용할 p95 증가량(ms)")
+    parser.add_argument("--max-tenant-kb", type=float, default=512.0, help="테넌트 하나당 허용할 메모리(KB)")
+    args = parser.parse_args()
+
+    try:
+        result = _harness.run(run_scenario, args)
+    finally:
+        shutil.rmtree(TENANT_DIR, ignore_errors=True)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
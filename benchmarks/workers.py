@@ -0,0 +1,188 @@
+"""워커 프로세스 수를 늘릴 때 메모리 저장소와 SQLite 저장소의 처리량(턴/초)을 비교한다.
+
+uvicorn --workers N 처럼 워커 N개를 별도 프로세스로 띄우고, 각 워커가 자기 앱에 가짜 LLM을 넣어
+--sessions-per-worker 개의 대화를 동시에 진행한다 (워커가 늘면 전체 부하도 같이 는다).
+- memory: 워커마다 자기 세션만 메모리에 보관
+- sqlite: 모든 워커가 하나의 SQLite 파일(WAL)을 공유하므로, 워커가 늘수록 쓰기 잠금 경쟁이 늘어난다
+워커 수마다 전체 턴/초(/chat/start, /chat/send 응답 수 ÷ 가장 늦게 끝난 워커까지의 시간)와 턴 지연 시간을 JSON으로 출력한다.
+확인 항목(checks) 중 하나라도 실패하면 종료 코드 1.
+
+실행 예 (프로젝트 루트에서):
+    python -m benchmarks.workers --workers 1,2,4 --sessions-per-worker 50 --latency-ms 100
+"""
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks import _harness
+from benchmarks.load_test import summarize
+
+BACKENDS = ("memory", "sqlite")
+
+
+def configure_worker(backend, db_path):
+    """app을 불러오기 전에 워커 프로세스의 환경 변수를 설정한다.
+
+    요청 수용 제한과 빈도 제한이 저장소 차이를 가리지 않도록 넉넉하게 두고, 답변 캐시는 끈다.
+    """
+    os.environ["CHECKPOINTER_BACKEND"] = backend
+    os.environ["SQLITE_CHECKPOINT_PATH"] = db_path
+    _harness.setup_env(
+        ANSWER_CACHE_THRESHOLD="1.01",
+        ADMISSION_MAX_IN_FLIGHT="1000",
+        ADMISSION_MAX_QUEUE="1000",
+        ADMISSION_QUEUE_TIMEOUT_SECONDS="120",
+        IP_RATE_PER_SECOND="0",
+        SESSION_RATE_PER_SECOND="0",
+    )
+
+
+async def run_worker(args, index, barrier):
+    import httpx
+    from app.main import app as fastapi_app, lifespan
+    from benchmarks.fake_llm import FakeChatModel, LatencyModel, install_fake_llm
+    from benchmarks.load_test import LoadRunner, build_script
+
+    seed = args["seed"] + index
+    rng = random.Random(seed)
+    install_fake_llm(FakeChatModel(latency=LatencyModel(args["latency_ms"], "uniform", rng=random.Random(seed)), seed=seed))
+    scripts = [build_script(rng, args["max_questions"]) for _ in range(args["sessions_per_worker"])]
+
+    transport = httpx.ASGITransport(app=fastapi_app)
+    async with lifespan(fastapi_app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            await LoadRunner(client).run_session(build_script(rng, 0))
+
+            # 모든 워커가 준비된 뒤 동시에 시작한다 (기다리는 동안 이벤트 루프를 막지 않도록 스레드에서)
+            await asyncio.to_thread(barrier.wait)
+            runner = LoadRunner(client, poll_interval=args["poll_ms"] / 1000)
+            semaphore = asyncio.Semaphore(args["concurrency_per_worker"])
+
+            async def limited(script):
+                async with semaphore:
+                    await runner.run_session(script)
+
+            started = time.time()
+            await asyncio.gather(*(limited(script) for script in scripts))
+            finished = time.time()
+
+    return {
+        "started": started,
+        "finished": finished,
+        "completed": runner.completed,
+        "failed": runner.failed,
+        "turn_latencies": runner.latencies["chat_start"] + runner.latencies["chat_send"],
+    }
+
+
+def worker_main(backend, db_path, index, args, barrier, results):
+    configure_worker(backend, db_path)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            result = asyncio.run(run_worker(args, index, barrier))
+        except Exception as e:
+            # 다른 워커가 barrier에서 멈추지 않도록 풀어 주고 오류를 알린다
+            barrier.abort()
+            result = {"error": f"{type(e).__name__}: {e}"}
+    results.put(result)
+
+
+def run_step(backend, workers, args):
+    context = multiprocessing.get_context("spawn")
+    data_dir = tempfile.mkdtemp(prefix="mars-workers-")
+    db_path = os.path.join(data_dir, "sessions.db")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker_main, args=(backend, db_path, index, vars(args), barrier, results))
+        for index in range(workers)
+    ]
+    try:
+        for process in processes:
+            process.start()
+        outcomes = [results.get(timeout=args.timeout) for _ in processes]
+        for process in processes:
+            process.join()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    errors = [outcome["error"] for outcome in outcomes if "error" in outcome]
+    if errors:
+        return {"workers": workers, "errors": errors}
+    elapsed = max(o["finished"] for o in outcomes) - min(o["started"] for o in outcomes)
+    latencies = [latency for outcome in outcomes for latency in outcome["turn_latencies"]]
+    return {
+        "workers": workers,
+        "elapsed_seconds": round(elapsed, 3),
+        "sessions_completed": sum(o["completed"] for o in outcomes),
+        "sessions_failed": sum(o["failed"] for o in outcomes),
+        "turns": len(latencies),
+        "turns_per_second": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "turn_latency_ms": summarize(latencies),
+    }
+
+
+def run_benchmark(args):
+    steps = [int(step) for step in args.workers.split(",")]
+    results = {backend: [run_step(backend, workers, args) for workers in steps] for backend in BACKENDS}
+
+    expected = {workers: workers * args.sessions_per_worker for workers in steps}
+    ratios = {}
+    for memory, sqlite in zip(results["memory"], results["sqlite"]):
+        if memory.get("turns_per_second") and sqlite.get("turns_per_second"):
+            ratios[str(memory["workers"])] = round(sqlite["turns_per_second"] / memory["turns_per_second"], 2)
+
+    checks = {
+        "all_sessions_completed": all(
+            step.get("sessions_completed") == expected[step["workers"]] and step.get("sessions_failed") == 0
+            for steps_result in results.values() for step in steps_result
+        ),
+        # SQLite는 세션을 파일에 쓰므로 느릴 수 있지만, 워커가 늘어도 잠금 경쟁으로 크게 떨어지면 안 된다
+        "sqlite_within_tolerance": len(ratios) == len(steps) and all(
+            ratio >= 1 - args.tolerance for ratio in ratios.values()
+        ),
+    }
+    return {
+        "config": {
+            "workers": steps,
+            "sessions_per_worker": args.sessions_per_worker,
+            "concurrency_per_worker": args.concurrency_per_worker,
+            "latency_ms": args.latency_ms,
+            "max_questions": args.max_questions,
+            "tolerance": args.tolerance,
+            "cpu_count": os.cpu_count(),
+            "python": sys.version.split()[0],
+        },
+        "backends": results,
+        "sqlite_to_memory_ratio": ratios,
+        "checks": checks,
+    }
+
+
+def main():
+    parser = _harness.make_parser("워커 수에 따른 메모리/SQLite 저장소의 처리량(턴/초)을 비교합니다.")
+    parser.add_argument("--workers", default="1,2,4", help="쉼표로 구분한 워커 수 단계")
+    parser.add_argument("--sessions-per-worker", type=int, default=50, help="워커마다 진행할 대화 수")
+    parser.add_argument("--concurrency-per-worker", type=int, default=25, help="워커마다 동시에 진행할 대화 수")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="LLM 호출 지연 시간(평균, ms)")
+    parser.add_argument("--max-questions", type=int, default=4, help="대화당 최대 Q&A 질문 수")
+    parser.add_argument("--poll-ms", type=float, default=200.0, help="/chat/status 폴링 간격(ms)")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="SQLite 처리량이 메모리보다 낮아도 되는 비율")
+    parser.add_argument("--timeout", type=float, default=600.0, help="워커 하나를 기다릴 최대 시간(초)")
+    args = parser.parse_args()
+
+    result = _harness.run(run_benchmark, args)
+    _harness.finish(result, args)
+
+
+if __name__ == "__main__":
+    main()
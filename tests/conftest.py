@@ -0,0 +1,5 @@
+import os
+
+# app.config를 불러오기 전에 설정해야 하는 값 (실제 API 키 없이, 동아리 정보 파일 감시 없이)
+os.environ.setdefault("GOOGLE_API_KEY", "test-dummy-key")
+os.environ.setdefault("CLUB_INFO_POLL_SECONDS", "0")
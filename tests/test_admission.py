@@ -0,0 +1,70 @@
+"""요청이 몰릴 때 AdmissionController가 429 + Retry-After로 거절하는지 확인한다."""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.api.admission import AdmissionController
+from app.api.endpoints import admit
+
+
+def http_request(ip="10.0.0.1"):
+    return Request({"type": "http", "method": "POST", "path": "/chat/send", "headers": [], "client": (ip, 1234)})
+
+
+def controller(**kwargs):
+    # 빈도 제한은 끄고 동시 실행/대기열 한도만 본다
+    return AdmissionController(session_rate=0, ip_rate=0, **kwargs)
+
+
+def test_full_queue_is_rejected_with_429():
+    async def scenario():
+        admission = controller(max_in_flight=1, max_queue=1, queue_timeout=5)
+        running = await admit(admission, http_request(), "s1")
+        waiting = asyncio.create_task(admit(admission, http_request(), "s2"))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as rejected:
+            await admit(admission, http_request(), "s3")
+
+        # 자리가 나면 대기하던 요청이 이어서 실행된다
+        admission.release(running)
+        admission.release(await waiting)
+        return rejected.value, admission.stats()
+
+    error, stats = asyncio.run(scenario())
+    assert error.status_code == 429
+    assert int(error.headers["Retry-After"]) >= 1
+    assert stats["rejected"] == {"queue_full": 1}
+    assert stats["in_flight"] == 0 and stats["queued"] == 0
+
+
+def test_queue_timeout_is_rejected_with_429():
+    async def scenario():
+        admission = controller(max_in_flight=1, max_queue=4, queue_timeout=0.01)
+        running = await admit(admission, http_request(), "s1")
+        with pytest.raises(HTTPException) as rejected:
+            await admit(admission, http_request(), "s2")
+        admission.release(running)
+        return rejected.value, admission.stats()
+
+    error, stats = asyncio.run(scenario())
+    assert error.status_code == 429
+    assert stats["rejected"] == {"queue_timeout": 1}
+    assert stats["queued"] == 0
+
+
+def test_same_session_in_flight_is_rejected():
+    async def scenario():
+        admission = controller()
+        running = await admit(admission, http_request(), "s1")
+        with pytest.raises(HTTPException) as rejected:
+            await admit(admission, http_request(), "s1")
+        admission.release(running)
+        # 처리가 끝나면 같은 세션의 다음 메시지는 받아들인다
+        admission.release(await admit(admission, http_request(), "s1"))
+        return rejected.value, admission.stats()
+
+    error, stats = asyncio.run(scenario())
+    assert error.status_code == 429
+    assert stats["rejected"] == {"session_busy": 1}
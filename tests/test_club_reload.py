@@ -0,0 +1,85 @@
+"""동아리 정보 파일이 잘못된 내용으로 바뀌어도 기존 스냅샷을 유지하는지 확인한다."""
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from app.club import ClubConfigService
+
+VALID = (Path(__file__).resolve().parent.parent / "mars_info.json").read_bytes()
+
+MALFORMED = {
+    "truncated_json": VALID[:len(VALID) // 2],
+    "not_utf8": b"\xff\xfe" + VALID,
+    "top_level_list": b"[1, 2]",
+    "positions_not_strings": json.dumps({"positions": [1, 2]}).encode("utf-8"),
+    "faq_not_objects": json.dumps({**json.loads(VALID), "faq": [1, 2]}).encode("utf-8"),
+    "empty": b"",
+}
+
+
+def write(path, raw, step):
+    path.write_bytes(raw)
+    # 같은 크기로 빠르게 덮어써도 바뀐 것으로 보이도록 수정 시각을 매번 다르게 둔다
+    os.utime(path, ns=(step * 1_000_000_000, step * 1_000_000_000))
+
+
+@pytest.fixture
+def club_file(tmp_path):
+    path = tmp_path / "mars_info.json"
+    write(path, VALID, 1)
+    return path
+
+
+@pytest.mark.parametrize("name", MALFORMED)
+def test_malformed_file_keeps_previous_snapshot(club_file, name):
+    service = ClubConfigService(str(club_file), poll_interval=0)
+    before = service.current()
+
+    write(club_file, MALFORMED[name], 2)
+    assert service.reload_if_changed() is False
+    assert service.current() is before
+    assert service.reload_errors == 1
+    assert service.error is not None
+
+    # 올바른 파일로 돌아오면 오류가 지워지고, 내용이 같으므로 갱신 횟수는 늘지 않는다
+    write(club_file, VALID, 3)
+    assert service.reload_if_changed() is False
+    assert service.current().version == before.version
+    assert service.error is None
+    assert service.reloads == 0
+
+
+def test_valid_change_swaps_snapshot_and_notifies(club_file):
+    service = ClubConfigService(str(club_file), poll_interval=0)
+    before = service.current()
+    seen = []
+    service.subscribe(seen.append)
+
+    changed = {**json.loads(VALID), "clubName": "새 동아리"}
+    write(club_file, json.dumps(changed, ensure_ascii=False).encode("utf-8"), 2)
+    assert service.reload_if_changed() is True
+    assert service.current().name == "새 동아리"
+    assert service.current().version != before.version
+    assert service.reloads == 1
+    assert [context.name for context in seen] == [before.name, "새 동아리"]
+
+
+def test_listener_error_rolls_back(club_file):
+    service = ClubConfigService(str(club_file), poll_interval=0)
+    before = service.current()
+    seen = []
+
+    def listener(context):
+        seen.append(context.version)
+        if context.version != before.version:
+            raise RuntimeError("체인 생성 실패")
+
+    service.subscribe(listener)
+    changed = {**json.loads(VALID), "clubName": "새 동아리"}
+    write(club_file, json.dumps(changed, ensure_ascii=False).encode("utf-8"), 2)
+    assert service.reload_if_changed() is False
+    assert service.current() is before
+    # 실패한 새 스냅샷 다음에는 기존 스냅샷으로 리스너를 되돌린다
+    assert seen[-1] == before.version
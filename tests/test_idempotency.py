@@ -0,0 +1,61 @@
+"""같은 idempotency_key의 재시도는 한 번만 처리되고 나머지는 그 응답을 받는지 확인한다."""
+import asyncio
+
+import pytest
+
+from app.api.idempotency import IdempotencyConflict, ReplayCache
+
+
+def test_concurrent_retries_fire_once():
+    async def scenario():
+        cache = ReplayCache()
+        fired = 0
+
+        async def send():
+            nonlocal fired
+            future, owner = cache.begin("s1", "k1", "안녕")
+            if not owner:
+                return await future
+            fired += 1
+            await asyncio.sleep(0.01)
+            response = {"reply": f"응답 {fired}"}
+            cache.complete("s1", "k1", future, response)
+            return response
+
+        responses = await asyncio.gather(*(send() for _ in range(5)))
+        # 처리가 끝난 뒤의 재시도도 저장된 응답을 받는다
+        responses.append(await send())
+        return fired, responses, cache.stats()
+
+    fired, responses, stats = asyncio.run(scenario())
+    assert fired == 1
+    assert all(response == {"reply": "응답 1"} for response in responses)
+    assert stats["waited"] == 4
+    assert stats["replayed"] == 1
+
+
+def test_failure_lets_next_retry_run():
+    async def scenario():
+        cache = ReplayCache()
+        future, owner = cache.begin("s1", "k1", "안녕")
+        waiting, waiting_owner = cache.begin("s1", "k1", "안녕")
+        cache.fail("s1", "k1", future, RuntimeError("LLM 오류"))
+        with pytest.raises(RuntimeError):
+            await waiting
+        _, retry_owner = cache.begin("s1", "k1", "안녕")
+        return owner, waiting_owner, retry_owner
+
+    assert asyncio.run(scenario()) == (True, False, True)
+
+
+def test_same_key_with_different_message_conflicts():
+    async def scenario():
+        cache = ReplayCache()
+        cache.begin("s1", "k1", "안녕")
+        with pytest.raises(IdempotencyConflict):
+            cache.begin("s1", "k1", "다른 메시지")
+        # 다른 세션의 같은 키는 별개
+        _, owner = cache.begin("s2", "k1", "다른 메시지")
+        return owner
+
+    assert asyncio.run(scenario()) is True